@@ -0,0 +1,100 @@
+"""Baltic Exchange API 客户端模块
+所有 fixture feed 共用一个带连接池的 requests.Session（keep-alive），
+用令牌桶限速代替固定 sleep，并对 429 / 5xx / 网络错误做指数退避重试
+"""
+
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BALTIC_API_KEY = os.environ.get('BALTIC_API_KEY', 'FMNNXJKJMSV6PE4YA36EOAAJXX1WAH84KSWNU8PEUFGRHUPJZA3QTG1FLE09SXJF')
+
+# 需要退避重试的 HTTP 状态码
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """令牌桶限速器（线程安全）：每秒补充 rate 个令牌，最多积攒 capacity 个"""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """取一个令牌，令牌不足时阻塞到补充为止"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class BalticFeedClient:
+    """Baltic API 客户端：连接池 + 令牌桶 + 指数退避"""
+
+    def __init__(self, api_key=BALTIC_API_KEY, rate=5, burst=6, max_retries=4,
+                 backoff_base=1.0, backoff_max=30.0, timeout=30, pool_size=10):
+        self.rate_limiter = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update({'x-apikey': api_key})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+
+    def _backoff(self, attempt, response=None):
+        """计算第 attempt 次重试前的等待秒数，优先遵循服务端的 Retry-After"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay, self.backoff_max) * random.uniform(0.5, 1.0)
+
+    def get(self, url, params=None):
+        """限速后发起 GET，429/5xx/网络错误按指数退避重试，返回最后一次的 Response"""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self._backoff(attempt, response))
+                continue
+            return response
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """获取进程内共享的客户端（首次调用时按环境变量创建）"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = BalticFeedClient(
+                rate=float(os.environ.get('BALTIC_RATE_LIMIT', 5)),
+                burst=int(os.environ.get('BALTIC_BURST', 6)),
+                max_retries=int(os.environ.get('BALTIC_MAX_RETRIES', 4)),
+            )
+        return _client
@@ -0,0 +1,115 @@
+"""解析器对抗输入基准：单条字符串的最坏解析耗时
+用几类容易触发正则回溯的字符串（关键字后接大量空白、关键字反复出现、长串数字等），按若干长度生成，
+测 enrich（逐字段正则 / 版式文法）和各 derive 函数处理单条字符串的耗时（同一条字符串复制成 --rows 行一起处理，
+摊掉 DataFrame 操作本身的固定开销），报告每类输入的最坏耗时：
+  - 预算内（长度不超过 MAX_FIXTURE_LENGTH）的字符串，单条最坏耗时不得超过 --limit-ms；
+  - 超出预算的字符串不做解析（字段保持为空），单条耗时同样不得超过 --limit-ms
+任一条件不满足时以非零状态退出
+
+用法（在仓库根目录运行）：
+    python benchmarks/bench_adversarial.py
+    python benchmarks/bench_adversarial.py --lengths 100 300 3000 --limit-ms 2 --top 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_fields import add_hire_columns, add_freight_columns, add_laycan_columns, add_cargo_columns, add_period_columns
+from fixture_grammar import parse_tc, parse_period
+from fixture_parsing import TC_RE_MAPS, PERIOD_RE_MAPS, VC_RE_MAPS, MAX_FIXTURE_LENGTH, enrich
+
+FEEDS = {
+    'tc': (TC_RE_MAPS, parse_tc, [add_hire_columns, add_laycan_columns]),
+    'period': (PERIOD_RE_MAPS, parse_period, [add_hire_columns, add_laycan_columns, add_period_columns]),
+    'vc': (VC_RE_MAPS, None, [add_freight_columns, add_laycan_columns, add_cargo_columns]),
+}
+
+# 各正则里的关键字 / 分隔符；每个都生成"后接空白""反复出现"两类输入
+KEYWORDS = ['dely', 'via', 'redel', 'trip', 'dwt', '$', "'", '<', '-', '1/', 'min ', 'bb', '$1 for 90 days']
+
+def families():
+    """{输入类别: 按长度生成字符串的函数}"""
+    result = {}
+    for k in KEYWORDS:
+        result[f'{k!r} + spaces'] = lambda n, k=k: k + ' ' * n + 'x'
+        result[f'{k!r} + space/tab'] = lambda n, k=k: k + ' \t' * (n // 2) + 'x'
+        result[f'{k!r} repeated'] = lambda n, k=k: (k + ' ') * (n // (len(k) + 1))
+    result['dely + dates'] = lambda n: 'dely ' + '12 Jan ' * (n // 7)
+    result['digits'] = lambda n: '1' * n
+    result['digits + spaces'] = lambda n: '1 ' * (n // 2)
+    return result
+
+def adversarial_frame(s, rows):
+    """把同一条字符串复制成 rows 行，放进 fixtureString 和各个被 derive 读取的文本列，字段全部待补全"""
+    columns = ['hire', 'rateAndTerms', 'freeText', 'cargoSize', 'tripDescriptionPeriodInfo']
+    return pd.DataFrame({'date': pd.Timestamp('2024-01-02'), 'fixtureString': [s] * rows, **{col: [s] * rows for col in columns}})
+
+def per_string(fn, rows):
+    """fn 处理 rows 行的总耗时折算成单条字符串的耗时（秒），以及 fn 的返回值"""
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) / rows, result
+
+def worst_case(s, maps, parser, derives, rows):
+    """一条字符串在各解析步骤上的单条耗时（秒）：{步骤: 耗时}，以及 enrich 是否补出了任何字段"""
+    df = adversarial_frame(s, rows)
+    df = df.drop(columns=[col for col in maps if col in df.columns])
+    times = {}
+    times['enrich regex'], by_regex = per_string(lambda: enrich(df, maps), rows)
+    if parser is not None:
+        times['enrich grammar'], _ = per_string(lambda: enrich(df, maps, parser=parser), rows)
+    for derive in derives:
+        times[derive.__name__], _ = per_string(lambda: derive(df), rows)
+    parsed = by_regex[list(maps)].notna().to_numpy().any()
+    return times, parsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Worst-case per-string parse latency on adversarial inputs')
+    parser.add_argument('--lengths', type=int, nargs='+', default=[100, MAX_FIXTURE_LENGTH // 2, MAX_FIXTURE_LENGTH, 10 * MAX_FIXTURE_LENGTH])
+    parser.add_argument('--feeds', nargs='+', choices=list(FEEDS), default=list(FEEDS))
+    parser.add_argument('--rows', type=int, default=200, help='每条字符串复制的行数')
+    parser.add_argument('--limit-ms', type=float, default=5.0, help='单条字符串的解析耗时上限（毫秒）')
+    parser.add_argument('--top', type=int, default=10, help='打印最慢的 N 组输入')
+    args = parser.parse_args()
+
+    results = []  # (feed, 输入类别, 长度, 步骤, 耗时, 是否补出字段)
+    for name in args.feeds:
+        maps, parse, derives = FEEDS[name]
+        for family, generate in families().items():
+            for n in args.lengths:
+                s = generate(n)
+                times, parsed = worst_case(s, maps, parse, derives, args.rows)
+                results.extend((name, family, len(s), step, t, parsed) for step, t in times.items())
+
+    results.sort(key=lambda r: -r[4])
+    print(f'max fixtureString length {MAX_FIXTURE_LENGTH}; slowest inputs (ms per string)')
+    print(f'  {"feed":<8}{"input":<24}{"length":>8}  {"step":<22}{"ms":>10}')
+    for name, family, length, step, t, _ in results[:args.top]:
+        print(f'  {name:<8}{family:<24}{length:>8}  {step:<22}{t * 1e3:>10.2f}')
+
+    within = [r for r in results if r[2] <= MAX_FIXTURE_LENGTH]
+    beyond = [r for r in results if r[2] > MAX_FIXTURE_LENGTH]
+    worst_within = max((r[4] for r in within), default=0.0)
+    worst_beyond = max((r[4] for r in beyond), default=0.0)
+    print(f'\nworst within budget: {worst_within * 1e3:.2f} ms ({len(within)} measurements)')
+    print(f'worst over budget:   {worst_beyond * 1e3:.2f} ms ({len(beyond)} measurements)')
+
+    failures = []
+    if worst_within * 1e3 > args.limit_ms:
+        failures.append(f'within-budget parse took {worst_within * 1e3:.2f} ms > {args.limit_ms} ms')
+    if worst_beyond * 1e3 > args.limit_ms:
+        failures.append(f'over-budget string took {worst_beyond * 1e3:.2f} ms > {args.limit_ms} ms')
+    if any(parsed for *_, parsed in beyond):
+        failures.append('over-budget strings were parsed instead of skipped')
+    for failure in failures:
+        print(f'FAIL {failure}')
+    if failures:
+        sys.exit(1)
+    print('all inputs within the per-string parse budget')
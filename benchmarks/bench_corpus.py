@@ -0,0 +1,160 @@
+"""解析器黄金语料基准：逐字段准确率 + 吞吐量
+fixture_data/*.csv 是接口返回的真实成交，每行同时有 fixtureString 和接口给出的各字段，用作黄金语料：
+  - accuracy：清空正则地图中的全部字段后用 enrich 补全（有版式文法的 feed 走文法），逐字段与接口给出的值比较；
+    VESSEL TYPE 用补全出的 dwt 重新分类后与语料中的值比较。两边都为空算一致，比较前统一写法（见 normalized）
+  - throughput：把语料按行重复采样放大到 --rows 指定的各个规模（默认到 100 万行），
+    测 enrich（逐字段正则 / 版式文法）和 add_vessel_type 每秒处理的 fixture 数，
+    并校验放大后每一行的输出与该行在黄金语料上的输出完全一致
+准确率可以存成基线（--save-baseline），之后的运行用 --baseline 对比，任一字段准确率下降时以非零状态退出，
+解析器提速的同时证明输出没有退化；benchmarks/corpus_baseline.json 是当前解析器的基线
+
+用法（在仓库根目录运行）：
+    python benchmarks/bench_corpus.py
+    python benchmarks/bench_corpus.py --rows 10000 100000 --show-mismatches 5
+    python benchmarks/bench_corpus.py --baseline benchmarks/corpus_baseline.json --rows 100000
+    python benchmarks/bench_corpus.py --save-baseline benchmarks/corpus_baseline.json --rows 1000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_grammar import parse_tc, parse_period
+from fixture_parsing import TC_RE_MAPS, PERIOD_RE_MAPS, VC_RE_MAPS, enrich, add_vessel_type
+from fixture_vessels import MIN_BUILD_YEAR
+
+CORPUS = {
+    'tc': ('fixture_data/timecharter.csv', TC_RE_MAPS, parse_tc),
+    'period': ('fixture_data/periodcharter.csv', PERIOD_RE_MAPS, parse_period),
+    'vcco': ('fixture_data/voyage_coal.csv', VC_RE_MAPS, None),
+    'vcgr': ('fixture_data/voyage_grain.csv', VC_RE_MAPS, None),
+    'vcor': ('fixture_data/voyage_ore.csv', VC_RE_MAPS, None),
+}
+
+
+def golden_corpus(path):
+    """黄金语料：只保留有 fixtureString 的行"""
+    df = pd.read_csv(path, dtype=str)
+    return df[df['fixtureString'].notna()].reset_index(drop=True)
+
+def blank(df, maps):
+    """清空正则地图中的全部字段，每条都要完整解析"""
+    return df.drop(columns=[col for col in maps if col in df.columns])
+
+def normalized(values, col):
+    """比较用：转成去掉首尾空格的字符串，空字符串视同空值
+    接口与正则的写法不同的字段先统一：运费接口给数值（'46.0'），正则取原文（'$46.00'），都按数值比较；
+    接口用 '0' 表示没有建造年份 / 载重吨，用 1700 这类早于 MIN_BUILD_YEAR 的年份表示没有建造年份（见 fixture_vessels）
+    """
+    text = pd.Series(values, dtype='string').str.strip()
+    text = text.mask(text.eq(''))
+    if col == 'freight':
+        amount = text.str.replace(',', '', regex=False).str.extract(r'(\d+(?:\.\d+)?)', expand=False)
+        text = pd.to_numeric(amount, errors='coerce').astype('Float64').astype('string')
+    elif col in ('buildYear', 'dwt'):
+        text = text.str.replace(',', '', regex=False)
+        text = text.mask(text.eq('0'))
+        if col == 'buildYear':
+            text = text.mask(pd.to_numeric(text, errors='coerce').lt(MIN_BUILD_YEAR).fillna(False))
+    return text
+
+def field_accuracy(expected, actual, fields):
+    """{字段: (一致的行数, 总行数, 不一致的行号)}"""
+    result = {}
+    for col in fields:
+        want, got = normalized(expected[col].to_numpy(), col), normalized(actual[col].to_numpy(), col)
+        same = ((want == got) | (want.isna() & got.isna())).fillna(False).to_numpy()
+        result[col] = (int(same.sum()), len(same), np.flatnonzero(~same))
+    return result
+
+def accuracy(name, show_mismatches=0):
+    """一个 feed 的逐字段准确率：{字段: 准确率}"""
+    path, maps, parse = CORPUS[name]
+    golden = golden_corpus(path)
+    parsed = add_vessel_type(enrich(blank(golden, maps), maps, parser=parse))
+    fields = [col for col in maps if col in golden.columns]
+    if 'VESSEL TYPE' in golden.columns:
+        fields.append('VESSEL TYPE')
+
+    rates = {}
+    for col, (hits, total, misses) in field_accuracy(golden, parsed, fields).items():
+        rates[col] = hits / total
+        print(f'  {name:<8}{col:<28}{hits:>6} / {total:<6}{rates[col]:>8.1%}')
+        for i in misses[:show_mismatches]:
+            print(f'{"":>14}expected {golden.at[i, col]!r}, parsed {parsed.at[i, col]!r}')
+            print(f'{"":>14}  {golden.at[i, "fixtureString"]}')
+    return rates
+
+
+def synthetic_corpus(golden, rows, seed=0):
+    """按行重复采样黄金语料到 rows 行；返回 (语料, 每行对应的黄金语料行号)"""
+    picks = np.random.default_rng(seed).integers(0, len(golden), rows)
+    return golden.iloc[picks].reset_index(drop=True), picks
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+def throughput(name, rows):
+    """放大到 rows 行后的吞吐量（fixtures/s）：逐字段正则、版式文法（如有）、add_vessel_type"""
+    path, maps, parse = CORPUS[name]
+    golden = blank(golden_corpus(path), maps)
+    reference = enrich(golden, maps, parser=parse)
+    df, picks = synthetic_corpus(golden, rows)
+    expected = reference.iloc[picks].reset_index(drop=True)
+
+    t_regex, by_regex = timed(lambda: enrich(df, maps))
+    t_vessel, typed = timed(lambda: add_vessel_type(by_regex))
+    pd.testing.assert_frame_equal(by_regex, enrich(golden, maps).iloc[picks].reset_index(drop=True))
+    pd.testing.assert_frame_equal(typed, add_vessel_type(enrich(golden, maps)).iloc[picks].reset_index(drop=True))
+    t_grammar = None
+    if parse is not None:
+        t_grammar, by_grammar = timed(lambda: enrich(df, maps, parser=parse))
+        pd.testing.assert_frame_equal(by_grammar, expected)
+
+    grammar = f'{rows / t_grammar:>16,.0f}' if t_grammar else f'{"-":>16}'
+    print(f'  {name:<8}{rows:>10,}{rows / t_regex:>16,.0f}{grammar}{rows / t_vessel:>18,.0f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Golden-corpus accuracy and throughput benchmark for the fixture parsers')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--feeds', nargs='+', choices=list(CORPUS), default=list(CORPUS))
+    parser.add_argument('--show-mismatches', type=int, default=0, help='每个字段打印前 N 条不一致的行')
+    parser.add_argument('--baseline', help='与这个准确率基线对比，任一字段下降时以非零状态退出')
+    parser.add_argument('--save-baseline', help='把本次准确率存为基线')
+    args = parser.parse_args()
+
+    print('accuracy (parsed vs fixture_data)')
+    rates = {name: accuracy(name, args.show_mismatches) for name in args.feeds}
+
+    print('\nthroughput (fixtures/s)')
+    print(f'  {"feed":<8}{"rows":>10}{"enrich regex":>16}{"enrich grammar":>16}{"add_vessel_type":>18}')
+    for rows in args.rows:
+        for name in args.feeds:
+            throughput(name, rows)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(rates, f, indent=2, ensure_ascii=False)
+        print(f'\nbaseline saved to {args.save_baseline}')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = [(name, col, rate, rates[name].get(col, 0.0))
+                       for name, fields in baseline.items() if name in rates
+                       for col, rate in fields.items() if rates[name].get(col, 0.0) < rate - 1e-9]
+        for name, col, before, after in regressions:
+            print(f'REGRESSION {name}.{col}: {before:.1%} -> {after:.1%}')
+        if regressions:
+            sys.exit(1)
+        print('\nno accuracy regressions against baseline')
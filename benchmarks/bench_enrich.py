@@ -0,0 +1,104 @@
+"""enrich 基准测试：当前的 enrich vs 逐行 apply 的对照实现
+用 fixture_data 中的真实 fixtureString 放大成合成语料，随机清空一部分已有字段让正则补全真正跑起来，
+先校验输出完全一致，再比较耗时。按几种行数分别测：
+  - apply：逐行 apply 的对照实现（enrich_apply）
+  - per-row / str.extract：enrich 的两条取值路径（见 fixture_parsing.extract_group），通过 EXTRACT_MIN_ROWS 强制选用
+  - enrich：按默认阈值自动选路径，即流水线实际的耗时
+增量同步的窗口通常只有几百行，回补 / 重放是几万到几十万行，两端都要看
+
+用法（在仓库根目录运行）：
+    python benchmarks/bench_enrich.py
+    python benchmarks/bench_enrich.py --rows 500 200000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixture_parsing
+from fixture_parsing import TC_RE_MAPS, PERIOD_RE_MAPS, VC_RE_MAPS, enrich
+
+CORPUS = {
+    'tc': ('fixture_data/timecharter.csv', TC_RE_MAPS),
+    'period': ('fixture_data/periodcharter.csv', PERIOD_RE_MAPS),
+    'vc': ('fixture_data/voyage_ore.csv', VC_RE_MAPS),
+}
+
+
+def enrich_apply(df, maps):
+    """逐行 apply 的对照实现：沿用向量化之前的逐行 apply 写法，但带上了之后的类型修正（数值列先转 object），
+    输出与 enrich 一致；不是当时的原版代码"""
+    df = df.copy()
+    txt = df['fixtureString'].astype(str)
+    for col, pat in maps.items():
+        if col not in df.columns:
+            df[col] = None
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype(object)
+        mask = pd.isna(df[col]) | (df[col].astype(str).str.strip() == '')
+
+        def extract_text(x):
+            if pd.isna(x):
+                return None
+            m = pat.search(x)
+            return m.group(1).strip() if m else None
+
+        df.loc[mask, col] = txt[mask].apply(extract_text)
+    return df
+
+
+def synthetic_corpus(path, maps, rows, seed=0):
+    """按行重复采样真实数据到 rows 行，并把约一半的待补全字段清空"""
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(path)
+    df = base.sample(rows, replace=True, random_state=seed).reset_index(drop=True)
+    for col in maps:
+        if col in df.columns:
+            df[col] = df[col].astype(object)
+            df.loc[rng.random(rows) < 0.5, col] = None
+    return df
+
+
+def with_threshold(min_rows, fn):
+    """临时改 EXTRACT_MIN_ROWS 后调用 fn，用来强制 enrich 走某一条取值路径"""
+    saved = fixture_parsing.EXTRACT_MIN_ROWS
+    fixture_parsing.EXTRACT_MIN_ROWS = min_rows
+    try:
+        return fn()
+    finally:
+        fixture_parsing.EXTRACT_MIN_ROWS = saved
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark vectorized enrich against the per-row apply version')
+    parser.add_argument('--rows', type=int, nargs='+', default=[200, 5_000, 200_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'EXTRACT_MIN_ROWS = {fixture_parsing.EXTRACT_MIN_ROWS}; times in ms, speedup of enrich over apply')
+    print(f'{"feed":<8}{"rows":>10}{"apply":>10}{"per-row":>10}{"extract":>10}{"enrich":>10}{"speedup":>10}')
+    for rows in args.rows:
+        for name, (path, maps) in CORPUS.items():
+            df = synthetic_corpus(path, maps, rows)
+            t_apply, expected = best_of(lambda: enrich_apply(df, maps), args.repeat)
+            t_row, by_row = with_threshold(float('inf'), lambda: best_of(lambda: enrich(df, maps), args.repeat))
+            t_extract, by_extract = with_threshold(0, lambda: best_of(lambda: enrich(df, maps), args.repeat))
+            t_enrich, actual = best_of(lambda: enrich(df, maps), args.repeat)
+            for result in (by_row, by_extract, actual):
+                pd.testing.assert_frame_equal(result, expected)
+            print(f'{name:<8}{rows:>10}{t_apply * 1e3:>10.1f}{t_row * 1e3:>10.1f}{t_extract * 1e3:>10.1f}'
+                  f'{t_enrich * 1e3:>10.1f}{t_apply / t_enrich:>9.1f}x')
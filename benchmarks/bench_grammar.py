@@ -0,0 +1,77 @@
+"""版式文法解析基准测试：enrich(parser=...) 单遍解析 vs 逐字段正则
+用 fixture_data 中的真实 fixtureString 放大成合成语料（所有待补全字段清空，每条都要完整解析），
+先校验两条路径输出完全一致，再比较每条 fixture 的平均耗时：
+  - parse：单条字符串取出全部字段的耗时（逐字段 pattern.search vs 一次文法匹配）
+  - enrich：整表补全的耗时（含文法不覆盖、退回逐字段正则的行）
+另外报告文法覆盖率
+
+用法（在仓库根目录运行）：
+    python benchmarks/bench_grammar.py
+    python benchmarks/bench_grammar.py --rows 500000 --repeat 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixture_grammar import parse_tc, parse_period
+from fixture_parsing import TC_RE_MAPS, PERIOD_RE_MAPS, enrich
+
+CORPUS = {
+    'tc': ('fixture_data/timecharter.csv', TC_RE_MAPS, parse_tc),
+    'period': ('fixture_data/periodcharter.csv', PERIOD_RE_MAPS, parse_period),
+}
+
+
+def synthetic_corpus(path, maps, rows, seed=0):
+    """按行重复采样真实数据到 rows 行，并清空全部待补全字段"""
+    base = pd.read_csv(path)
+    df = base.sample(rows, replace=True, random_state=seed).reset_index(drop=True)
+    return df.drop(columns=[col for col in maps if col in df.columns])
+
+
+def parse_regex(s, maps):
+    """逐字段正则取出全部字段（enrich 对每条字符串做的事）"""
+    fields = {}
+    for col, pat in maps.items():
+        m = pat.search(s)
+        fields[col] = m.group(1).strip() if m else np.nan
+    return fields
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the single-pass layout grammar against per-field regex enrich')
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"feed":<8}{"rows":>10}{"grammar hit":>13}'
+          f'{"parse regex/grammar (us)":>27}{"speedup":>9}{"enrich regex/grammar (us)":>28}{"speedup":>9}')
+    for name, (path, maps, parse) in CORPUS.items():
+        df = synthetic_corpus(path, maps, args.rows)
+        texts = df['fixtureString'].astype(str).tolist()
+        hit = sum(parse(s) is not None for s in texts) / len(texts)
+        p_regex, _ = best_of(lambda: [parse_regex(s, maps) for s in texts], args.repeat)
+        p_grammar, _ = best_of(lambda: [parse(s) for s in texts], args.repeat)
+        t_regex, expected = best_of(lambda: enrich(df, maps), args.repeat)
+        t_grammar, actual = best_of(lambda: enrich(df, maps, parser=parse), args.repeat)
+        pd.testing.assert_frame_equal(actual, expected)
+        us = 1e6 / args.rows
+        print(f'{name:<8}{args.rows:>10}{hit:>12.0%} '
+              f'{p_regex * us:>17.1f} / {p_grammar * us:<7.1f}{p_regex / p_grammar:>8.1f}x'
+              f'{t_regex * us:>18.1f} / {t_grammar * us:<7.1f}{t_regex / t_grammar:>8.1f}x')
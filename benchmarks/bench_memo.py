@@ -0,0 +1,86 @@
+"""解析缓存基准测试：enrich(memo=True) vs 每次都重新解析
+用 fixture_data 中的真实 fixtureString 生成互不相同的合成语料（船名加编号，所有待补全字段清空），
+缓存写在临时目录，不影响仓库里的 parse_memo/：
+  - cold：缓存为空，解析全部字符串并写入缓存
+  - warm：同一批数据再补全一次（重放）
+  - overlap：按窗口滑动补全，相邻窗口重叠 2/3（对应手动刷新重新抓取最近几天）
+先校验各种情况的输出与不用缓存时完全一致，再比较每条 fixture 的平均耗时
+
+用法（在仓库根目录运行）：
+    python benchmarks/bench_memo.py
+    python benchmarks/bench_memo.py --rows 100000 --window 3000
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixture_memo
+from fixture_grammar import parse_tc, parse_period
+from fixture_parsing import TC_RE_MAPS, PERIOD_RE_MAPS, VC_RE_MAPS, enrich
+
+CORPUS = {
+    'tc': ('fixture_data/timecharter.csv', TC_RE_MAPS, parse_tc),
+    'period': ('fixture_data/periodcharter.csv', PERIOD_RE_MAPS, parse_period),
+    'vc': ('fixture_data/voyage_ore.csv', VC_RE_MAPS, None),
+}
+
+SHIP_NAME = re.compile(r"^'([^']*)'")
+
+
+def distinct_corpus(path, maps, rows, seed=0):
+    """按行重复采样真实数据到 rows 行，船名后加编号使每条字符串都不相同，并清空全部待补全字段"""
+    df = pd.read_csv(path).sample(rows, replace=True, random_state=seed).reset_index(drop=True)
+    df['fixtureString'] = [SHIP_NAME.sub(lambda m: f"'{m.group(1)} {n}'", s, count=1) if SHIP_NAME.match(s) else f'{s} {n}'
+                           for n, s in enumerate(df['fixtureString'].astype(str))]
+    return df.drop(columns=[col for col in maps if col in df.columns])
+
+def windows(df, size):
+    """长度为 size、步长为 size/3 的滑动窗口"""
+    step = max(size // 3, 1)
+    return [df.iloc[i:i + size] for i in range(0, max(len(df) - size, 0) + 1, step)]
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark enrich with the persistent parse memo against re-parsing')
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--window', type=int, default=3_000)
+    args = parser.parse_args()
+
+    fixture_memo.MEMO_DIR = tempfile.mkdtemp(prefix='parse_memo_')
+    fixture_memo.MAX_ENTRIES = max(fixture_memo.MAX_ENTRIES, args.rows)
+    print(f'{"feed":<8}{"rows":>8}{"no memo (us)":>14}{"cold (us)":>11}{"warm (us)":>11}'
+          f'{"overlap no memo/memo (us)":>28}{"speedup":>9}')
+    for name, (path, maps, parse) in CORPUS.items():
+        df = distinct_corpus(path, maps, args.rows)
+        t_plain, expected = timed(lambda: enrich(df, maps, parse))
+        t_cold, cold = timed(lambda: enrich(df, maps, parse, memo=True))
+        fixture_memo._loaded.clear() # 模拟新进程：从磁盘重新读入缓存
+        t_warm, warm = timed(lambda: enrich(df, maps, parse, memo=True))
+        pd.testing.assert_frame_equal(cold, expected)
+        pd.testing.assert_frame_equal(warm, expected)
+
+        fixture_memo.MEMO_DIR = tempfile.mkdtemp(prefix='parse_memo_')
+        parts = windows(df, args.window)
+        t_overlap_plain, _ = timed(lambda: [enrich(part, maps, parse) for part in parts])
+        t_overlap_memo, results = timed(lambda: [enrich(part, maps, parse, memo=True) for part in parts])
+        for part, result in zip(parts, results):
+            pd.testing.assert_frame_equal(result, expected.loc[part.index])
+        overlap_rows = sum(len(part) for part in parts)
+
+        us, overlap_us = 1e6 / args.rows, 1e6 / overlap_rows
+        print(f'{name:<8}{args.rows:>8}{t_plain * us:>14.1f}{t_cold * us:>11.1f}{t_warm * us:>11.1f}'
+              f'{t_overlap_plain * overlap_us:>18.1f} / {t_overlap_memo * overlap_us:<7.1f}'
+              f'{t_overlap_plain / t_overlap_memo:>8.1f}x')
@@ -0,0 +1,87 @@
+"""会话内存基准：各 feed 数据表在三种列类型下的内存占用
+每个 Streamlit 会话常驻六个 feed 的数据表，这里比较同一份数据：
+  - object：全部列为 Python 对象（旧版从 CSV 读入后的形态）
+  - typed：按 fixture_store 的声明带类型，但文本列都是字符串（没有类别列）
+  - categorical：当前的 apply_schema，CATEGORY_COLUMNS 中的列为类别型
+内存按 DataFrame.memory_usage(deep=True) 计（含字符串对象本身）
+数据取自分区存储（fixture_store）；存储为空时用黄金语料（fixture_data）代替。
+--rows 把每个 feed 按行重复采样到指定行数，估算历史积累到这个规模时的占用
+
+用法（在仓库根目录运行）：
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --rows 100000
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixture_store
+from fixture_parsing import add_vessel_type
+from fixture_pipeline import FEED_REGISTRY
+
+GOLDEN = {
+    'tc': 'fixture_data/timecharter.csv',
+    'period': 'fixture_data/periodcharter.csv',
+    'vcco': 'fixture_data/voyage_coal.csv',
+    'vcgr': 'fixture_data/voyage_grain.csv',
+    'vcor': 'fixture_data/voyage_ore.csv',
+}
+
+
+def load(feed_key):
+    """feed 的数据表（当前列类型）：优先读分区存储，没有时用黄金语料"""
+    spot = fixture_store.read_feed(feed_key)
+    if spot is not None:
+        return spot, 'store'
+    if feed_key not in GOLDEN:
+        return None, None
+    golden = pd.read_csv(GOLDEN[feed_key], dtype=str).set_index('date')
+    return fixture_store.apply_schema(add_vessel_type(golden)), 'fixture_data'
+
+def resampled(spot, rows, seed=0):
+    picks = np.random.default_rng(seed).integers(0, len(spot), rows)
+    return spot.iloc[np.sort(picks)]
+
+def representations(spot):
+    """{形态: DataFrame}，见模块说明"""
+    typed = spot.copy()
+    for col in fixture_store.CATEGORY_COLUMNS:
+        if col in typed.columns:
+            typed[col] = typed[col].astype('string')
+    return {'object': spot.astype(object), 'typed': typed, 'categorical': spot}
+
+def megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='In-memory size of the fixture frames under each column schema')
+    parser.add_argument('--rows', type=int, default=None, help='每个 feed 重复采样到这个行数（默认用实际行数）')
+    parser.add_argument('--feeds', nargs='+', choices=list(FEED_REGISTRY), default=list(FEED_REGISTRY))
+    args = parser.parse_args()
+
+    print(f'  {"feed":<8}{"source":<14}{"rows":>10}{"object MB":>12}{"typed MB":>12}{"categorical MB":>16}{"saved":>8}')
+    totals = {'object': 0.0, 'typed': 0.0, 'categorical': 0.0}
+    for feed_key in args.feeds:
+        spot, source = load(feed_key)
+        if spot is None:
+            print(f'  {feed_key:<8}{"(no data)":<14}')
+            continue
+        if args.rows:
+            spot = resampled(spot, args.rows)
+        sizes = {name: megabytes(df) for name, df in representations(spot).items()}
+        for name, size in sizes.items():
+            totals[name] += size
+        print(f'  {feed_key:<8}{source:<14}{len(spot):>10,}{sizes["object"]:>12.2f}{sizes["typed"]:>12.2f}'
+              f'{sizes["categorical"]:>16.2f}{1 - sizes["categorical"] / sizes["object"]:>8.0%}')
+
+    if totals['object']:
+        print(f'  {"total":<8}{"":<14}{"":>10}{totals["object"]:>12.2f}{totals["typed"]:>12.2f}'
+              f'{totals["categorical"]:>16.2f}{1 - totals["categorical"] / totals["object"]:>8.0%}')
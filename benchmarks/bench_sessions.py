@@ -0,0 +1,89 @@
+"""多会话内存基准：N 个浏览器会话同时打开时，feed 数据占用的内存
+比较两种做法在同一份数据上的内存增长：
+  - per-session：旧做法。load_feed_data 的 st.cache_data 每次命中都反序列化出一份新的 DataFrame，
+    主页面再把它存进 st.session_state，每个会话各有六个 feed 的完整副本（这里用 pickle 往返模拟）
+  - shared：当前做法。每个会话用 fixture_datasets.dataset() 取共享数据的浅拷贝，再像页面那样按日期筛选
+内存按 tracemalloc（Python 对象）加 pyarrow 内存池（arrow 字符串列）计，取全部会话都持有数据时相对开始前的增量
+
+数据取自 bench_memory.load()（分区存储，没有时用黄金语料），按 --rows 重复采样后写入临时目录下的分区存储，
+两种做法读的是同一份数据
+
+用法（在仓库根目录运行）：
+    python benchmarks/bench_sessions.py
+    python benchmarks/bench_sessions.py --rows 100000 --sessions 1 10 40
+"""
+
+import argparse
+import gc
+import os
+import pickle
+import sys
+import tempfile
+import tracemalloc
+
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fixture_datasets
+import fixture_store
+from bench_memory import load, resampled
+from fixture_pipeline import FEED_REGISTRY
+
+
+def per_session(feed_keys):
+    """旧做法的一个会话：每个 feed 一份反序列化出来的完整副本"""
+    return {feed_key: pickle.loads(pickle.dumps(fixture_store.read_feed(feed_key))) for feed_key in feed_keys}
+
+def shared(feed_keys):
+    """当前做法的一个会话：共享数据的浅拷贝，按最近一年的日期筛选（页面上的典型操作）"""
+    session = {}
+    for feed_key in feed_keys:
+        spot = fixture_datasets.dataset(feed_key)
+        start = spot.index.max() - pd.DateOffset(years=1)
+        session[feed_key] = spot[spot.index >= start]
+    return session
+
+def measure(open_session, feed_keys, sessions):
+    """打开 sessions 个会话并全部持有时的内存增量（MB）"""
+    fixture_datasets.clear()
+    gc.collect()
+    tracemalloc.start()
+    arrow_before = pa.total_allocated_bytes()
+    held = [open_session(feed_keys) for _ in range(sessions)]
+    python_bytes, _ = tracemalloc.get_traced_memory()
+    arrow_bytes = pa.total_allocated_bytes() - arrow_before
+    tracemalloc.stop()
+    del held
+    return (python_bytes + arrow_bytes) / 1e6
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Memory held by N concurrent sessions, per-session copies vs shared datasets')
+    parser.add_argument('--rows', type=int, default=20000, help='每个 feed 重复采样到这个行数（0 为实际行数）')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10, 20, 40])
+    parser.add_argument('--feeds', nargs='+', choices=list(FEED_REGISTRY), default=list(FEED_REGISTRY))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        sources = {feed_key: load(feed_key)[0] for feed_key in args.feeds}
+        fixture_store.STORE_DIR = store_dir
+        feed_keys = []
+        for feed_key, spot in sources.items():
+            if spot is not None:
+                # 直接按月写分区：upsert 会按成交标识把重复采样出的行去重
+                spot = resampled(spot, args.rows) if args.rows else spot
+                for month, group in spot.groupby(spot.index.to_period('M')):
+                    fixture_store.write_partition(feed_key, str(month), group)
+                feed_keys.append(feed_key)
+        del sources
+
+        print(f'feeds: {", ".join(feed_keys)}; {args.rows or "actual"} rows each')
+        print(f'  {"sessions":>8}{"per-session MB":>16}{"shared MB":>12}{"saved":>8}')
+        for n in args.sessions:
+            old = measure(per_session, feed_keys, n)
+            new = measure(shared, feed_keys, n)
+            print(f'  {n:>8}{old:>16.1f}{new:>12.1f}{1 - new / old:>8.0%}')
@@ -0,0 +1,122 @@
+"""原始响应归档与离线重放
+每次 API 成功返回的原始 JSON 都按 feed / 月份追加写入压缩的 JSONL 归档（raw_archive/<feed>/<YYYY-MM>.jsonl.gz），
+修改正则后可以用 replay 直接从归档并行重建各 feed 的数据文件，不需要重新请求 API
+
+用法：
+    python fixture_archive.py replay
+    python fixture_archive.py replay --feeds tc period --workers 4
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ARCHIVE_DIR = 'raw_archive'
+
+_archive_locks = {}
+_archive_locks_guard = threading.Lock()
+
+
+def archive_path(feed_key, datefrom):
+    """归档分区路径：按 feed 和请求起始日期所在月份分区"""
+    return os.path.join(ARCHIVE_DIR, feed_key, f"{datefrom:%Y-%m}.jsonl.gz")
+
+def archive_response(feed_key, datefrom, dateto, data):
+    """把一次原始响应追加到归档（gzip 追加写入会形成多个 member，读取时自动拼接）"""
+    path = archive_path(feed_key, datefrom)
+    record = {
+        'feed': feed_key,
+        'from': f"{datefrom:%Y-%m-%d}",
+        'to': f"{dateto:%Y-%m-%d}",
+        'fetched_at': datetime.now().isoformat(),
+        'payload': data,
+    }
+    line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+    with _archive_locks_guard:
+        lock = _archive_locks.setdefault(path, threading.Lock())
+    with lock:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path, 'ab') as f:
+            f.write(line)
+
+def read_partition(path):
+    """按写入顺序读出一个归档分区里的全部响应记录"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def list_partitions(feed_key):
+    return sorted(glob.glob(os.path.join(ARCHIVE_DIR, feed_key, '*.jsonl.gz')))
+
+
+# ---------- 离线重放 ----------
+def replay_partition(feed_key, path):
+    """在子进程中重新解析一个分区，返回其中每个非空响应的 [(抓取时间, 窗口起, 窗口止, 处理后的 DataFrame), ...]
+    整个分区的成交一起解析，再按响应切开（process_fixtures 不改变行数和行序）
+    """
+    from fixture_pipeline import FEED_REGISTRY, fixtures_from_payload, process_fixtures
+
+    fixtures, responses = [], []
+    for record in read_partition(path):
+        items = fixtures_from_payload(record['payload'])
+        if items:
+            responses.append((record['fetched_at'], pd.Timestamp(record['from']), pd.Timestamp(record['to']), len(items)))
+            fixtures.extend(items)
+    if not fixtures:
+        return []
+    spot = process_fixtures(FEED_REGISTRY[feed_key], pd.DataFrame(fixtures))
+    bounds = np.cumsum([0] + [n for *_, n in responses])
+    return [(fetched_at, start, end, spot.iloc[lo:hi])
+            for (fetched_at, start, end, _), lo, hi in zip(responses, bounds[:-1], bounds[1:])]
+
+def replay(feed_keys=None, max_workers=None):
+    """用归档重建各 feed 的数据：归档中的成交覆盖存储里的同一条记录，其余历史记录保留
+    与在线同步一样，每个响应对自己的日期窗口是完整的：按抓取时间依次合并，较新的响应中已被修正或撤回的成交不保留
+    返回 {feed名: 重放出的行数}
+    """
+    import fixture_store
+    from fixture_pipeline import FEED_REGISTRY, prepare_store, quarantine_oversized
+
+    feed_keys = feed_keys or list(FEED_REGISTRY)
+    tasks = [(feed_key, path) for feed_key in feed_keys for path in list_partitions(feed_key)]
+    print(f'Replaying {len(tasks)} archive partitions')
+
+    # 解析是 CPU 密集型，用多进程并行
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(replay_partition, *zip(*tasks))) if tasks else []
+
+    replayed = {}
+    for feed_key in feed_keys:
+        # 各分区的响应按抓取时间排序后依次合并，较新的响应覆盖较旧的
+        responses = sorted((r for (key, _), rs in zip(tasks, results) if key == feed_key for r in rs), key=lambda r: r[0])
+        spot = None
+        for _, start, end, df in responses:
+            spot = fixture_store.upsert_history(spot, df, windows=[(start, end)])
+        replayed[feed_key] = 0 if spot is None else len(spot)
+        if spot is None or spot.empty:
+            continue
+        prepare_store([feed_key])
+        quarantine_oversized(feed_key, spot)
+        fixture_store.upsert(feed_key, spot, windows=[(start, end) for _, start, end, _ in responses])
+    return replayed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rebuild fixture datasets from the raw response archive')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    replay_parser = subparsers.add_parser('replay', help='re-parse archived responses without calling the API')
+    replay_parser.add_argument('--feeds', nargs='+', help='feeds to replay (default: all)')
+    replay_parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == 'replay':
+        for feed_key, rows in replay(args.feeds, args.workers).items():
+            print(f'{feed_key}: {rows} rows replayed')
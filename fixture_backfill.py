@@ -0,0 +1,153 @@
+"""历史数据回补（backfill）
+把任意日期区间切成若干工作日窗口，跨 feed 并发抓取（节奏由共享客户端的令牌桶控制），
+每个完成的窗口先写入暂存文件并记入检查点；中断后重新运行同一命令会跳过已完成的窗口，
+最后把暂存数据一次性合并进各 feed 的分区存储
+
+用法：
+    python fixture_backfill.py 2024-01-01 2024-12-31
+    python fixture_backfill.py 2024-01-01 2024-12-31 --feeds tc period --workers 4
+"""
+
+import argparse
+import glob
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+import fixture_store
+from fixture_pipeline import FEED_REGISTRY, fetch_fixtures, process_fixtures, prepare_store, quarantine_oversized, split_windows
+
+BACKFILL_CHECKPOINT_FILE = 'backfill_checkpoint.json'
+BACKFILL_STAGING_DIR = 'backfill_staging'
+BACKFILL_WINDOW_DAYS = 20 # 每个请求窗口包含的工作日数
+
+_checkpoint_lock = threading.Lock()
+
+
+# ---------- 检查点 ----------
+def window_id(window):
+    """窗口标识，如 '2024-01-01:2024-01-26'"""
+    return f"{window[0]:%Y-%m-%d}:{window[1]:%Y-%m-%d}"
+
+def read_checkpoint():
+    """读取检查点 {任务区间: {feed名: [已完成窗口, ...]}}"""
+    if not os.path.exists(BACKFILL_CHECKPOINT_FILE):
+        return {}
+    try:
+        with open(BACKFILL_CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_checkpoint(checkpoint):
+    """写入检查点（原子写入，见 fixture_store.atomic_write，避免中断时留下半个文件）"""
+    def write(tmp_path):
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    fixture_store.atomic_write(BACKFILL_CHECKPOINT_FILE, write)
+
+def mark_window_done(job_id, feed_key, window):
+    """把一个窗口记为已完成"""
+    with _checkpoint_lock:
+        checkpoint = read_checkpoint()
+        done = checkpoint.setdefault(job_id, {}).setdefault(feed_key, [])
+        if window_id(window) not in done:
+            done.append(window_id(window))
+        write_checkpoint(checkpoint)
+
+def clear_job(job_id):
+    """任务全部完成后删除其检查点"""
+    with _checkpoint_lock:
+        checkpoint = read_checkpoint()
+        checkpoint.pop(job_id, None)
+        write_checkpoint(checkpoint)
+
+
+# ---------- 单个窗口 ----------
+def staging_path(feed_key, window):
+    return os.path.join(BACKFILL_STAGING_DIR, feed_key, window_id(window).replace(':', '_') + '.csv')
+
+def staged_window(path):
+    """暂存文件对应的窗口 (from, to)，staging_path 的逆运算"""
+    start, end = os.path.basename(path)[:-len('.csv')].split('_')
+    return pd.Timestamp(start), pd.Timestamp(end)
+
+def run_window(job_id, feed_key, window):
+    """抓取并处理一个窗口，结果写入暂存文件；成功返回 True"""
+    feed = FEED_REGISTRY[feed_key]
+    fixtures_df = fetch_fixtures(feed_key, *window)
+    if fixtures_df is None:
+        return False
+    if not fixtures_df.empty:
+        staged = process_fixtures(feed, fixtures_df)
+        fixture_store.atomic_write(staging_path(feed_key, window), lambda tmp_path: staged.to_csv(tmp_path, index_label='date'))
+    mark_window_done(job_id, feed_key, window)
+    return True
+
+def commit_staged(feed_key):
+    """把某个 feed 已暂存的窗口 upsert 进分区存储（每个窗口的响应是完整的，窗口内已被修正或撤回的旧记录随之删除），
+    然后删除暂存文件；返回合并的行数"""
+    paths = sorted(glob.glob(os.path.join(BACKFILL_STAGING_DIR, feed_key, '*.csv')))
+    if not paths:
+        return 0
+    staged = pd.concat([pd.read_csv(p, parse_dates=['date'], dtype={'fixture_id': str}) for p in paths]).set_index('date')
+    prepare_store([feed_key])
+    quarantine_oversized(feed_key, staged)
+    fixture_store.upsert(feed_key, staged, windows=[staged_window(p) for p in paths])
+    for p in paths:
+        os.remove(p)
+    return len(staged)
+
+
+# ---------- 回补任务 ----------
+def backfill(date_from, date_to, feed_keys=None, max_workers=6, window_days=BACKFILL_WINDOW_DAYS):
+    """回补 [date_from, date_to] 的历史数据，返回 {feed名: 合并行数}；有窗口失败时保留检查点以便续跑"""
+    feed_keys = feed_keys or list(FEED_REGISTRY)
+    date_from, date_to = pd.Timestamp(date_from), pd.Timestamp(date_to)
+    job_id = f"{date_from:%Y-%m-%d}:{date_to:%Y-%m-%d}"
+    windows = split_windows(date_from, date_to, window_days)
+
+    done = read_checkpoint().get(job_id, {})
+    tasks = [(feed_key, window) for feed_key in feed_keys for window in windows
+             if window_id(window) not in done.get(feed_key, [])]
+    skipped = len(feed_keys) * len(windows) - len(tasks)
+    print(f'Backfill {job_id}: {len(tasks)} windows to fetch, {skipped} already done')
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(run_window, job_id, feed_key, window): (feed_key, window)
+                   for feed_key, window in tasks}
+        for future in as_completed(futures):
+            feed_key, window = futures[future]
+            try:
+                ok = future.result()
+            except Exception as e:
+                print(f'  {feed_key} {window_id(window)} failed: {e}')
+                ok = False
+            if not ok:
+                failed += 1
+            print(f"  {feed_key} {window_id(window)} {'done' if ok else 'FAILED'}")
+
+    merged = {feed_key: commit_staged(feed_key) for feed_key in feed_keys}
+    if failed:
+        print(f'{failed} windows failed; run the same command again to resume')
+    else:
+        clear_job(job_id)
+    return merged
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backfill Baltic fixture history into the local datasets')
+    parser.add_argument('date_from', help='YYYY-MM-DD')
+    parser.add_argument('date_to', help='YYYY-MM-DD')
+    parser.add_argument('--feeds', nargs='+', choices=list(FEED_REGISTRY), help='feeds to backfill (default: all)')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('BALTIC_MAX_WORKERS', 6)))
+    parser.add_argument('--window-days', type=int, default=BACKFILL_WINDOW_DAYS)
+    args = parser.parse_args()
+
+    result = backfill(args.date_from, args.date_to, args.feeds, args.workers, args.window_days)
+    for feed_key, rows in result.items():
+        print(f"{FEED_REGISTRY[feed_key]['label']}: {rows} rows merged")
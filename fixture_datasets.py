@@ -0,0 +1,47 @@
+"""进程内共享的 feed 数据集
+Streamlit 的所有浏览器会话跑在同一个进程里。每个 feed 的全量数据在进程内只保留一份（按数据版本缓存），
+所有会话共用；会话里只放筛选条件，页面每次运行时用 dataset() 取数据
+  - 数据版本由分区文件的月份和修改时间决定（见 store_version），同步 / 迁移写入分区后，下一次取数据时重新加载，
+    旧版本在没有会话引用后释放
+  - dataset() 返回共享数据的浅拷贝，不复制数据本身。pandas 3 起写时复制（Copy-on-Write）始终开启，页面在返回的表上
+    增删列、改值（包括 .loc[...] = 和 inplace=True）都只影响自己的副本，共享的数据是只读的；
+    这依赖 pandas >= 3.0（见 requirements.txt）。pandas 2.x 默认不开写时复制，原地修改会改到所有会话共用的那一份
+会话数增加时内存基本不变（见 benchmarks/bench_sessions.py）
+"""
+
+import os
+import threading
+
+import fixture_store
+
+_datasets = {} # {feed名: (数据版本, DataFrame 或 None)}
+_lock = threading.Lock()
+
+
+def store_version(feed_key):
+    """feed 的数据版本：各月份分区的 (月份, 修改时间)；只读文件系统的元数据，不读数据"""
+    version = []
+    for month in fixture_store.list_months(feed_key):
+        try:
+            version.append((month, os.path.getmtime(fixture_store.partition_path(feed_key, month))))
+        except FileNotFoundError:
+            continue
+    return tuple(version)
+
+def dataset(feed_key):
+    """feed 的当前全量数据（以 date 为索引，列类型见 fixture_store），没有数据时返回 None
+    同一版本的数据在进程内只读取一次；返回的是共享数据的浅拷贝，借助 pandas 3 的写时复制可以放心修改
+    """
+    version = store_version(feed_key)
+    with _lock:
+        cached = _datasets.get(feed_key)
+        if cached is None or cached[0] != version:
+            cached = (version, fixture_store.read_feed(feed_key))
+            _datasets[feed_key] = cached
+    spot = cached[1]
+    return None if spot is None else spot.copy(deep=False)
+
+def clear():
+    """丢弃全部缓存的数据集，下次取数据时重新读取"""
+    with _lock:
+        _datasets.clear()
@@ -0,0 +1,255 @@
+"""fixture 查询库（SQLite）
+把分区存储中的数据加载进本地 SQLite 数据库（fixtures.sqlite，每个 feed 一张表），
+并在 date、VESSEL TYPE、charterer 和各港口列上建索引；历史页面把侧边栏的筛选条件
+拼成一条参数化查询，只取回命中的行，筛选耗时不随历史总量线性增长
+数据库只是分区存储的索引副本：refresh 按分区文件的修改时间只重新加载变化过的月份
+另有一张隔离表（_quarantine），记录超出解析预算、没有解析的 fixtureString，供排查数据源
+"""
+
+import datetime
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+
+import fixture_store
+
+DB_FILE = 'fixtures.sqlite'
+
+# 需要建索引的列（表中存在才建）
+INDEXED_COLUMNS = ['date', 'VESSEL TYPE', 'charterer',
+                   'deliveryPort', 'loadArea', 'via', 'redel', 'loadPort', 'dischargePort', 'laycan_start']
+
+
+@contextmanager
+def connect():
+    """打开数据库连接，块内操作作为一个事务提交，结束后关闭连接"""
+    conn = sqlite3.connect(DB_FILE, timeout=30)
+    try:
+        with conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS _partitions '
+                         '(feed TEXT, month TEXT, mtime REAL, PRIMARY KEY (feed, month))')
+            conn.execute('CREATE TABLE IF NOT EXISTS _quarantine '
+                         '(feed TEXT, fixture_id TEXT, date TEXT, length INTEGER, reason TEXT, '
+                         'fixtureString TEXT, logged_at TEXT, PRIMARY KEY (feed, fixture_id))')
+            yield conn
+    finally:
+        conn.close()
+
+def quote(name):
+    """SQL 标识符加双引号（列名如 'VESSEL TYPE' 含空格）"""
+    return '"' + name.replace('"', '""') + '"'
+
+def sql_value(value):
+    """查询参数：日期统一写成 'YYYY-MM-DD'（与表中日期列的存法一致，按字符串比较即按日期比较）"""
+    if isinstance(value, (pd.Timestamp, datetime.date)):
+        return f'{pd.Timestamp(value):%Y-%m-%d}'
+    return value
+
+def table_columns(conn, feed_key):
+    """feed 表中已有的列（不含内部的 month 列）；表不存在时返回空列表"""
+    rows = conn.execute(f'PRAGMA table_info({quote(feed_key)})').fetchall()
+    return [row[1] for row in rows if row[1] != 'month']
+
+
+# ---------- 从分区存储加载 ----------
+def ensure_table(conn, feed_key, columns):
+    """建表 / 补列 / 建索引；新数据出现表中没有的列时用 ALTER TABLE 补上"""
+    conn.execute(f'CREATE TABLE IF NOT EXISTS {quote(feed_key)} (date TEXT, month TEXT)')
+    existing = set(table_columns(conn, feed_key))
+    for col in columns:
+        if col not in existing:
+            if col in fixture_store.NUMERIC_COLUMNS + fixture_store.BOOLEAN_COLUMNS:
+                col_type = 'INTEGER'
+            elif col in fixture_store.FLOAT_COLUMNS:
+                col_type = 'REAL'
+            else:
+                col_type = 'TEXT'
+            conn.execute(f'ALTER TABLE {quote(feed_key)} ADD COLUMN {quote(col)} {col_type}')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS {quote(f"{feed_key}_month")} ON {quote(feed_key)} (month)')
+    for col in INDEXED_COLUMNS:
+        if col == 'date' or col in columns or col in existing:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS {quote(f"{feed_key}_{col}")} '
+                         f'ON {quote(feed_key)} ({quote(col)})')
+
+def partition_mtime(feed_key, month):
+    for suffix in (fixture_store.PARTITION_SUFFIX, fixture_store.LEGACY_PARTITION_SUFFIX):
+        path = fixture_store.partition_path(feed_key, month, suffix)
+        if os.path.exists(path):
+            return os.path.getmtime(path)
+    return None
+
+def load_partition(conn, feed_key, month):
+    """用一个月份分区的当前内容替换表中该月份的行"""
+    spot = fixture_store.read_partition(feed_key, month)
+    conn.execute(f'DELETE FROM {quote(feed_key)} WHERE month = ?', (month,))
+    if spot is None or spot.empty:
+        return
+    ensure_table(conn, feed_key, list(spot.columns))
+    rows = spot.reset_index()
+    for col in ['date'] + [c for c in fixture_store.DATE_COLUMNS if c in rows.columns]:
+        rows[col] = rows[col].dt.strftime('%Y-%m-%d')
+    rows['month'] = month
+    rows = rows.astype(object).where(rows.notna(), None)
+    names = ', '.join(quote(c) for c in rows.columns)
+    marks = ', '.join('?' for _ in rows.columns)
+    conn.executemany(f'INSERT INTO {quote(feed_key)} ({names}) VALUES ({marks})',
+                     rows.itertuples(index=False, name=None))
+
+def refresh(feed_key):
+    """把分区存储中新增或修改过的月份同步进数据库，删除存储中已不存在的月份；返回重新加载的月份数"""
+    with connect() as conn:
+        loaded = dict(conn.execute('SELECT month, mtime FROM _partitions WHERE feed = ?', (feed_key,)).fetchall())
+        months = fixture_store.list_months(feed_key)
+        reloaded = 0
+        for month in months:
+            mtime = partition_mtime(feed_key, month)
+            if mtime is None or loaded.get(month) == mtime:
+                continue
+            ensure_table(conn, feed_key, [])
+            load_partition(conn, feed_key, month)
+            conn.execute('INSERT OR REPLACE INTO _partitions VALUES (?, ?, ?)', (feed_key, month, mtime))
+            reloaded += 1
+        for month in set(loaded) - set(months):
+            conn.execute(f'DELETE FROM {quote(feed_key)} WHERE month = ?', (month,))
+            conn.execute('DELETE FROM _partitions WHERE feed = ? AND month = ?', (feed_key, month))
+            reloaded += 1
+        # 数据变化后更新统计信息，否则查询规划器可能用 'IS NOT NULL' 走港口列索引而不是日期索引，扫描全表
+        if reloaded:
+            conn.execute(f'ANALYZE {quote(feed_key)}')
+    return reloaded
+
+
+# ---------- 查询 ----------
+def build_where(columns, start=None, end=None, filters=None, keyword_filter=None, ranges=None):
+    """把筛选条件拼成 WHERE 子句和参数列表
+    filters: {列名: [选中的值, ...]}，与页面原来的语义一致：命中所选值或该列为空
+    keyword_filter: (列名列表, 关键字列表)，任一列包含任一关键字（不区分大小写）即命中
+    ranges: {数值或日期列名: (下限, 上限)}，闭区间，None 表示该侧不限，该列为空的行不命中（页面只在用户收窄范围时传入）
+    表中不存在的列会被忽略
+    """
+    clauses, params = [], []
+    if start is not None:
+        clauses.append('date >= ?')
+        params.append(f'{pd.Timestamp(start):%Y-%m-%d}')
+    if end is not None:
+        clauses.append('date <= ?')
+        params.append(f'{pd.Timestamp(end):%Y-%m-%d}')
+    for col, values in (filters or {}).items():
+        if col not in columns or not values:
+            continue
+        marks = ', '.join('?' for _ in values)
+        clauses.append(f'({quote(col)} IN ({marks}) OR {quote(col)} IS NULL)')
+        params.extend(values)
+    for col, (low, high) in (ranges or {}).items():
+        if col not in columns:
+            continue
+        if low is not None:
+            clauses.append(f'{quote(col)} >= ?')
+            params.append(sql_value(low))
+        if high is not None:
+            clauses.append(f'{quote(col)} <= ?')
+            params.append(sql_value(high))
+        if low is None and high is None:
+            clauses.append(f'{quote(col)} IS NOT NULL')
+    if keyword_filter:
+        fields, keywords = keyword_filter
+        likes = [f'UPPER({quote(col)}) LIKE ?' for col in fields if col in columns for _ in keywords]
+        if likes:
+            clauses.append('(' + ' OR '.join(likes) + ')')
+            params.extend(f'%{kw.upper()}%' for col in fields if col in columns for kw in keywords)
+    where = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+    return where, params
+
+def query(feed_key, start=None, end=None, filters=None, keyword_filter=None, columns=None, ranges=None):
+    """按筛选条件查询一个 feed，返回以 date 为索引、按日期倒序的 DataFrame（只含 columns 中存在的列）"""
+    with connect() as conn:
+        available = table_columns(conn, feed_key)
+        if not available:
+            return pd.DataFrame()
+        selected = [c for c in (columns or available) if c in available and c != 'date']
+        where, params = build_where(available, start, end, filters, keyword_filter, ranges)
+        select = ', '.join(['date'] + [quote(c) for c in selected])
+        sql = f'SELECT {select} FROM {quote(feed_key)}{where} ORDER BY date DESC'
+        spot = pd.read_sql_query(sql, conn, params=params, parse_dates=['date'], index_col='date')
+    for col in fixture_store.NUMERIC_COLUMNS:
+        if col in spot.columns:
+            spot[col] = spot[col].astype('Int64')
+    for col in fixture_store.FLOAT_COLUMNS:
+        if col in spot.columns:
+            spot[col] = spot[col].astype('Float64')
+    for col in fixture_store.BOOLEAN_COLUMNS:
+        if col in spot.columns:
+            spot[col] = spot[col].astype('boolean')
+    for col in fixture_store.DATE_COLUMNS:
+        if col in spot.columns:
+            spot[col] = pd.to_datetime(spot[col])
+    return spot
+
+def count(feed_key, start=None, end=None, filters=None, keyword_filter=None, ranges=None):
+    """满足条件的记录数"""
+    with connect() as conn:
+        available = table_columns(conn, feed_key)
+        if not available:
+            return 0
+        where, params = build_where(available, start, end, filters, keyword_filter, ranges)
+        return conn.execute(f'SELECT COUNT(*) FROM {quote(feed_key)}{where}', params).fetchone()[0]
+
+def distinct_values(feed_key, column, start=None, end=None, filters=None, keyword_filter=None, ranges=None):
+    """满足条件的记录中某列的不同取值（不含空值），升序；列不存在时返回空列表"""
+    with connect() as conn:
+        available = table_columns(conn, feed_key)
+        if column not in available:
+            return []
+        where, params = build_where(available, start, end, filters, keyword_filter, ranges)
+        where += (' AND ' if where else ' WHERE ') + f'{quote(column)} IS NOT NULL'
+        sql = f'SELECT DISTINCT {quote(column)} FROM {quote(feed_key)}{where} ORDER BY {quote(column)}'
+        return [row[0] for row in conn.execute(sql, params).fetchall()]
+
+def value_range(feed_key, column, start=None, end=None):
+    """时间范围内某个数值列的 (最小值, 最大值)；列不存在或没有值时返回 None"""
+    with connect() as conn:
+        available = table_columns(conn, feed_key)
+        if column not in available:
+            return None
+        where, params = build_where(available, start, end)
+        low, high = conn.execute(f'SELECT MIN({quote(column)}), MAX({quote(column)}) '
+                                 f'FROM {quote(feed_key)}{where}', params).fetchone()
+    if low is None:
+        return None
+    return low, high
+
+def summary(feed_key):
+    """(最早日期, 最新日期, 总记录数)；没有数据时返回 (None, None, 0)"""
+    with connect() as conn:
+        if not table_columns(conn, feed_key):
+            return None, None, 0
+        earliest, latest, total = conn.execute(
+            f'SELECT MIN(date), MAX(date), COUNT(*) FROM {quote(feed_key)}').fetchone()
+    if not total:
+        return None, None, 0
+    return pd.Timestamp(earliest), pd.Timestamp(latest), total
+
+
+# ---------- 隔离表 ----------
+def quarantine(feed_key, spot, reason):
+    """把 spot（以 date 为索引，含 fixture_id、fixtureString）中的成交记入隔离表，同一条成交只记一次
+    返回新记入的条数
+    """
+    if spot is None or spot.empty:
+        return 0
+    text = spot['fixtureString'].astype(str)
+    logged_at = f'{pd.Timestamp.now():%Y-%m-%d %H:%M:%S}'
+    rows = [(feed_key, fixture_id, f'{pd.Timestamp(date):%Y-%m-%d}', len(s), reason, s, logged_at)
+            for date, fixture_id, s in zip(spot.index, spot['fixture_id'], text)]
+    with connect() as conn:
+        before = conn.total_changes
+        conn.executemany('INSERT OR IGNORE INTO _quarantine VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+        return conn.total_changes - before
+
+def quarantined(feed_key=None):
+    """隔离表中的记录（可按 feed 过滤），按记入时间倒序"""
+    where, params = (' WHERE feed = ?', [feed_key]) if feed_key else ('', [])
+    with connect() as conn:
+        return pd.read_sql_query(f'SELECT * FROM _quarantine{where} ORDER BY logged_at DESC', conn, params=params)
@@ -0,0 +1,248 @@
+"""fixture 结构化字段
+从正则补全后的文本字段派生可以直接做数值统计的列（如租金），在入库时计算一次，
+按类型存进分区存储（列类型见 fixture_store），页面上求均值、分位数时不必每次重新处理字符串
+每个函数都是对整列的向量化 str.extract，在 FEED_REGISTRY 的 derive 中登记后由流水线调用
+与 enrich 共用单条字符串的解析预算：超长的文本不做匹配（见 bounded），对应列为空值
+"""
+
+import re
+
+import pandas as pd
+
+from fixture_parsing import MAX_FIXTURE_LENGTH
+
+
+def bounded(text):
+    """超出解析预算（MAX_FIXTURE_LENGTH）的文本记为空值，不进正则"""
+    text = text.astype('string')
+    return text.mask(text.str.len().gt(MAX_FIXTURE_LENGTH).fillna(False))
+
+# ---------- 金额 ----------
+# 金额先去掉千分位逗号再匹配：'$12,000' / '$12.5k' / '$1.1m'；数字后面不能紧跟数字或小数点，避免回溯时截断
+NUMBER = r'\d+(?:\.\d+)?(?![\d.])'
+BALLAST_BONUS = r'(?:bbb?|gbb|ballast\s+bonus)\b'
+NOT_BALLAST_BONUS = rf'(?!\s*[km]?\s*{BALLAST_BONUS})'
+UNITS = {'k': 1_000, 'm': 1_000_000}
+
+def amount(name):
+    """'$金额(k/m)' 的正则片段，金额和单位分别放在 name、name_unit 两个命名组里"""
+    return rf'\$\s*(?P<{name}>{NUMBER})(?:\s*(?P<{name}_unit>[km])\b)?'
+
+def usd(parts, name):
+    """把 amount(name) 取出的金额和单位换算成美元整数（Int64，未命中为空值）"""
+    value = pd.to_numeric(parts[name], errors='coerce')
+    unit = parts[f'{name}_unit'].str.lower().map(UNITS).astype('Float64').fillna(1)
+    return (value * unit).round().astype('Int64')
+
+
+# ---------- 租金（TC / PERIOD） ----------
+# 日租金：hire 开头的第一个金额，且不是压港 / 空放奖励（'$110,000bb'）
+HIRE_RATE = re.compile(r'^\s*' + amount('rate') + NOT_BALLAST_BONUS, re.I)
+# 空放奖励：任意位置 '$金额bb'，如 '$12,000 + $110,000bb'
+HIRE_BALLAST_BONUS = re.compile(amount('bonus') + rf'\s*{BALLAST_BONUS}', re.I)
+# 分段租金：'$17,000 first 90 days $20,000 balance period'、'$10,500 for 75 days $12,000 thereafter'
+HIRE_TIERS = re.compile(r'^\s*' + amount('tier1') + NOT_BALLAST_BONUS
+                        + r'\s+(?:for\s+(?:the\s+)?(?:first\s+)?|first\s+)(?P<days>\d+)\s*days?\b.*?'
+                        + amount('tier2') + NOT_BALLAST_BONUS, re.I)
+
+HIRE_COLUMNS = ['hire_usd_day', 'ballast_bonus_usd', 'hire_tiered',
+                'hire_tier1_usd_day', 'hire_tier1_days', 'hire_tier2_usd_day']
+
+def add_hire_columns(df):
+    """把 hire 文本拆成数值列：
+    hire_usd_day 日租金（分段租金取第一段，即报价的起始租金）、ballast_bonus_usd 空放奖励（一次性，美元），
+    hire_tiered 是否分段租金，hire_tier1_usd_day / hire_tier1_days / hire_tier2_usd_day 分段租金的两段金额和第一段天数
+    无法识别的写法对应列为空值
+    """
+    if df is None or df.empty:
+        return df
+
+    df = df.copy()
+    if 'hire' not in df.columns:
+        df['hire'] = None
+    hire = bounded(df['hire']).str.replace(',', '', regex=False)
+
+    rate = hire.str.extract(HIRE_RATE)
+    bonus = hire.str.extract(HIRE_BALLAST_BONUS)
+    tiers = hire.str.extract(HIRE_TIERS)
+
+    df['hire_usd_day'] = usd(rate, 'rate')
+    df['ballast_bonus_usd'] = usd(bonus, 'bonus')
+    df['hire_tiered'] = tiers['tier1'].notna().astype('boolean').mask(hire.isna())
+    df['hire_tier1_usd_day'] = usd(tiers, 'tier1')
+    df['hire_tier1_days'] = pd.to_numeric(tiers['days'], errors='coerce').astype('Int64')
+    df['hire_tier2_usd_day'] = usd(tiers, 'tier2')
+    return df
+
+
+# ---------- 运费与装卸条款（VOYAGE） ----------
+# rateAndTerms 如 '$10.54 fio 30000ltshinc/19000ltshinc'、'$23.50 fio 3days shinc/30000shinc'、'$12.60 fio scale/15000shinc'
+# 接口没给 rateAndTerms 时，取 fixtureString 中第一个 '$' 到 ' - 租家' 之间的一段
+RATE_AND_TERMS = re.compile(r'(\$.*?)(?<!\s)(?:\s+(?!\s)-\s|\s*(?!\s)$)')
+# 运费（美元/吨）和运费条款；包干运费（lumpsum）不是每吨单价，不计入
+FREIGHT = re.compile(rf'^\s*\$\s*(?P<freight>{NUMBER})(?!\s*[km]?\s*(?:ls|lumpsum|lump\s+sum)\b)'
+                     r'(?:\s*(?P<terms>fiost|fiot|fios|fio|filo|lifo|fi|fo|liner)\b)?', re.I)
+# 装卸率限定词：(lt/mt)(satpm)shinc / sshex / fhinc ...，如 ltshinc、satpmshexuu
+QUALIFIER = r'(?:lt|mt)?(?:satpm)?(?:s?sh|fh)(?:inc|ex)(?:uu|eiu)?'
+
+def laytime_leg(name):
+    """一侧装卸条款：若干天、scale 或每日装卸率（吨），后面跟限定词"""
+    return rf'(?:\d+\s*days?|scale|(?P<{name}>\d+)(?![\d.]))\s*(?!\s)'
+
+# 装率/卸率：'90000shinc/30000shinc'；装货一侧必须带限定词或后面跟 '/'，避免把港口名等处的数字当成装卸率
+LAYTIME = re.compile(r'(?:^|\s)' + laytime_leg('load') + rf'(?:(?P<load_terms>{QUALIFIER})\b|(?=\s*/))'
+                     + r'(?:\s*/\s*' + laytime_leg('discharge') + rf'(?:(?P<discharge_terms>{QUALIFIER})\b)?)?', re.I)
+
+FREIGHT_COLUMNS = ['freight_usd_t', 'terms', 'load_rate_t_day', 'load_terms', 'discharge_rate_t_day', 'discharge_terms']
+
+def add_freight_columns(df):
+    """把程租的 rateAndTerms 拆成数值列和条款列：
+    freight_usd_t 运费（美元/吨）、terms 运费条款（FIO / FIOT ...），
+    load_rate_t_day / discharge_rate_t_day 每日装 / 卸率（按报价单位，LT 报价见限定词）、
+    load_terms / discharge_terms 装卸率限定词（SHINC / SSHEX / LTSHINC ...）
+    按天数或 scale 报的装卸条款只有限定词、没有装卸率；无法识别的写法对应列为空值
+    """
+    if df is None or df.empty:
+        return df
+
+    df = df.copy()
+    text = bounded(df['rateAndTerms']) if 'rateAndTerms' in df.columns else pd.Series(pd.NA, index=df.index, dtype='string')
+    if 'fixtureString' in df.columns:
+        missing = text.isna() | text.str.strip().eq('')
+        fallback = bounded(df['fixtureString']).str.extract(RATE_AND_TERMS, expand=False)
+        text = text.mask(missing, fallback)
+    text = text.str.replace(',', '', regex=False)
+
+    freight = text.str.extract(FREIGHT)
+    laytime = text.str.extract(LAYTIME)
+
+    df['freight_usd_t'] = pd.to_numeric(freight['freight'], errors='coerce').astype('Float64')
+    df['terms'] = freight['terms'].str.upper()
+    df['load_rate_t_day'] = pd.to_numeric(laytime['load'], errors='coerce').astype('Int64')
+    df['load_terms'] = laytime['load_terms'].str.upper()
+    df['discharge_rate_t_day'] = pd.to_numeric(laytime['discharge'], errors='coerce').astype('Int64')
+    df['discharge_terms'] = laytime['discharge_terms'].str.upper()
+    return df
+
+
+# ---------- 受载期（laycan） ----------
+# freeText 中的受载期：'7/16 Jan'、'8 Jan'、'5 Jan onwards'、'28 Dec/3 Jan'、'prompt'
+# PERIOD 的 freeText 里还有 '12/14 months'、'120 days' 这类租期，月份名对不上，不会被当成受载期
+LAYCAN = re.compile(r'^\s*(?P<start_day>\d{1,2})(?:\s*(?P<start_month>[a-z]{3})[a-z]*\.?(?=\s*/))?'
+                    r'(?:\s*/\s*(?P<end_day>\d{1,2}))?\s*(?P<end_month>[a-z]{3})[a-z]*\.?'
+                    r'(?:\s+(?P<onwards>onwards))?\s*$', re.I)
+PROMPT = re.compile(r'^\s*prompt\s*$', re.I)
+MONTHS = {name: n for n, name in enumerate(['jan', 'feb', 'mar', 'apr', 'may', 'jun',
+                                            'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)}
+# 受载期只写日月，年份按成交日期推断：受载月落在成交月前 LAYCAN_MONTHS_BEFORE 个月到后 LAYCAN_MONTHS_AFTER 个月之间
+# 例如 12 月成交的 '7/16 Jan' 是次年 1 月，1 月成交的 '28/30 Dec' 是上一年 12 月（迟报的成交）
+LAYCAN_MONTHS_BEFORE = 3
+LAYCAN_MONTHS_AFTER = 8
+
+LAYCAN_COLUMNS = ['laycan_start', 'laycan_end']
+
+def fixture_dates(df):
+    """成交日期：流水线中 date 还是普通列，导入旧历史时已经是索引"""
+    if 'date' in df.columns:
+        return pd.to_datetime(df['date'])
+    return pd.Series(pd.to_datetime(df.index), index=df.index)
+
+def laycan_date(day, month_name, fixed):
+    """日 + 月份名 + 成交日期 → 日期；月份名无法识别、日期不存在（如 31 Feb）时为 NaT"""
+    month = month_name.str.lower().map(MONTHS).astype('Float64')
+    shift = month - fixed.dt.month
+    year = fixed.dt.year + (shift < -LAYCAN_MONTHS_BEFORE).astype('Int64') - (shift > LAYCAN_MONTHS_AFTER).astype('Int64')
+    parts = pd.DataFrame({'year': year, 'month': month, 'day': pd.to_numeric(day, errors='coerce')}, index=day.index)
+    dates = pd.Series(pd.NaT, index=day.index, dtype='datetime64[ns]')
+    valid = parts.notna().all(axis=1)
+    if valid.any():
+        dates[valid] = pd.to_datetime(parts[valid].astype('int64'), errors='coerce')
+    return dates
+
+def add_laycan_columns(df):
+    """把 freeText 中的受载期拆成日期列 laycan_start / laycan_end：
+    '7/16 Jan' 为 1 月 7 日至 16 日，'8 Jan' 起止同一天，'5 Jan onwards' 没有结束日期，'prompt' 起止都取成交日期
+    跨年按成交日期推断（见 LAYCAN_MONTHS_BEFORE / AFTER）；无法识别的写法对应列为空值
+    """
+    if df is None or df.empty:
+        return df
+
+    df = df.copy()
+    if 'freeText' not in df.columns:
+        df['freeText'] = None
+    text = bounded(df['freeText'])
+    fixed = fixture_dates(df)
+
+    parts = text.str.extract(LAYCAN)
+    start = laycan_date(parts['start_day'], parts['start_month'].fillna(parts['end_month']), fixed)
+    end = laycan_date(parts['end_day'].fillna(parts['start_day']), parts['end_month'], fixed)
+    end = end.mask(parts['onwards'].notna())
+    # 结束早于开始（如 '28/3 Jan'）的写法无法确定月份，整条不取
+    reversed_range = end < start
+    start, end = start.mask(reversed_range), end.mask(reversed_range)
+
+    prompt = text.str.match(PROMPT).fillna(False).astype(bool)
+    df['laycan_start'] = start.mask(prompt, fixed.dt.normalize())
+    df['laycan_end'] = end.mask(prompt, fixed.dt.normalize())
+    return df
+
+
+# ---------- 货量（VOYAGE） ----------
+# cargoSize 如 '80000/10'、'170000/10'、'55000 mt 5%'：货量（吨）/ 增减幅度（%，船东选择的 more or less）
+CARGO_SIZE = re.compile(r'^\s*(?P<qty>\d+)\s*(?:mt|t)?\s*(?:(?:/|\+/-|(?=\d+(?:\.\d+)?\s*%))\s*(?P<tolerance>\d+(?:\.\d+)?)\s*%?)?', re.I)
+
+CARGO_COLUMNS = ['cargo_qty_t', 'cargo_tolerance_pct']
+
+def add_cargo_columns(df):
+    """把 cargoSize 拆成数值列：cargo_qty_t 货量（吨）、cargo_tolerance_pct 增减幅度（%）
+    没写增减幅度时 cargo_tolerance_pct 为空值；无法识别的写法对应列为空值
+    """
+    if df is None or df.empty:
+        return df
+
+    df = df.copy()
+    if 'cargoSize' not in df.columns:
+        df['cargoSize'] = None
+    cargo = bounded(df['cargoSize']).str.replace(',', '', regex=False).str.extract(CARGO_SIZE)
+
+    df['cargo_qty_t'] = pd.to_numeric(cargo['qty'], errors='coerce').astype('Int64')
+    df['cargo_tolerance_pct'] = pd.to_numeric(cargo['tolerance'], errors='coerce').astype('Float64')
+    return df
+
+
+# ---------- 租期（PERIOD） ----------
+# tripDescriptionPeriodInfo 中的租期：'12/14 months'、'min 90 days/max 120 days'、'fixed 1 year'、'3/5 months'
+# 接口没给 tripDescriptionPeriodInfo 时从 fixtureString 中找；'2 laden legs' 这类按航次计的租期不换算
+PERIOD_UNIT = r'(?:days?|months?|mos?|years?|yrs?)\b'
+PERIOD = re.compile(rf'\b(?:min(?:imum)?\s+)?(?P<min>\d+(?:\.\d+)?)\s*(?!\s)(?P<min_unit>{PERIOD_UNIT})?\s*(?!\s)'
+                    rf'(?:(?:(?:/|-|to)\s*|(?=max))(?:max(?:imum)?\s+)?(?P<max>\d+(?:\.\d+)?)\s*)?(?P<unit>{PERIOD_UNIT})', re.I)
+# 租期统一换算成天：按 1 个月 30 天、1 年 12 个月（360 天）计，'12/14 months' 与 '1 year' 可以直接比较
+PERIOD_DAYS = {'d': 1, 'm': 30, 'y': 360}
+
+PERIOD_COLUMNS = ['period_min_days', 'period_max_days']
+
+def period_days(value, unit):
+    """租期数字 × 单位（取单位首字母：d / m / y）换算成天，Int64"""
+    days = pd.to_numeric(value, errors='coerce') * unit.str[0].str.lower().map(PERIOD_DAYS).astype('Float64')
+    return days.round().astype('Int64')
+
+def add_period_columns(df):
+    """把期租的租期拆成数值列 period_min_days / period_max_days（天）
+    '12/14 months' 为 360 / 420 天，'min 90 days/max 120 days' 为 90 / 120 天，只写一个租期（'1 year'）时两列相同
+    无法识别的写法对应列为空值
+    """
+    if df is None or df.empty:
+        return df
+
+    df = df.copy()
+    text = (bounded(df['tripDescriptionPeriodInfo']) if 'tripDescriptionPeriodInfo' in df.columns
+            else pd.Series(pd.NA, index=df.index, dtype='string'))
+    if 'fixtureString' in df.columns:
+        text = text.fillna(bounded(df['fixtureString']))
+    period = text.str.extract(PERIOD)
+
+    # 'min 90 days/max 120 days' 两端各写单位；'12/14 months' 只在最后写一次
+    min_unit = period['min_unit'].fillna(period['unit'])
+    df['period_min_days'] = period_days(period['min'], min_unit)
+    df['period_max_days'] = period_days(period['max'].fillna(period['min']), period['unit'])
+    return df
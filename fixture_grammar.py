@@ -0,0 +1,80 @@
+"""fixtureString 版式文法解析
+经纪行的成交描述基本都是固定版式，例如 TC：
+    'Ship' YYYY DWT dwt dely PORT LAYCAN trip via X redel Y $HIRE - CHARTERER <comment>
+这里把每种版式写成一条从串首锚定的文法，一次匹配（一遍线性扫描）取出全部字段，
+代替对同一字符串逐字段从头搜索的正则地图（dely / via / redel 等字段各自用 .*? 加前瞻，
+每个字段都要把整条串重新试探一遍）
+文法取出的每个字段与 fixture_parsing 中对应正则地图的结果一致（正则地图仍是字段定义的参照）：
+  - 各片段不跨越 '$'，关键词之间只允许空格，船名须位于串首；via / redel / hire 的首尾空格由文法排除，
+    与 enrich 对捕获组去空格后的结果相同
+  - 匹配后再核对 dely / redel / via 在整条串中只出现一次、船名中不含 dely / dwt，保证逐字段正则命中的也是同一处
+  - 含换行、制表符等非常规空白的字符串不走文法（正则中 . 与 \s 对它们的处理不同）
+版式不符或核对不通过时返回 None，由调用方对这条字符串退回逐字段正则
+"""
+
+import re
+
+import numpy as np
+
+# 交船港口：dely 之后、第一个 '数字(/数字) 单词' 或 'prompt' 之前的若干 token（放在前瞻里，不消耗字符）
+# 交船期：dely 之后第一个紧跟 trip / redel 的 '数字(/数字) 字母' 或 'prompt'
+TC_GRAMMAR = re.compile(r"""
+    '(?P<shipName>[^'$]+)'\ (?P<buildYear>\d{4})\ (?P<dwt>\d+)\ dwt
+    \ dely\ (?=(?P<deliveryPort>[^\s$]+(?:\ [^\s$]+)*?)\ (?:\d+(?:/\d+)?\ \w+|prompt)\ trip\b)
+    [^$]*?\b(?P<freeText>\d+(?:/\d+)?\ [A-Za-z]+|prompt)\ trip\b[^\s$]*
+    (?:\ (?!via\ |redel\ )[^\s$]+)*
+    (?:\ via\ +(?P<via>[^\s$]+(?:\ +(?!redel\b)[^\s$]+)*))?
+    \ +redel\ +(?P<redel>(?:[^$]*[^$\ ])?)\ *(?P<hire>\$(?:[^-]*[^-\ ])?)
+""", re.I | re.X)
+
+PERIOD_GRAMMAR = re.compile(r"""
+    '(?P<shipName>[^'$]+)'\ (?P<buildYear>\d{4})\ (?P<dwt>\d+)\ dwt
+    \ dely\ (?=(?P<deliveryPort>[^\s$]+(?:\ [^\s$]+)*?)\ (?:\d+(?:/\d+)?\ \w+|prompt)\ )
+    [^$]*?\b(?P<freeText>\d+(?:/\d+)?\ [A-Za-z]+|prompt)
+    \ redel\ +(?P<redel>(?:[^$]*[^$\ ])?)\ *(?P<hire>\$(?:[^-]*[^-\ ])?)
+""", re.I | re.X)
+
+
+def comment(s):
+    """第一对尖括号之间的内容（对应 <([^>]+)>），没有则为 NaN"""
+    i = s.find('<')
+    while i >= 0:
+        j = s.find('>', i + 1)
+        if j < 0:
+            return np.nan
+        if j > i + 1:
+            return s[i + 1:j].strip()
+        i = s.find('<', j)
+    return np.nan
+
+def charter_checks(low, fields):
+    """TC / PERIOD 文法匹配后的核对：dely / redel 只出现一次、船名中不含 dely / dwt，
+    保证逐字段正则命中的也是文法取到的那一处"""
+    ship = fields['shipName'].lower()
+    return (low.count('dely') == 1 and low.count('redel') == 1
+            and 'dwt' not in ship and 'dely' not in ship)
+
+
+# 返回 {字段名: 值}，字段与对应的正则地图一致，未命中的字段为 NaN（与 str.extract 一致）；版式不符时返回 None
+def parse_tc(s):
+    m = TC_GRAMMAR.match(s)
+    if m is None or not s.isprintable():
+        return None
+    fields = m.groupdict(np.nan)
+    low = s.lower()
+    if not charter_checks(low, fields) or low.count('via ') != (m.start('via') >= 0):
+        return None
+    fields['shipName'] = fields['shipName'].strip()
+    fields['comment'] = comment(s)
+    return fields
+
+def parse_period(s):
+    m = PERIOD_GRAMMAR.match(s)
+    if m is None or not s.isprintable():
+        return None
+    fields = m.groupdict(np.nan)
+    if not charter_checks(s.lower(), fields):
+        return None
+    fields['shipName'] = fields['shipName'].strip()
+    fields['comment'] = comment(s)
+    return fields
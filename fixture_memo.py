@@ -0,0 +1,143 @@
+"""fixtureString 解析结果的持久化缓存（memo）
+同一条 fixtureString 会被反复补全：手动刷新重新抓取最近几天、同步窗口重叠、从归档重放……
+这里把每条字符串解析出的全部字段按 fixtureString 的哈希存进本地 Parquet 文件（parse_memo/<解析器版本>/），
+enrich 只对从未见过的字符串跑文法 / 正则，重复同步和重放几乎不再有解析开销
+解析器版本由正则地图的内容决定（见 fixture_parsing.parser_version），修改正则后换用新目录，旧结果自动失效（旧目录可直接删除）
+
+每个版本目录下是一个快照 base.parquet 和若干增量文件 delta-*.parquet：
+  - 新解析的结果写成一个小的增量文件，不重写整个快照
+  - 增量文件超过 MAX_DELTAS 个时合并成新的快照，条目数超过 MAX_ENTRIES 时淘汰最早写入的条目
+    （fixtureString 带有成交日期，越早写入的越不可能再出现）
+  - 进程内按文件修改时间缓存已读入的各文件及其键索引，查询是对整数键的向量化索引，不逐条读盘
+同一进程内同时只有一个线程在合并，其它线程照常写增量文件；多个进程并发写入时最多丢失一部分条目（下次重新解析），
+不会读到写了一半的文件。读写缓存失败（OSError）时 enrich 直接解析，不影响入库
+"""
+
+import glob
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from fixture_store import atomic_write
+
+MEMO_DIR = 'parse_memo'
+MAX_ENTRIES = 100_000 # 每个解析器版本保留的条目上限
+MAX_DELTAS = 16 # 增量文件个数上限，超过后合并进快照
+
+_loaded = {} # {版本: {文件路径: (修改时间, 键索引, 字段值数组)}}
+_lock = threading.Lock()
+_compact_lock = threading.Lock() # 正在合并时其它线程跳过合并，增量留到下次
+
+
+def memo_dir(version):
+    return os.path.join(MEMO_DIR, version)
+
+def memo_files(version):
+    """快照在前，增量文件按写入顺序在后（文件名中是纳秒时间戳）"""
+    return sorted(glob.glob(os.path.join(memo_dir(version), '*.parquet')))
+
+def memo_keys(strings):
+    """fixtureString 的 64 位内容哈希；hash_pandas_object 跨进程、跨运行结果一致"""
+    hashes = pd.util.hash_pandas_object(pd.Series(strings, dtype=object), index=False)
+    return hashes.to_numpy().view(np.int64)
+
+
+def read_file(path, columns):
+    """读入一个文件：(整数键索引, 字段值数组)；文件内的键互不重复"""
+    frame = pd.read_parquet(path)
+    values = frame[columns].to_numpy(dtype=object)
+    values[pd.isna(values)] = np.nan
+    return pd.Index(frame['key']), values
+
+def load(version, columns):
+    """当前版本的全部文件 [(键索引, 字段值数组), ...]，快照在前、增量按写入顺序在后
+    已读入且未修改的文件直接用进程内缓存；读取过程中被合并删除的文件直接跳过
+    """
+    with _lock:
+        cached = _loaded.get(version, {})
+        parts = {}
+        for path in memo_files(version):
+            try:
+                mtime = os.path.getmtime(path)
+                if path in cached and cached[path][0] == mtime:
+                    parts[path] = cached[path]
+                else:
+                    parts[path] = (mtime, *read_file(path, columns))
+            except FileNotFoundError:
+                continue
+        _loaded[version] = parts
+    return [(keys, values) for _, keys, values in parts.values()]
+
+def lookup(version, columns, keys):
+    """按 memo_keys 算出的键查询一组不重复的 fixtureString
+    返回 (values, found)：values 为 len(keys) x len(columns) 的 object 数组（列按 columns 的顺序，未命中的字段为 NaN），
+    found 标记哪些字符串在缓存中；未找到的行由调用方解析后填入
+    """
+    values = np.full((len(keys), len(columns)), np.nan, dtype=object)
+    found = np.zeros(len(keys), dtype=bool)
+    parts = load(version, columns)
+    # 从最新的文件往前查，同一个键以最后写入的为准；每个文件各自的键索引只在读入时建一次
+    for index, part in reversed(parts):
+        pending = np.flatnonzero(~found)
+        if not len(pending):
+            break
+        positions = index.get_indexer(keys[pending])
+        hit = positions >= 0
+        values[pending[hit]] = part[positions[hit]]
+        found[pending[hit]] = True
+    return values, found
+
+def store(version, columns, keys, values):
+    """把新解析的结果（values 的行与 keys 对应，列按 columns 的顺序）写成一个增量文件，必要时合并"""
+    if not len(keys):
+        return
+    frame = pd.DataFrame(values, columns=columns)
+    frame.insert(0, 'key', keys)
+    os.makedirs(memo_dir(version), exist_ok=True)
+    path = os.path.join(memo_dir(version), f'delta-{time.time_ns()}-{os.getpid()}.parquet')
+    atomic_write(path, lambda tmp_path: frame.to_parquet(tmp_path, index=False))
+    # 刚写入的内容直接放进进程内缓存，下次查询不必再从磁盘读回（已被其它线程合并进快照时不必再放）
+    try:
+        mtime = os.path.getmtime(path)
+    except FileNotFoundError:
+        mtime = None
+    if mtime is not None:
+        with _lock:
+            _loaded.setdefault(version, {})[path] = (mtime, pd.Index(keys), values)
+
+    deltas = [path for path in memo_files(version) if os.path.basename(path).startswith('delta-')]
+    if (len(deltas) > MAX_DELTAS or len(frame) > MAX_ENTRIES) and _compact_lock.acquire(blocking=False):
+        try:
+            compact(version, columns)
+        finally:
+            _compact_lock.release()
+
+def compact(version, columns):
+    """把快照和全部增量文件合并成新的快照，超出 MAX_ENTRIES 时只保留最近写入的条目
+    同一进程内由 store 保证同时只有一个合并在执行
+    """
+    files = memo_files(version)
+    frames = []
+    for path in files:
+        try:
+            frames.append(pd.read_parquet(path))
+        except FileNotFoundError:
+            continue
+    if not frames:
+        return
+    # 快照在前、增量按写入顺序在后，同一个键保留最后写入的
+    memo = pd.concat(frames, ignore_index=True).drop_duplicates('key', keep='last')
+    if len(memo) > MAX_ENTRIES:
+        memo = memo.iloc[-MAX_ENTRIES:]
+    memo = memo.reset_index(drop=True)
+    atomic_write(os.path.join(memo_dir(version), 'base.parquet'), lambda tmp_path: memo.to_parquet(tmp_path, index=False))
+    # 只删除参与了这次合并的增量文件，合并期间其它进程新写的增量保留
+    for path in files:
+        if os.path.basename(path).startswith('delta-'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
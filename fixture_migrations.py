@@ -0,0 +1,131 @@
+"""分区存储的 schema 迁移
+每个分区记录写入时的 schema 版本（fixture_store.SCHEMA_VERSION）。列的声明或派生规则变化后，旧版本的分区在这里
+一次性升级：按顺序执行版本号高于分区当前版本的迁移，写回分区并记录新版本，之后读取时不再做任何兼容处理
+旧版按月 CSV 分区和从旧版单个历史文件导入的数据（import_legacy_history）都从版本 0 开始升级
+
+迁移登记在 MIGRATIONS 中：(升级到的版本, 说明, 函数)，函数接收 (feed名, 以 date 为索引的分区数据)，返回升级后的数据；
+修改 SCHEMA_VERSION 时在末尾追加对应的迁移。每个迁移对已经是新格式的数据重复执行结果不变
+
+用法（在仓库根目录运行，主页面打开时也会自动执行）：
+    python fixture_migrations.py
+    python fixture_migrations.py --feeds tc period
+"""
+
+import argparse
+import os
+import threading
+
+import pandas as pd
+
+import fixture_store
+import fixture_vessels
+from fixture_parsing import add_vessel_type, add_fixture_id
+
+_migrated = set() # 本进程中已经确认是当前版本的 feed
+_lock = threading.Lock()
+
+
+# ---------- 各版本的迁移 ----------
+def add_identity(feed_key, spot):
+    """v1：旧版文件没有的 fixture_id 和 VESSEL TYPE 补上"""
+    if 'fixture_id' not in spot.columns:
+        spot = add_fixture_id(spot)
+    if 'VESSEL TYPE' not in spot.columns:
+        spot = add_vessel_type(spot)
+    return spot
+
+def add_declared_columns(feed_key, spot):
+    """v2：补齐 feed 声明的全部原始列（如 TC 的 voyageType），同一 feed 的每个分区列一致"""
+    from fixture_pipeline import FEED_REGISTRY
+
+    missing = [col for col in FEED_REGISTRY[feed_key]['use_cols'] if col != 'date' and col not in spot.columns]
+    return spot.assign(**{col: pd.NA for col in missing})
+
+def rederive(feed_key, spot):
+    """v3：按当前规则重新派生结构化字段（租金 / 运费 / 受载期 / 货量 / 租期），早于这些字段写入的分区也补上"""
+    from fixture_pipeline import FEED_REGISTRY
+
+    for derive in FEED_REGISTRY[feed_key].get('derive', []):
+        spot = derive(spot)
+    return spot
+
+def fill_vessels(feed_key, spot):
+    """v4：占位的 dwt / buildYear 视同缺失，用船舶主数据补全后重新划分船型"""
+    return add_vessel_type(fixture_vessels.fill(spot))
+
+MIGRATIONS = [
+    (1, 'fixture_id and VESSEL TYPE for legacy files', add_identity),
+    (2, 'declared raw columns for every partition', add_declared_columns),
+    (3, 'structured hire / freight / laycan / cargo / period fields', rederive),
+    (4, 'dwt / buildYear from vessel master data, VESSEL TYPE reclassified', fill_vessels),
+]
+assert [version for version, _, _ in MIGRATIONS] == list(range(1, fixture_store.SCHEMA_VERSION + 1))
+
+
+# ---------- 迁移执行 ----------
+def is_migrated(feed_key):
+    """本进程中是否已经确认该 feed 的分区都是当前版本"""
+    return feed_key in _migrated
+
+def read_any_partition(feed_key, month):
+    """读取一个待迁移的分区：Parquet 分区，或还没有转换的旧版 CSV 分区"""
+    spot = fixture_store.read_partition(feed_key, month)
+    if spot is not None:
+        return spot
+    legacy_path = fixture_store.partition_path(feed_key, month, fixture_store.LEGACY_PARTITION_SUFFIX)
+    if not os.path.exists(legacy_path):
+        return None
+    return pd.read_csv(legacy_path, parse_dates=['date'], dtype={'fixture_id': str}).set_index('date')
+
+def migrate_partition(feed_key, month, version):
+    """把一个版本为 version 的分区升级到当前版本并写回；返回执行的迁移版本号列表
+    读写期间持有 feed 的写锁，不会与同时进行的 upsert 互相覆盖
+    """
+    with fixture_store.feed_lock(feed_key):
+        spot = read_any_partition(feed_key, month)
+        if spot is None:
+            return []
+        applied = []
+        for target, _, migration in MIGRATIONS:
+            if target > version:
+                spot = migration(feed_key, spot)
+                applied.append(target)
+        fixture_store.write_partition(feed_key, month, spot)
+    return applied
+
+def migrate(feed_keys):
+    """把各 feed 旧版本的分区一次性升级到当前版本；返回 {feed名: 升级的分区数}
+    同一进程内已经确认过的 feed 直接跳过（不再读分区元数据），打开页面不必重复检查
+    需要补全船舶数据（fill_vessels）时，先用全部待迁移分区更新船舶主数据，再逐个分区升级，跨月、跨 feed 的信息都能用上
+    """
+    vessel_version = next(target for target, _, migration in MIGRATIONS if migration is fill_vessels)
+    with _lock:
+        pending = {}
+        for feed_key in feed_keys:
+            if feed_key not in _migrated:
+                versions = {month: fixture_store.partition_version(feed_key, month) for month in fixture_store.list_months(feed_key)}
+                pending[feed_key] = {month: v for month, v in versions.items() if v < fixture_store.SCHEMA_VERSION}
+
+        for feed_key, months in pending.items():
+            for month, version in months.items():
+                if version < vessel_version:
+                    fixture_vessels.update(read_any_partition(feed_key, month))
+
+        migrated = {}
+        for feed_key, months in pending.items():
+            for month, version in months.items():
+                migrate_partition(feed_key, month, version)
+            migrated[feed_key] = len(months)
+            _migrated.add(feed_key)
+    return migrated
+
+
+if __name__ == '__main__':
+    from fixture_pipeline import FEED_REGISTRY, prepare_store
+
+    parser = argparse.ArgumentParser(description='Upgrade stored fixture partitions to the current schema version')
+    parser.add_argument('--feeds', nargs='+', choices=list(FEED_REGISTRY), default=list(FEED_REGISTRY))
+    args = parser.parse_args()
+
+    for feed_key, count in prepare_store(args.feeds).items():
+        print(f'{feed_key}: {count} partitions migrated to schema v{fixture_store.SCHEMA_VERSION}')
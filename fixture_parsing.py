@@ -0,0 +1,259 @@
+"""fixture 解析模块
+从 fixtureString 中用正则补全字段（enrich），并根据 dwt 划分船型（add_vessel_type），
+为每笔成交生成确定性的内容哈希标识（add_fixture_id）
+正则都写成线性时间的形式（空白、数字串只按整段匹配，不在重叠的空白上回溯），超长的 fixtureString 不做解析（over_budget）
+整段匹配写成 X+(?!X)（X 为单个字符类）：与占有量词 X++ 等价，但 Python 3.10 也能编译（占有量词要 3.11）
+解析结果可以按 fixtureString 缓存到本地（fixture_memo），见过的字符串不再重复解析
+各 feed 的正则地图也集中放在这里，供数据处理页面和其它页面共用
+"""
+
+import hashlib
+import re
+
+import numpy as np
+import pandas as pd
+
+import fixture_memo
+
+# enrich 取值规则（去空格、未命中记为 NaN 等）的版本号，规则变化时加一，使解析缓存中的旧结果失效
+PARSE_RULES_VERSION = 1
+
+# 单条 fixtureString 的解析预算：真实成交不超过 200 字符，超过这个长度的视为异常输入，不跑正则 / 文法，
+# 由流水线记入隔离表（fixture_db.quarantine）；关键字反复出现时部分正则是平方级的，预算内单条仍在几毫秒以内
+MAX_FIXTURE_LENGTH = 300
+
+def over_budget(strings) -> np.ndarray:
+    """超出解析预算（长度大于 MAX_FIXTURE_LENGTH）的行，返回布尔数组"""
+    return pd.Series(strings, dtype=object).astype(str).str.len().gt(MAX_FIXTURE_LENGTH).to_numpy()
+
+# 需要跑正则的行少于这个数时逐行 re.search，不走 str.extract：增量同步的窗口通常只有几十到几百行，
+# 这时 str.extract 每个字段的固定开销比逐行匹配本身还大；回补、重放等大批量时才用 str.extract
+EXTRACT_MIN_ROWS = 10_000
+
+def extract_group(strings, pat):
+    """对一组字符串取正则 pat 的捕获组1并去空格，未命中为 NaN，返回 object 数组
+    行数少于 EXTRACT_MIN_ROWS 时逐行匹配，否则整列 str.extract；两条路径结果一致
+    """
+    if len(strings) >= EXTRACT_MIN_ROWS:
+        return pd.Series(strings, dtype=object).str.extract(pat, expand=False).str.strip().to_numpy(dtype=object)
+    values = np.full(len(strings), np.nan, dtype=object)
+    for i, s in enumerate(strings):
+        m = pat.search(s)
+        if m is not None and m.group(1) is not None:
+            values[i] = m.group(1).strip()
+    return values
+
+def parser_version(maps: dict) -> str:
+    """解析器版本：由取值规则版本和正则地图（字段、正则、标志位）决定
+    文法解析器的结果与正则地图一致，不单独计入版本
+    """
+    spec = [PARSE_RULES_VERSION] + [(col, pat.pattern, pat.flags) for col, pat in maps.items()]
+    return hashlib.sha1(repr(spec).encode('utf-8')).hexdigest()[:16]
+
+def parse_strings(strings, maps: dict, parser=None) -> dict:
+    """解析一组（不重复的）fixtureString 的全部字段，返回 {fixtureString: [字段值, ...]}（按正则地图的字段顺序）
+    先用文法解析器，解析器不接受的字符串再逐字段跑正则（命中取捕获组1并去空格，未命中为 NaN）
+    """
+    results, rest = {}, []
+    for s in strings:
+        fields = parser(s) if parser is not None else None
+        if fields is None:
+            rest.append(s)
+        else:
+            results[s] = [fields[col] for col in maps]
+    if rest:
+        columns = [extract_group(rest, pat).tolist() for pat in maps.values()]
+        results.update(zip(rest, map(list, zip(*columns))))
+    return results
+
+# ----------  通用引擎字符匹配函数 ----------
+def enrich(df: pd.DataFrame, maps: dict, parser=None, memo=False) -> pd.DataFrame:
+    """
+    对 DataFrame 中指定列进行"空值补全"：
+    1. 原列已有非空值 → 原样保留
+    2. 原列为 NaN / 空字符串 / 仅空格 → 用正则从 fixtureString 提取并填充
+    3. 若字典中的列名在表中不存在 → 先创建全 NaN 列，再按规则填充
+    每个字段只对需要补全的行取一次捕获组1（extract_group：大批量时整列 str.extract，行数少时逐行匹配）
+    parser：可选的版式文法解析函数（见 fixture_grammar），有字段需要补全的行先整条解析一次取出全部字段，
+    解析器返回 None（版式不符）的行再逐字段跑正则；两条路径的结果一致
+    memo：为 True 时先查持久化解析缓存（fixture_memo），只解析缓存中没有的字符串（每条只解析一次）并写回缓存；
+          读缓存失败时当作全部未命中，写缓存失败时跳过，结果与不用缓存时一致
+    超出解析预算的行（over_budget）不解析，字段保持原值
+    返回：填充后的新 DataFrame（不修改原表）
+    """
+    # 深拷贝，避免修改原表
+    df = df.copy()
+
+    # 统一把 fixtureString 转成字符串，防止 NaN 导致正则报错
+    txt = df['fixtureString'].astype(str)
+
+    masks = {}
+    for col in maps:
+        # 如果该列在表中不存在（例如新增 Via/Redel/Hire），先创建全 NaN 列
+        if col not in df.columns:
+            df[col] = None
+        # 数值列（如全空的 dwt 被解析成 float）先转成 object，才能写回正则提取出的字符串
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype(object)
+
+        # 构造掩码：True 表示需要补全（NaN 或空字符串或仅空格）
+        values = df[col]
+        mask = values.isna()
+        if not mask.all():
+            mask |= values.astype(str).str.strip().eq('')
+        if mask.any():
+            masks[col] = mask.to_numpy(copy=True)
+
+    # 超长字符串不进正则 / 文法，单条的解析开销有上限
+    oversized = over_budget(txt)
+    if oversized.any():
+        masks = {col: mask & ~oversized for col, mask in masks.items()}
+        masks = {col: mask for col, mask in masks.items() if mask.any()}
+
+    if memo and masks:
+        # 需要补全的行按字符串去重后查缓存，没见过的字符串整条解析全部字段后写入缓存
+        rows = np.flatnonzero(np.logical_or.reduce(list(masks.values())))
+        codes, unique = pd.factorize(txt.to_numpy()[rows])
+        version = parser_version(maps)
+        keys = fixture_memo.memo_keys(unique)
+        try:
+            values, found = fixture_memo.lookup(version, list(maps), keys)
+        except OSError:
+            values = np.full((len(keys), len(maps)), np.nan, dtype=object)
+            found = np.zeros(len(keys), dtype=bool)
+        if not found.all():
+            fresh = unique[~found]
+            parsed = parse_strings(fresh, maps, parser)
+            values[~found] = [parsed[s] for s in fresh]
+            try:
+                fixture_memo.store(version, list(maps), keys[~found], values[~found])
+            except OSError:
+                pass
+        # values 的行为去重后的字符串、列为各字段，按 codes 展开回各行
+        for col, mask in masks.items():
+            take = mask[rows]
+            df.iloc[rows[take], df.columns.get_loc(col)] = values[codes[take], list(maps).index(col)]
+        return df
+
+    if parser is not None and masks:
+        # 每条需要补全的字符串只解析一次，取出的字段与正则一致（未命中为 NaN）
+        rows = np.flatnonzero(np.logical_or.reduce(list(masks.values())))
+        parsed = [parser(s) for s in txt.to_numpy()[rows]]
+        ok = np.array([fields is not None for fields in parsed], dtype=bool)
+        rows = rows[ok]
+        parsed = [fields for fields in parsed if fields is not None]
+        if parsed:
+            # 同一解析器返回的字典键顺序相同，按列转置后逐列写回
+            columns = dict(zip(parsed[0], zip(*(fields.values() for fields in parsed))))
+            for col, mask in masks.items():
+                take = mask[rows]
+                df.iloc[rows[take], df.columns.get_loc(col)] = np.array(columns[col], dtype=object)[take]
+                mask[rows] = False
+
+    # 遍历正则地图 {字段名: 编译好的正则}
+    for col, mask in masks.items():
+        if not mask.any():
+            continue
+        # 只对"空"行跑正则：命中取捕获组1并去空格，未命中为空值
+        df.iloc[np.flatnonzero(mask), df.columns.get_loc(col)] = extract_group(txt.to_numpy()[mask], maps[col])
+
+    # 返回填充/新增列后的新表
+    return df
+# ---------- 辅助函数：添加 VESSEL TYPE 列 ----------
+# 船型按 dwt 分档：(船型, 该档 dwt 上限（含）)，按上限从小到大排列，最后一档上限为 None 表示不设上限
+# dwt 为整数，64,999 即"低于 65,000"
+VESSEL_CLASSES = [
+    ('SMX/UMX/HANDY', 64_999),
+    ('PMX', 80_000),
+    ('KMX', 100_000),
+    ('CAPE/VLOC', None),
+]
+
+def dwt_values(dwt):
+    """dwt 列转成 float 数组（兼容 '82,000'、'180000.0' 这类写法，取整数部分），无法识别的为 NaN"""
+    if not pd.api.types.is_numeric_dtype(dwt):
+        text = dwt.astype('string').str.replace(',', '', regex=False)
+        numbers = pd.to_numeric(text, errors='coerce')
+        # 不是纯数字的写法（如 '82000 dwt'）才用正则取第一段数字
+        odd = numbers.isna() & text.notna()
+        if odd.any():
+            numbers[odd] = pd.to_numeric(text[odd].str.extract(r'(\d+)', expand=False), errors='coerce')
+        dwt = numbers.abs()
+    return np.floor(pd.Series(dwt).to_numpy(dtype=float, na_value=np.nan))
+
+def vessel_class(dwt, classes=VESSEL_CLASSES):
+    """按 dwt 分档（classes 见 VESSEL_CLASSES），返回以船型为类别的 Categorical，dwt 为空时为空值"""
+    labels = [name for name, _ in classes]
+    edges = [-np.inf] + [np.inf if upper is None else upper for _, upper in classes]
+    return pd.cut(dwt_values(dwt), bins=edges, labels=labels, right=True)
+
+def add_vessel_type(df, classes=VESSEL_CLASSES):
+    """根据 dwt 列添加 VESSEL TYPE 列（类别型），整列一次向量化分档，分档边界见 VESSEL_CLASSES"""
+    if df is None or df.empty:
+        return df
+
+    df = df.copy()
+    if 'dwt' not in df.columns:
+        df['dwt'] = None
+    df['VESSEL TYPE'] = vessel_class(df['dwt'], classes)
+    return df
+
+# ---------- 成交标识 ----------
+def add_fixture_id(df):
+    """根据 (date, 规范化后的 fixtureString) 的内容哈希添加 fixture_id 列（16 位十六进制字符串）
+    规范化：转小写、合并连续空白、去掉首尾空格，避免经纪行排版差异产生不同的标识
+    同一天同一条船的多笔不同成交（如多个 'TBN'）会得到不同的标识，不会在去重时互相覆盖
+    成交被修正（如租金改了）后标识随之改变，旧记录由重新抓取的窗口删除（见 fixture_store.upsert_history 的 windows）
+    """
+    if df is None or df.empty:
+        return df
+
+    df = df.copy()
+    normalized = (df['fixtureString'].fillna('').astype(str)
+                  .str.lower()
+                  .str.replace(r'\s+', ' ', regex=True)
+                  .str.strip())
+    content = pd.Series(df.index.strftime('%Y-%m-%d'), index=df.index) + '|' + normalized
+    # hash_pandas_object 使用固定的哈希键，跨进程、跨运行结果一致
+    hashes = pd.util.hash_pandas_object(content, index=False).to_numpy()
+    df['fixture_id'] = [format(h, '016x') for h in hashes]
+    return df
+
+#TC类型正则补全使用
+TC_RE_MAPS = {
+    # chrtr不匹配了，因为好像都写了，而且比较难匹配，因为不好定位--
+    'shipName': re.compile(r"'([^']+)'", re.I), #找到第一对单引号，把中间不是单引号的那串字符抓出来，就是船名。re.I忽略大小写
+    'buildYear': re.compile(r"'[^']+'\s+(\d{4})(?!\d)", re.I), #但因中船名后面的四位数字抓出来（恰好四位，不取 80000/10 这类货量 / 载重吨的前四位）
+    'dwt': re.compile(r"(?<!\d)(\d+)(?!\d)\s+dwt", re.I), #dwt前一串数字抓出来，即dwt的部分（只从数字串开头试，不在长数字串里逐位回溯）
+    'deliveryPort': re.compile(r"dely\s+(?!\s)(.*?)(?<!\s)(?=\s+(?!\s)(?:\d+(?:/\d+)?\s+\w+|prompt)\s+trip\b)", re.I),#从 dely 后面开始，任意字符（非贪婪）一直往前扫，直到第一次出现"数字+任意单词+trip" 或 "prompt+trip" 就停，把中间那段任意字符作为交船港口名返回。
+    'freeText': re.compile(r'dely[\s\S]*?\b(\d+(?:/\d+)?\s+[A-Za-z]+|prompt)(?=\s+trip\b)', re.I),#抓del+字符后面的 数字+任意长度月份单词 或 prompt
+    'comment': re.compile(r"<([^>]+)>", re.I),#取第一对尖括号 <...> 之间的任意字符
+    'via': re.compile(r'\bvia\s+(?!\s)(.*?)(?<!\s)(?=\s+(?!\s)redel\b)', re.I),#via和redl之间的字符
+    'redel': re.compile(r'\bredel\s+(?!\s)([^$\n]*)(?![^$\n])(?=\s*\$)', re.I),#redel和$之间的内容
+    'hire': re.compile(r'(\$[^-\n]*)(?![^-\n])(?:\s*-|$)', re.I),#从第一个美元符号开始，一直吞到第一个 - 或行尾之前结束，内容不限
+}
+
+PERIOD_RE_MAPS={
+    # chrtr不匹配了，因为好像都写了，而且比较难匹配，因为不好定位--
+    'shipName': re.compile(r"'([^']+)'", re.I), #找到第一对单引号，把中间不是单引号的那串字符抓出来，就是船名。re.I忽略大小写
+    'buildYear': re.compile(r"'[^']+'\s+(\d{4})(?!\d)", re.I), #船名后面的四位数字抓出来（恰好四位，不取 80000/10 这类货量的前四位）
+    'dwt': re.compile(r"(?<!\d)(\d+)(?!\d)\s+dwt", re.I), #dwt前一串数字抓出来，即dwt的部分（只从数字串开头试，不在长数字串里逐位回溯）
+    'deliveryPort': re.compile(r"dely\s+(?!\s)(.*?)(?<!\s)(?=\s+(?!\s)(?:\d+(?:/\d+)?\s+\w+|prompt)\s+)", re.I),#从 dely 后面开始，任意字符（非贪婪）一直往前扫，直到第一次出现"数字+任意单词 或 "prompt" 就停，把中间那段任意字符作为交船港口名返回。
+    'freeText': re.compile(r'dely[\s\S]*?\b(\d+(?:/\d+)?\s+[A-Za-z]+|prompt)(?=\s+redel\b)', re.I),#抓 数字+任意长度月份单词 或 prompt
+    'comment': re.compile(r"<([^>]+)>", re.I),#取第一对尖括号 <...> 之间的任意字符
+    'redel': re.compile(r'\bredel\s+(?!\s)([^$\n]*)(?![^$\n])(?=\s*\$)', re.I),#redel和$之间的内容
+    'hire': re.compile(r'(\$[^-\n]*)(?![^-\n])(?:\s*-|$)', re.I),#从第一个美元符号开始，一直吞到第一个 - 或行尾之前结束，内容不限
+}
+
+# 月份名（Jan、Sept、June ...），VC 受载期只认这些单词
+MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+
+VC_RE_MAPS={
+    # chrtr不匹配了，因为好像都写了，而且比较难匹配，因为不好定位--
+    'shipName': re.compile(r"'([^']+)'", re.I), #找到第一对单引号，把中间不是单引号的那串字符抓出来，就是船名。re.I忽略大小写
+    'buildYear': re.compile(r"'[^']+'\s+(\d{4})(?!\d)", re.I), #船名后面的四位数字抓出来（恰好四位，不取 80000/10 这类货量的前四位）
+    'cargoSize': re.compile(r"(?<!\d)(\d+(?!\d)/\d+)", re.I), #把70000/5这样的抓出来
+    'freeText': re.compile(rf"\b(\d{{1,2}}(?:\s+{MONTH}(?=\s*/))?(?:\s*/\s*\d{{1,2}})?\s+{MONTH}(?:\s+onwards)?|prompt)\b", re.I),#抓 日(/日) 月份 或 prompt；只认月份名，避免把 170000/10 Dampier 这样的货量当成受载期
+    'comment': re.compile(r"<([^>]+)>", re.I),#取第一对尖括号 <...> 之间的任意字符
+    'freight': re.compile(r'(\$\S+)', re.I),#第一个美元符号开始、直到遇到空格前的运费金额（数值和条款的拆分见 fixture_fields）
+}
@@ -0,0 +1,311 @@
+"""fixture feed 注册表与通用处理引擎
+每个 Baltic fixtureType 在 FEED_REGISTRY 中登记一条（接口标识、所需列、正则地图、可选的版式文法解析器、输出文件），
+所有 feed 都走同一条流水线：抓取 → 正则补全 → 船型 → 按 fixture_id upsert 进分区存储
+新增一种 fixtureType 只需要在注册表里加一条
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+import requests
+import streamlit as st
+from pandas.tseries.offsets import BDay # Bday是工作日
+
+import fixture_datasets
+import fixture_db
+import fixture_migrations
+import fixture_store
+import fixture_vessels
+from baltic_client import get_client
+from fixture_archive import archive_response
+from fixture_fields import add_hire_columns, add_freight_columns, add_laycan_columns, add_cargo_columns, add_period_columns
+from fixture_grammar import parse_tc, parse_period
+from fixture_parsing import TC_RE_MAPS, PERIOD_RE_MAPS, VC_RE_MAPS, MAX_FIXTURE_LENGTH, enrich, over_budget, add_vessel_type, add_fixture_id
+
+logger = logging.getLogger(__name__)
+
+BALTIC_FEED_URL = 'https://api.balticexchange.com/api/v1.3/feed/FDS08EK9KYT1G4A5POP8AX5PHUZWZYPZ/fixtureType/{fixture_type_id}/data'
+
+TC_COLS = [
+    'date', 'fixtureType', 'voyageType', 'shipName',
+    'buildYear', 'dwt', 'deliveryPort', 'freeText', 'loadArea',
+    'charterer', 'comment', 'tripDescriptionPeriodInfo', 'viaPortReletRateBallastBonus', 'fixtureString']
+
+PERIOD_COLS = [
+    'date', 'fixtureType', 'voyageType', 'shipName',
+    'buildYear', 'dwt', 'deliveryPort', 'freeText', 'loadArea',
+    'charterer', 'comment', 'tripDescriptionPeriodInfo', 'fixtureString']
+
+VC_COLS = [
+    'date', 'fixtureType', 'cargoSize', 'voyageType', 'shipName',
+    'buildYear', 'dwt', 'freeText', 'loadPort', 'dischargePort', 'rateAndTerms',
+    'charterer', 'comment', 'fixtureString']
+
+# feed 注册表：键为 feed 名（也是分区存储的目录名，页面用它向 fixture_datasets 取数据），
+# file_path 为旧版的单文件历史，仅用于一次性导入分区存储，derive 为正则补全之后依次执行的结构化字段派生（见 fixture_fields）
+FEED_REGISTRY = {
+    'tc': {
+        'label': 'TIMECHARTER',
+        'fixture_type_id': 'FXT3NN4TMQPQL3YB0HRAMQKPSI3CCLKO',
+        'use_cols': TC_COLS,
+        're_maps': TC_RE_MAPS,
+        'parser': parse_tc,
+        'derive': [add_hire_columns, add_laycan_columns],
+        'file_path': 'timecharter.csv',
+    },
+    'period': {
+        'label': 'PERIOD',
+        'fixture_type_id': 'FXTTRVOV52RXY20H2JXIGEQ3JSK2LRDH',
+        'use_cols': PERIOD_COLS,
+        're_maps': PERIOD_RE_MAPS,
+        'parser': parse_period,
+        'derive': [add_hire_columns, add_laycan_columns, add_period_columns],
+        'file_path': 'periodcharter.csv',
+    },
+    'vcgr': {
+        'label': 'VOYAGE(GRAIN)',
+        'fixture_type_id': 'FXTK49ZE0UEYV553O9AMBJAC201AUIBG',
+        'use_cols': VC_COLS,
+        're_maps': VC_RE_MAPS,
+        'derive': [add_freight_columns, add_laycan_columns, add_cargo_columns],
+        'file_path': 'vcgrain.csv',
+    },
+    'vcco': {
+        'label': 'VOYAGE(COAL)',
+        'fixture_type_id': 'FXTUG0D1YCOCHBLVRKBQPXIXI6L2X5TA',
+        'use_cols': VC_COLS,
+        're_maps': VC_RE_MAPS,
+        'derive': [add_freight_columns, add_laycan_columns, add_cargo_columns],
+        'file_path': 'vccoal.csv',
+    },
+    'vcmi': {
+        'label': 'VOYAGE(MISC)',
+        'fixture_type_id': 'FXTLE3TOJ4YRBE3VAD4TWRY42LOJUKET',
+        'use_cols': VC_COLS,
+        're_maps': VC_RE_MAPS,
+        'derive': [add_freight_columns, add_laycan_columns, add_cargo_columns],
+        'file_path': 'vcmisc.csv',
+    },
+    'vcor': {
+        'label': 'VOYAGE(ORE)',
+        'fixture_type_id': 'FXT1RAFAFHAFWQM3SKLQ4SE9TQ4VTT2O',
+        'use_cols': VC_COLS,
+        're_maps': VC_RE_MAPS,
+        'derive': [add_freight_columns, add_laycan_columns, add_cargo_columns],
+        'file_path': 'vcore.csv',
+    },
+}
+
+
+# ---------- 同步状态（高水位） ----------
+# 每个 feed 记录最后一个成功同步的工作日，下次加载只请求其后缺失的工作日
+SYNC_STATE_FILE = 'sync_state.json'
+SYNC_BOOTSTRAP_DAYS = 15 # 既无同步状态也无历史文件时，首次向前拉取的工作日数
+SYNC_WINDOW_DAYS = 15 # 缺口较长时按此工作日数切成多个请求窗口
+
+_sync_state_lock = threading.Lock()
+
+def read_sync_state():
+    """读取全部 feed 的同步状态 {feed名: {'last_synced': 'YYYY-MM-DD', 'updated_at': ...}}"""
+    if not os.path.exists(SYNC_STATE_FILE):
+        return {}
+    try:
+        with open(SYNC_STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def update_sync_state(feed_key, last_synced):
+    """把某个 feed 的高水位推进到 last_synced 并原子落盘（多个 feed 并发写，需加锁）
+    高水位只前进不后退：用较早的 dateto 同步时不会把已同步的日期重新标为缺失
+    """
+    with _sync_state_lock:
+        state = read_sync_state()
+        previous = state.get(feed_key, {}).get('last_synced')
+        if previous and pd.Timestamp(previous) > last_synced:
+            last_synced = pd.Timestamp(previous)
+        state[feed_key] = {
+            'last_synced': last_synced.strftime('%Y-%m-%d'),
+            'updated_at': datetime.now().isoformat(),
+        }
+
+        def write(tmp_path):
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+        fixture_store.atomic_write(SYNC_STATE_FILE, write)
+
+def last_synced_day(feed_key):
+    """feed 的高水位：优先取同步状态，其次取存储中的最新日期，都没有则返回 None"""
+    entry = read_sync_state().get(feed_key)
+    if entry and entry.get('last_synced'):
+        return pd.Timestamp(entry['last_synced'])
+    last_date = fixture_store.latest_date(feed_key)
+    if last_date is not None:
+        return last_date.normalize()
+    return None
+
+def missing_windows(last_synced, dateto, refetch_days=0):
+    """计算高水位之后到 dateto 之间缺失的工作日，并切分成 [(from, to), ...] 请求窗口
+    refetch_days > 0 时额外重新抓取最近 refetch_days 个工作日（用于手动刷新时覆盖迟到的修正）
+    """
+    if last_synced is None:
+        start = dateto - BDay(SYNC_BOOTSTRAP_DAYS - 1)
+    else:
+        start = last_synced + BDay(1)
+    if refetch_days > 0:
+        start = min(start, dateto - BDay(refetch_days - 1))
+
+    return split_windows(start, dateto, SYNC_WINDOW_DAYS)
+
+def split_windows(start, end, window_days):
+    """把 [start, end] 内的工作日按 window_days 个一组切成 [(from, to), ...]"""
+    days = pd.bdate_range(start, end)
+    return [(chunk[0], chunk[-1]) for chunk in
+            (days[i:i + window_days] for i in range(0, len(days), window_days))]
+
+
+# ---------- 流水线各阶段 ----------
+def fetch_fixtures(feed_key, datefrom, dateto):
+    """从 API 抓取一个 feed 在 [datefrom, dateto] 内的原始 fixtures，原始响应同时写入归档
+    返回 DataFrame（该时段没有成交时为空表）；请求出错返回 None
+    """
+    feed = FEED_REGISTRY[feed_key]
+    url = BALTIC_FEED_URL.format(fixture_type_id=feed['fixture_type_id'])
+    params = {'from': datefrom.strftime('%Y-%m-%d'), 'to': dateto.strftime('%Y-%m-%d')}
+    try:
+        response = get_client().get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error fetching data from {feed['label']} API: {e}")
+        return None
+
+    archive_response(feed_key, datefrom, dateto, data)
+
+    fixtures = fixtures_from_payload(data)
+    if not fixtures:
+        st.warning(f"No {feed['label']} fixtures data returned for the period {datefrom.date()} to {dateto.date()}")
+        return pd.DataFrame()
+
+    return pd.DataFrame(fixtures)
+
+
+def fixtures_from_payload(data):
+    """从接口响应中取出 fixture 列表
+    接口通常返回单个对象 {"name": ..., "fixtures": [...]}，也兼容对象列表或单条 fixture 为字典的情况
+    """
+    payloads = data if isinstance(data, list) else [data]
+    fixtures = []
+    for payload in payloads:
+        items = payload.get('fixtures') if isinstance(payload, dict) else None
+        if isinstance(items, dict):
+            items = [items]
+        fixtures.extend(items or [])
+    return fixtures
+
+
+def process_fixtures(feed, fixtures_df):
+    """正则补全缺失字段、派生结构化字段、解析日期，用船舶主数据补全 dwt / buildYear 后添加 VESSEL TYPE 和 fixture_id，
+    返回以 date 为索引的新数据"""
+    spot = (fixtures_df.reindex(columns=feed['use_cols'])
+            .pipe(enrich, maps=feed['re_maps'], parser=feed.get('parser'), memo=True)
+            .assign(date=lambda x: pd.to_datetime(x['date'])))
+    for derive in feed.get('derive', []):
+        spot = derive(spot)
+    spot.set_index('date', inplace=True)
+    # 先把这批成交中的船并入船舶主数据，再补全缺失的 dwt / buildYear（同一批里别的成交写全了的也能用上）
+    fixture_vessels.update(spot)
+    spot = fixture_vessels.fill(spot)
+    return add_fixture_id(add_vessel_type(spot))
+
+def quarantine_oversized(feed_key, spot):
+    """把超出解析预算、没有解析的成交记入隔离表（fixture_db.quarantine），返回新记入的条数
+    有超长成交时记一条 warning 日志；隔离表在 Data Manager 页面的"隔离记录"中查看
+    """
+    oversized = spot[over_budget(spot['fixtureString'])]
+    if oversized.empty:
+        return 0
+    added = fixture_db.quarantine(feed_key, oversized, f'fixtureString longer than {MAX_FIXTURE_LENGTH} chars')
+    logger.warning('%s: %d fixture strings longer than %d chars were not parsed (%d newly quarantined)',
+                   feed_key, len(oversized), MAX_FIXTURE_LENGTH, added)
+    return added
+
+
+def import_legacy_history(feed_key):
+    """一次性把旧版的单个历史 CSV（如 timecharter.csv）导入分区存储；存储中已有数据时跳过
+    只补上 upsert 去重需要的 fixture_id，按 schema 版本 0 写入，其余列由迁移补齐（见 prepare_store）
+    """
+    feed = FEED_REGISTRY[feed_key]
+    file_path = feed['file_path']
+    if fixture_store.has_data(feed_key) or not os.path.exists(file_path):
+        return
+    spot_old = pd.read_csv(file_path, parse_dates=['date'], dtype={'fixture_id': str})
+    if spot_old.empty:
+        return
+    spot_old.set_index('date', inplace=True)
+    if 'fixture_id' not in spot_old.columns:
+        spot_old = add_fixture_id(spot_old)
+    fixture_store.upsert(feed_key, spot_old, version=0)
+    st.text(f"{feed['label']} imported {len(spot_old)} records from {file_path}")
+
+def prepare_store(feed_keys=None):
+    """写入存储之前的一次性准备：导入旧版单个历史文件，再把旧版本的分区迁移到当前 schema（见 fixture_migrations）
+    返回 {feed名: 迁移的分区数}；同一进程内已经迁移过的 feed 不再检查
+    """
+    feed_keys = feed_keys or list(FEED_REGISTRY)
+    for feed_key in feed_keys:
+        if not fixture_migrations.is_migrated(feed_key):
+            import_legacy_history(feed_key)
+    return fixture_migrations.migrate(feed_keys)
+
+
+def sync_target_day():
+    """同步的目标日期：最近一个已结束的工作日"""
+    return (pd.to_datetime('today') - BDay(1)).normalize()
+
+def run_feed(feed_key, refetch_days=0, dateto=None):
+    """对一个已注册的 feed 做增量同步（同步到 dateto，默认为 sync_target_day()），
+    返回全量 DataFrame（进程内共享数据集的浅拷贝，见 fixture_datasets）；既无历史也无新数据时返回 None
+    只请求高水位之后缺失的工作日窗口，每个窗口成功后推进高水位；某个窗口出错时停止，下次从断点继续
+    新数据只写入被触及的月份分区
+    """
+    feed = FEED_REGISTRY[feed_key]
+    dateto = sync_target_day() if dateto is None else pd.Timestamp(dateto)
+
+    prepare_store([feed_key])
+    windows = missing_windows(last_synced_day(feed_key), dateto, refetch_days)
+    if not windows:
+        st.text(f"{feed['label']} is up to date ({dateto.date()})")
+        return fixture_datasets.dataset(feed_key)
+
+    last_date = fixture_store.latest_date(feed_key)
+    if last_date is not None:
+        st.text(f"{feed['label']} Fixtures Data Before Update: {last_date.date()}")
+    else:
+        st.text("Creating new data file.")
+
+    added = quarantined = 0
+    for datefrom, window_to in windows:
+        fixtures_df = fetch_fixtures(feed_key, datefrom, window_to)
+        if fixtures_df is None:
+            break
+        if not fixtures_df.empty:
+            spot_new = process_fixtures(feed, fixtures_df)
+            quarantined += quarantine_oversized(feed_key, spot_new)
+            # 接口对这个窗口的响应是完整的：窗口内已被修正或撤回的旧记录随之删除
+            added += fixture_store.upsert(feed_key, spot_new, windows=[(datefrom, window_to)])
+        update_sync_state(feed_key, window_to)
+    if quarantined:
+        st.warning(f"{feed['label']}: {quarantined} fixture strings exceeded the parse budget and were quarantined")
+
+    spot = fixture_datasets.dataset(feed_key)
+    if spot is None:
+        return None
+
+    st.text(f"{feed['label']} Fixtures Data After Update: {spot.index[-1].date()} ({added} new)")
+    st.text(f'Total records: {len(spot)}')
+    return spot
@@ -0,0 +1,242 @@
+"""按类型、月份分区的列式 fixture 存储层
+每个 feed 的数据按成交月份拆成独立的 Parquet 文件（fixture_store/<feed>/<YYYY-MM>.parquet），列带类型，
+写入时只读写被新数据触及的月份分区，并通过"写临时文件 + 原子替换"提交，
+读取时只解码需要的列；查询库（fixture_db）按分区的修改时间只重新加载变化过的月份
+列类型由下面的声明决定（apply_schema）：数值 / 日期列带类型，取值重复度高的文本列（船型、租家、港口等）存为类别型，
+每个会话常驻的六个 feed 的内存占用因此小得多（见 benchmarks/bench_memory.py）
+每个分区在 Parquet 元数据中记录写入时的 schema 版本（SCHEMA_VERSION）；旧版本的分区由 fixture_migrations 一次性升级后写回，
+读取路径不做任何兼容处理
+"""
+
+import glob
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+STORE_DIR = 'fixture_store'
+PARTITION_SUFFIX = '.parquet'
+LEGACY_PARTITION_SUFFIX = '.csv' # 旧版按月 CSV 分区，由 fixture_migrations 转换为 Parquet
+
+# 分区的 schema 版本：列的声明或派生规则变化时加一，并在 fixture_migrations.MIGRATIONS 中登记升级到该版本的迁移
+# 没有版本记录的 Parquet 分区和旧版 CSV 分区视为版本 0
+SCHEMA_VERSION = 4
+SCHEMA_VERSION_KEY = b'fixture_schema_version'
+
+# 存为可空整数 / 可空小数 / 可空布尔 / 日期 / 类别，其余列存为字符串
+NUMERIC_COLUMNS = ['dwt', 'buildYear',
+                   'hire_usd_day', 'ballast_bonus_usd', 'hire_tier1_usd_day', 'hire_tier1_days', 'hire_tier2_usd_day',
+                   'load_rate_t_day', 'discharge_rate_t_day',
+                   'cargo_qty_t', 'period_min_days', 'period_max_days']
+FLOAT_COLUMNS = ['freight_usd_t', 'cargo_tolerance_pct']
+BOOLEAN_COLUMNS = ['hire_tiered']
+DATE_COLUMNS = ['laycan_start', 'laycan_end']
+CATEGORY_COLUMNS = ['fixtureType', 'voyageType', 'VESSEL TYPE', 'loadArea', 'charterer',
+                    'deliveryPort', 'loadPort', 'dischargePort', 'terms', 'load_terms', 'discharge_terms']
+
+_feed_locks = {}
+_feed_locks_guard = threading.Lock()
+
+
+# ---------- 列类型 ----------
+def apply_schema(spot):
+    """统一列类型：date 索引为日期，dwt / buildYear 等为可空整数（兼容 '82,000'、'180000.0' 这类写法），
+    freight_usd_t 等为可空小数，hire_tiered 等为可空布尔（兼容 CSV 中的 'True' / 'False'），laycan_start 等为日期，
+    VESSEL TYPE / charterer 等为类别，其余列为字符串"""
+    spot = spot.copy()
+    spot.index = pd.DatetimeIndex(spot.index, name='date')
+    for col in spot.columns:
+        text = spot[col].astype('string')
+        if col in NUMERIC_COLUMNS:
+            digits = text.str.replace(',', '', regex=False).str.extract(r'(\d+)', expand=False)
+            spot[col] = pd.to_numeric(digits, errors='coerce').astype('Int64')
+        elif col in FLOAT_COLUMNS:
+            spot[col] = pd.to_numeric(text.str.replace(',', '', regex=False), errors='coerce').astype('Float64')
+        elif col in BOOLEAN_COLUMNS:
+            spot[col] = text.str.lower().map({'true': True, 'false': False, '1': True, '0': False}).astype('boolean')
+        elif col in DATE_COLUMNS:
+            spot[col] = pd.to_datetime(text, errors='coerce')
+        elif col in CATEGORY_COLUMNS:
+            spot[col] = text.astype('category')
+        else:
+            spot[col] = text
+    return spot
+
+
+# ---------- upsert 合并 ----------
+def fixture_keys(df):
+    """成交标识：fixture_id 组成的哈希索引（内容哈希已包含日期）"""
+    return pd.Index(df['fixture_id'])
+
+
+def in_windows(index, windows):
+    """日期索引中落在任一 [start, end] 窗口内（按日，含两端）的位置"""
+    days = pd.DatetimeIndex(index).normalize()
+    mask = np.zeros(len(days), dtype=bool)
+    for start, end in windows:
+        mask |= (days >= pd.Timestamp(start).normalize()) & (days <= pd.Timestamp(end).normalize())
+    return mask
+
+def upsert_history(spot_old, spot_new, windows=()):
+    """按成交标识把 spot_new upsert 进按日期有序的 spot_old
+    只有与新数据日期重叠的那一段旧数据需要比对和重排，其余部分原样拼接，开销与增量大小成正比
+    windows 为 spot_new 完整覆盖的日期窗口 [(start, end), ...]（接口对该时段的完整响应）：旧数据中日期落在窗口内、
+    但不在 spot_new 里的成交已被修正（fixtureString 变了，标识随之改变）或撤回，一并删除
+    """
+    new = spot_new[~fixture_keys(spot_new).duplicated(keep='last')].sort_index(kind='stable')
+    if spot_old is None or spot_old.empty:
+        return new
+    if len(windows):
+        stale = in_windows(spot_old.index, windows) & ~fixture_keys(spot_old).isin(fixture_keys(new))
+        spot_old = spot_old[~stale]
+    if new.empty:
+        return spot_old
+
+    # 旧数据按日期有序，用二分查找切出与新数据日期范围重叠的一段
+    lo = spot_old.index.searchsorted(new.index.min(), side='left')
+    hi = spot_old.index.searchsorted(new.index.max(), side='right')
+    overlap = spot_old.iloc[lo:hi]
+    kept = overlap[~fixture_keys(overlap).isin(fixture_keys(new))]
+    merged = pd.concat([kept, new]).sort_index(kind='stable')
+
+    return pd.concat([spot_old.iloc[:lo], merged, spot_old.iloc[hi:]])
+
+
+# ---------- 原子写入 ----------
+def atomic_write(path, write):
+    """原子写入 path：write(临时文件路径) 先写同目录下一个唯一命名的临时文件，再 os.replace 替换
+    读者不会看到写了一半的文件；多个线程 / 进程同时写同一路径时各用各的临时文件，以最后替换的为准
+    写入失败时删除临时文件
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'{os.path.basename(path)}.', suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+# ---------- 分区读写 ----------
+def feed_lock(feed_key):
+    """feed 的写锁（可重入）：分区的"读 → 合并 → 写回"在同一进程内逐个执行，两个会话同时同步同一个 feed 时不会互相覆盖"""
+    with _feed_locks_guard:
+        return _feed_locks.setdefault(feed_key, threading.RLock())
+
+def partition_path(feed_key, month, suffix=PARTITION_SUFFIX):
+    """month 为 'YYYY-MM'"""
+    return os.path.join(STORE_DIR, feed_key, f'{month}{suffix}')
+
+def list_months(feed_key):
+    """feed 已有的月份分区，按时间顺序"""
+    months = set()
+    for suffix in (PARTITION_SUFFIX, LEGACY_PARTITION_SUFFIX):
+        paths = glob.glob(os.path.join(STORE_DIR, feed_key, f'*{suffix}'))
+        months.update(os.path.basename(p)[:-len(suffix)] for p in paths)
+    return sorted(months)
+
+def read_partition(feed_key, month, columns=None):
+    """读取一个月份的 Parquet 分区，返回以 date 为索引、按日期排序的 DataFrame；分区不存在返回 None
+    columns 为需要的列（分区中不存在的列会被忽略），为空表示全部列，只解码这些列
+    还没有迁移的旧版 CSV 分区不读取（见 fixture_migrations）
+    """
+    path = partition_path(feed_key, month)
+    if not os.path.exists(path):
+        return None
+    if columns is not None:
+        available = set(pq.read_schema(path).names)
+        columns = [c for c in columns if c in available]
+    return pd.read_parquet(path, columns=columns)
+
+def partition_version(feed_key, month):
+    """分区的 schema 版本（只读文件尾的元数据）；旧版 CSV 分区和没有版本记录的分区为 0"""
+    path = partition_path(feed_key, month)
+    if not os.path.exists(path):
+        return 0
+    metadata = pq.read_schema(path).metadata or {}
+    return int(metadata.get(SCHEMA_VERSION_KEY, b'0'))
+
+def write_partition(feed_key, month, spot, version=SCHEMA_VERSION):
+    """原子写入一个月份分区（见 atomic_write）并记录 schema 版本"""
+    path = partition_path(feed_key, month)
+    table = pa.Table.from_pandas(apply_schema(spot))
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), SCHEMA_VERSION_KEY: str(version).encode()})
+    atomic_write(path, lambda tmp_path: pq.write_table(table, tmp_path))
+
+    legacy_path = partition_path(feed_key, month, LEGACY_PARTITION_SUFFIX)
+    if os.path.exists(legacy_path):
+        os.remove(legacy_path)
+
+
+def upsert(feed_key, spot_new, version=SCHEMA_VERSION, windows=()):
+    """把新数据 upsert 进存储，只读写被触及的月份分区；返回记录数的净增量（新增减去删除）
+    写入前被触及的分区应已迁移到当前版本；version 为写入的 schema 版本，导入旧版数据时记为 0，由迁移补齐
+    windows 为新数据完整覆盖的日期窗口，窗口内已不在新数据中的旧记录被删除（见 upsert_history）；
+    新数据为空时不做任何修改（接口偶发返回空列表时不清掉已有数据）
+    """
+    if spot_new is None or spot_new.empty:
+        return 0
+    groups = {str(month): group for month, group in spot_new.groupby(spot_new.index.to_period('M'))}
+    # 窗口覆盖、但这批数据里没有成交的已有月份，也要删除其中被撤回的记录
+    for start, end in windows:
+        for month in pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq='M').astype(str):
+            if month not in groups and os.path.exists(partition_path(feed_key, month)):
+                groups[month] = spot_new.iloc[:0]
+    added = 0
+    with feed_lock(feed_key):
+        for month, group in sorted(groups.items()):
+            spot_old = read_partition(feed_key, month)
+            if spot_old is None and group.empty:
+                continue
+            spot = upsert_history(spot_old, group, windows)
+            write_partition(feed_key, month, spot, version)
+            added += len(spot) - (0 if spot_old is None else len(spot_old))
+    return added
+
+
+def align_categories(frames):
+    """各分区的类别列统一成同一组类别（取并集），concat 后仍为类别型；类别不一致时 pd.concat 会退化成 object
+    当前版本的分区写入时已由 apply_schema 转成类别型（旧分区由 fixture_migrations 升级时重写），这里不做类型转换
+    """
+    for col in CATEGORY_COLUMNS:
+        parts = [f for f in frames if col in f.columns]
+        if len(parts) < 2:
+            continue
+        categories = parts[0][col].cat.categories
+        for f in parts[1:]:
+            categories = categories.union(f[col].cat.categories)
+        for f in parts:
+            f[col] = f[col].cat.set_categories(categories)
+    return frames
+
+def read_feed(feed_key, columns=None):
+    """读取 feed 的全部数据；columns 为需要的列，为空表示全部列
+    返回以 date 为索引、按日期升序的 DataFrame；没有数据时返回 None
+    按日期范围的查询走 fixture_db，不在这里读分区
+    """
+    frames = [read_partition(feed_key, m, columns) for m in list_months(feed_key)]
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return None
+    return pd.concat(align_categories(frames))
+
+def latest_date(feed_key):
+    """存储中最新的成交日期（只读最后一个分区），没有数据时返回 None"""
+    for month in reversed(list_months(feed_key)):
+        spot = read_partition(feed_key, month, columns=[])
+        if spot is not None and len(spot):
+            return spot.index.max()
+    return None
+
+def has_data(feed_key):
+    return bool(list_months(feed_key))
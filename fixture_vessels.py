@@ -0,0 +1,199 @@
+"""船舶主数据（vessel master data）
+同一条船会在各个 feed 中反复出现，但不是每条成交都写全了载重吨和建造年份：程租常只写船名和货量，
+接口还会用 dwt 0、buildYear 0 / 1700 这类占位值。这里把六个 feed 中见过的船按"规范化船名 + 建造年份"
+汇总成一张船舶维表（vessel_master.parquet），每次入库时增量更新（update），
+并用它一次性向量化补全新数据中缺失的 dwt / buildYear（fill），随后再划分船型
+
+  - 键是规范化船名和建造年份的 64 位内容哈希，查询是对整数键索引的 get_indexer，不逐行查找
+  - 没写建造年份的成交，按船名查找：只有维表中该船名只对应一条船时才补全
+  - 占位值（见 is_placeholder_dwt / is_placeholder_year）视同缺失；'TBN' 这类未指定的船不入表、不补全
+同一进程内的并发入库（各 feed 线程、回补线程）逐个合并；多个进程并发写入时最多丢失一部分观测（下次入库时再补上），
+不会读到写了一半的文件
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from fixture_store import atomic_write
+
+VESSEL_FILE = 'vessel_master.parquet'
+MIN_BUILD_YEAR = 1900 # 早于这一年的建造年份视为占位值（接口用 1700 表示未知）
+
+# 未指定具体船舶的船名：'TBN'、'Pan Ocean TBN'、'GNS tbn'、'TBA' ...
+UNNAMED = r'\b(?:tbn|tba|tbc)\b'
+
+_loaded = {} # {文件路径: (修改时间, 维表, 船名+年份键索引, 船名键索引)}
+_lock = threading.Lock()
+_update_lock = threading.Lock() # update 的读表 / 合并 / 写回整体互斥，并发入库的观测不会互相覆盖
+
+
+# ---------- 取值清洗 ----------
+def as_int(values):
+    """文本 / 数值列转成可空整数（兼容 '82,000'、'180000.0'）"""
+    text = pd.Series(values).astype('string').str.replace(',', '', regex=False)
+    return pd.to_numeric(text.str.extract(r'(\d+)', expand=False), errors='coerce').astype('Int64')
+
+def is_placeholder_dwt(dwt):
+    """dwt 为 0 是接口的占位值"""
+    return dwt.eq(0).fillna(False)
+
+def is_placeholder_year(year):
+    """buildYear 为 0、1700 等早于 MIN_BUILD_YEAR 的年份是占位值"""
+    return year.lt(MIN_BUILD_YEAR).fillna(False)
+
+def normalized_names(names):
+    """规范化船名：小写、去掉首尾的空格和引号、合并连续空白；未指定的船（TBN）为空值"""
+    text = pd.Series(names).astype('string').str.lower().str.replace(r'\s+', ' ', regex=True).str.strip(" '\"")
+    return text.mask(text.eq('') | text.str.contains(UNNAMED, regex=True).fillna(False))
+
+def vessel_keys(names, years):
+    """规范化船名 + 建造年份的 64 位内容哈希；years 为空时即只按船名的键"""
+    frame = pd.DataFrame({'name': pd.Series(names, dtype=object).to_numpy(),
+                          'year': pd.Series(years, dtype='Int64').to_numpy(dtype=float, na_value=np.nan)})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy().view(np.int64)
+
+
+# ---------- 读写维表 ----------
+def read_master():
+    """(维表, 船名+年份键索引, 船名键索引)；船名键索引只含维表中只对应一条船的船名
+    文件未修改时直接用进程内缓存；文件不存在时为空表
+    """
+    with _lock:
+        try:
+            mtime = os.path.getmtime(VESSEL_FILE)
+        except FileNotFoundError:
+            mtime = None
+        cached = _loaded.get(VESSEL_FILE)
+        if cached is not None and cached[0] == mtime:
+            return cached[1:]
+        if mtime is None:
+            master = pd.DataFrame({'name': pd.Series(dtype=object), 'buildYear': pd.Series(dtype='Int64'),
+                                   'dwt': pd.Series(dtype='Int64'), 'last_seen': pd.Series(dtype='datetime64[ns]')})
+        else:
+            master = pd.read_parquet(VESSEL_FILE)
+        entry = (mtime, master, *master_index(master))
+        _loaded[VESSEL_FILE] = entry
+        return entry[1:]
+
+def master_index(master):
+    """维表的两个哈希索引：船名+年份 → 行号；只对应一条船的船名 → 行号"""
+    by_vessel = pd.Index(vessel_keys(master['name'], master['buildYear']))
+    unique_name = ~master['name'].duplicated(keep=False).to_numpy()
+    by_name = pd.Index(vessel_keys(master['name'], pd.Series(pd.NA, index=master.index, dtype='Int64')))
+    return by_vessel, pd.Series(np.flatnonzero(unique_name), index=by_name[unique_name])
+
+def write_master(master):
+    """原子写入维表（见 fixture_store.atomic_write），并直接放进进程内缓存，下次读表不必再从磁盘读回"""
+    atomic_write(VESSEL_FILE, lambda tmp_path: master.to_parquet(tmp_path, index=False))
+    with _lock:
+        _loaded[VESSEL_FILE] = (os.path.getmtime(VESSEL_FILE), master, *master_index(master))
+
+
+# ---------- 增量更新 ----------
+def observations(spot):
+    """spot（以 date 为索引）中可以入表的观测：船名已指定、建造年份和 dwt 都不是空值 / 占位值
+    返回 name / buildYear / dwt / last_seen 四列，同一条船只保留最近一次成交
+    """
+    if spot is None or spot.empty or not {'shipName', 'buildYear', 'dwt'} <= set(spot.columns):
+        return None
+    seen = pd.DataFrame({'name': normalized_names(spot['shipName']).to_numpy(),
+                         'buildYear': as_int(spot['buildYear']).array,
+                         'dwt': as_int(spot['dwt']).array,
+                         'last_seen': pd.DatetimeIndex(spot.index).to_numpy()})
+    valid = (seen['name'].notna() & seen['buildYear'].notna() & seen['dwt'].notna()
+             & ~is_placeholder_year(seen['buildYear']) & ~is_placeholder_dwt(seen['dwt']))
+    seen = seen[valid.to_numpy()]
+    return seen.sort_values('last_seen', kind='stable').drop_duplicates(['name', 'buildYear'], keep='last')
+
+def update(spot):
+    """把 spot 中的船舶观测合并进维表：新船追加，已有的船以最近一次成交的 dwt 为准；返回新增的船数"""
+    seen = observations(spot)
+    if seen is None or seen.empty:
+        return 0
+    with _update_lock:
+        return merge(seen)
+
+def merge(seen):
+    """把 observations() 的结果合并进维表并写回；调用方持有 _update_lock"""
+    master, by_vessel, _ = read_master()
+    positions = by_vessel.get_indexer(vessel_keys(seen['name'], seen['buildYear']))
+    known = positions >= 0
+    # 已有的船只在这次的成交不早于表中记录时更新，乱序重放的旧数据不会覆盖新数据
+    newer = seen['last_seen'].to_numpy()[known] >= master['last_seen'].to_numpy()[positions[known]]
+    changed = (master['dwt'].to_numpy()[positions[known]] != seen['dwt'].to_numpy()[known]) & newer
+    if known.all() and not changed.any():
+        return 0
+
+    master = master.copy()
+    rows, values = positions[known][newer], seen[known][newer]
+    master.iloc[rows, master.columns.get_loc('dwt')] = values['dwt'].to_numpy()
+    master.iloc[rows, master.columns.get_loc('last_seen')] = values['last_seen'].to_numpy()
+    master = pd.concat([master, seen[~known]], ignore_index=True)
+    write_master(master)
+    return int((~known).sum())
+
+def rebuild(feed_keys=None):
+    """从分区存储中全部 feed 的历史重建维表；返回维表中的船数"""
+    import fixture_store
+    from fixture_pipeline import FEED_REGISTRY
+
+    with _update_lock:
+        if os.path.exists(VESSEL_FILE):
+            os.remove(VESSEL_FILE)
+    for feed_key in feed_keys or list(FEED_REGISTRY):
+        update(fixture_store.read_feed(feed_key, columns=['shipName', 'buildYear', 'dwt']))
+    return len(read_master()[0])
+
+
+# ---------- 补全 ----------
+def fill(spot):
+    """用维表补全 spot 中缺失或为占位值的 dwt / buildYear（两列转为可空整数），返回新表
+    写了建造年份的按船名+年份查找；没写的按船名查找，维表中该船名只对应一条船时才补全
+    """
+    if spot is None or spot.empty or 'shipName' not in spot.columns:
+        return spot
+
+    spot = spot.copy()
+    dwt = as_int(spot['dwt']) if 'dwt' in spot.columns else pd.Series(pd.NA, index=spot.index, dtype='Int64')
+    year = as_int(spot['buildYear']) if 'buildYear' in spot.columns else pd.Series(pd.NA, index=spot.index, dtype='Int64')
+    dwt = dwt.mask(is_placeholder_dwt(dwt))
+    year = year.mask(is_placeholder_year(year))
+
+    missing = (dwt.isna() | year.isna()).to_numpy()
+    master, by_vessel, by_name = read_master()
+    if missing.any() and len(master):
+        rows = np.flatnonzero(missing)
+        names = normalized_names(spot['shipName'].iloc[rows])
+        known_year = year.iloc[rows]
+        positions = by_vessel.get_indexer(vessel_keys(names, known_year))
+        # 没写建造年份的按船名查找
+        no_year = known_year.isna().to_numpy()
+        positions[no_year] = by_name.reindex(vessel_keys(names[no_year], known_year[no_year])).fillna(-1).to_numpy(dtype=int)
+        # 未指定的船（TBN）规范化后为空值，不补全
+        positions[names.isna().to_numpy()] = -1
+
+        # 按位置写回（date 索引有重复），已有的值保留
+        hit = rows[positions >= 0]
+        found = master.iloc[positions[positions >= 0]]
+        dwt.iloc[hit] = dwt.iloc[hit].where(dwt.iloc[hit].notna(), found['dwt'].to_numpy())
+        year.iloc[hit] = year.iloc[hit].where(year.iloc[hit].notna(), found['buildYear'].to_numpy())
+
+    spot['dwt'] = dwt
+    spot['buildYear'] = year
+    return spot
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Vessel master data built from all fixture feeds')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    rebuild_parser = subparsers.add_parser('rebuild', help='rebuild the vessel table from the partition store')
+    rebuild_parser.add_argument('--feeds', nargs='+', help='feeds to read (default: all)')
+    args = parser.parse_args()
+
+    if args.command == 'rebuild':
+        print(f'{rebuild(args.feeds)} vessels in {VESSEL_FILE}')
@@ -3,6 +3,8 @@ import pandas as pd
 from datetime import date, datetime
 import json
 
+import fixture_datasets
+
 st.set_page_config(layout="wide")
 st.title('Baltic Exchange Fixtures Dashboard')
 
@@ -78,15 +80,13 @@ def is_port_related(port_name, keywords):
     return False
 
 # ==================== 更宽容的数据检查 ====================
-def check_any_data_loaded():
+def check_any_data_loaded(datasets):
     """检查是否有任何数据已加载（更宽容的检查）"""
-    all_data_keys = ['tc_spot', 'period_spot', 'vcgr_spot', 'vcco_spot', 'vcmi_spot', 'vcor_spot']
-    
     # 检查是否有至少一个数据已加载且不为空
     loaded_data = []
-    for data_name in all_data_keys:
-        if data_name in st.session_state and st.session_state[data_name] is not None:
-            if hasattr(st.session_state[data_name], 'empty') and not st.session_state[data_name].empty:
+    for data_name, data in datasets.items():
+        if data is not None:
+            if not data.empty:
                 loaded_data.append((data_name, "有数据"))
             else:
                 loaded_data.append((data_name, "已加载但为空"))
@@ -94,13 +94,16 @@ def check_any_data_loaded():
             loaded_data.append((data_name, "未加载"))
     
     # 只要有任何数据已加载（即使为空），就认为有数据
-    has_any_data = any(name in st.session_state and st.session_state[name] is not None 
-                       for name in all_data_keys)
+    has_any_data = any(data is not None for data in datasets.values())
     
     return has_any_data, loaded_data
 
+# 各 feed 的数据由 fixture_datasets 在进程内共享（所有会话共用一份），取到的是浅拷贝，可以放心修改
+datasets = {f'{feed_key}_spot': fixture_datasets.dataset(feed_key)
+            for feed_key in ['tc', 'period', 'vcgr', 'vcco', 'vcmi', 'vcor']}
+
 # 检查数据加载状态
-has_any_data, data_status = check_any_data_loaded()
+has_any_data, data_status = check_any_data_loaded(datasets)
 
 if not has_any_data:
     st.markdown('# **:red[⚠️ 数据未加载]**')
@@ -122,13 +125,13 @@ if not has_any_data:
 # ==================== 如果数据已加载，继续执行 ====================
 st.success("✅ 数据加载完成！")
 
-# 实际数据变量 - 从session_state获取，但允许为空
-tc_spot = st.session_state.get('tc_spot')
-period_spot = st.session_state.get('period_spot')
-vcgr_spot = st.session_state.get('vcgr_spot')
-vcco_spot = st.session_state.get('vcco_spot')
-vcmi_spot = st.session_state.get('vcmi_spot')
-vcor_spot = st.session_state.get('vcor_spot')
+# 实际数据变量 - 从共享数据集获取，但允许为空
+tc_spot = datasets['tc_spot']
+period_spot = datasets['period_spot']
+vcgr_spot = datasets['vcgr_spot']
+vcco_spot = datasets['vcco_spot']
+vcmi_spot = datasets['vcmi_spot']
+vcor_spot = datasets['vcor_spot']
 
 # 显示数据状态概览
 st.subheader("📊 数据状态概览")
@@ -312,6 +315,9 @@ else:
     st.info(f"今日共 {total_records} 条记录")
     
     # ========== 动态生成基础筛选器 ==========
+    # 数值区间筛选（入库时已解析成数值列），只在用户收窄范围时生效
+    cargo_qty_range = None
+    period_days_range = None
     with st.sidebar.expander("🔍 基础筛选", expanded=True):
         st.subheader("基础筛选选项")
         
@@ -414,6 +420,21 @@ else:
                     )
                 else:
                     selected_redel = []
+                
+                # 租期按天数区间筛选（period_min_days / period_max_days 由租期描述解析，'12/14 months' 为 360-420 天）
+                if 'period_min_days' in latest_data.columns and latest_data['period_min_days'].notna().any():
+                    days_min = int(latest_data['period_min_days'].min())
+                    days_max = int(latest_data['period_max_days'].max())
+                    if days_min < days_max:
+                        selected_period_days = st.slider(
+                            "Period (days)",
+                            min_value=days_min,
+                            max_value=days_max,
+                            value=(days_min, days_max),
+                            help="显示租期与所选范围有重叠的记录（1 个月按 30 天计），无法识别租期的记录保留"
+                        )
+                        if selected_period_days != (days_min, days_max):
+                            period_days_range = selected_period_days
         
         else:
             # VOYAGE类型的筛选器
@@ -486,16 +507,24 @@ else:
                     st.info("Charterers: 无数据")
             
             with col4:
-                if 'cargoSize' in latest_data.columns and not latest_data['cargoSize'].dropna().empty:
-                    all_cargo_sizes = sorted(latest_data['cargoSize'].dropna().unique())
-                    selected_cargo_sizes = st.multiselect(
-                        "Cargo Sizes",
-                        options=all_cargo_sizes,
-                        default=[],
-                        help="选择要显示的货物尺寸，不选则显示全部"
-                    )
+                # 货量按数值区间筛选（cargo_qty_t 由 cargoSize 解析），不再逐个列出 cargoSize 字符串
+                if 'cargo_qty_t' in latest_data.columns and latest_data['cargo_qty_t'].notna().any():
+                    qty_min = int(latest_data['cargo_qty_t'].min())
+                    qty_max = int(latest_data['cargo_qty_t'].max())
+                    if qty_min < qty_max:
+                        selected_cargo_qty = st.slider(
+                            "Cargo Size (t)",
+                            min_value=qty_min,
+                            max_value=qty_max,
+                            value=(qty_min, qty_max),
+                            step=1000,
+                            help="选择货量范围（吨），无法识别货量的记录保留"
+                        )
+                        if selected_cargo_qty != (qty_min, qty_max):
+                            cargo_qty_range = selected_cargo_qty
+                    else:
+                        st.info(f"Cargo Size: {qty_min:,} t")
                 else:
-                    selected_cargo_sizes = []
                     st.info("Cargo Sizes: 无数据")
     
     # ========== 应用基础筛选 ==========
@@ -520,6 +549,11 @@ else:
         
         if 'selected_redel' in locals() and selected_redel:
             filtered_data = filtered_data[filtered_data['redel'].isin(selected_redel) | filtered_data['redel'].isna()]
+        
+        if period_days_range:
+            # 租期区间与所选范围有重叠；租期为空的记录保留
+            overlaps = (filtered_data['period_max_days'] >= period_days_range[0]) & (filtered_data['period_min_days'] <= period_days_range[1])
+            filtered_data = filtered_data[overlaps.fillna(True)]
     
     else:  # VOYAGE类型
         if selected_load_areas:
@@ -537,8 +571,9 @@ else:
         if selected_charterers:
             filtered_data = filtered_data[filtered_data['charterer'].isin(selected_charterers) | filtered_data['charterer'].isna()]
         
-        if selected_cargo_sizes:
-            filtered_data = filtered_data[filtered_data['cargoSize'].isin(selected_cargo_sizes) | filtered_data['cargoSize'].isna()]
+        if cargo_qty_range:
+            # 货量为空的记录保留
+            filtered_data = filtered_data[filtered_data['cargo_qty_t'].between(*cargo_qty_range).fillna(True)]
     
     # ========== 应用自定义集合筛选 ==========
     if selected_sets:
@@ -578,9 +613,9 @@ else:
         elif fixture_type == "PERIOD":
             recommended_columns = ['shipName', 'dwt', 'VESSEL TYPE', 'deliveryPort', 
                                  'loadArea', 'redel', 'hire', 'charterer', 'comment', 
-                                 'freeText', 'buildYear']
+                                 'freeText', 'buildYear', 'period_min_days', 'period_max_days']
         else:  # VOYAGE类型
-            recommended_columns = ['shipName', 'cargoSize', 'dwt', 'VESSEL TYPE', 
+            recommended_columns = ['shipName', 'cargoSize', 'cargo_qty_t', 'dwt', 'VESSEL TYPE', 
                                  'loadPort', 'loadArea', 'dischargePort', 'freight', 
                                  'charterer', 'comment', 'buildYear', 'freeText']
         
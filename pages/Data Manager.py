@@ -4,6 +4,8 @@ import pandas as pd
 import json
 from datetime import datetime
 
+import fixture_db
+
 st.set_page_config(layout="wide")
 st.title("🗂️ 自定义筛选集合管理器")
 
@@ -64,11 +66,12 @@ def clear_editing_set():
     st.session_state.new_set_mode = False
 
 # 使用 Streamlit 原生标签页
-tab1, tab2, tab3, tab4 = st.tabs([
+tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "📋 集合列表", 
     "✏️ 集合编辑", 
     "📚 模板库", 
-    "📥 导入/导出"
+    "📥 导入/导出",
+    "🚫 隔离记录"
 ])
 
 # ==================== 标签页1：集合列表 ====================
@@ -285,6 +288,31 @@ with tab1:
         st.session_state.active_tab = 1
         st.rerun()
 
+# ==================== 标签页5：隔离记录 ====================
+# 超出解析预算（fixtureString 过长）而没有解析的成交，由同步、回补和归档重放记入 fixture_db 的隔离表
+# 放在标签页2之前：标签页2未选中集合时会 st.stop()，排在它后面的内容不会渲染
+with tab5:
+    st.header("隔离记录")
+    st.caption("fixtureString 超出解析预算、没有做正则 / 文法解析的成交；成交本身仍已入库，只是解析字段为空")
+
+    quarantine_records = fixture_db.quarantined()
+    if quarantine_records.empty:
+        st.info("暂无隔离记录")
+    else:
+        feed_options = ["全部"] + sorted(quarantine_records['feed'].unique().tolist())
+        selected_feed = st.selectbox("Feed", feed_options, key="quarantine_feed")
+        if selected_feed != "全部":
+            quarantine_records = quarantine_records[quarantine_records['feed'] == selected_feed]
+
+        st.metric("隔离条数", len(quarantine_records))
+        st.dataframe(quarantine_records, use_container_width=True, hide_index=True)
+        st.download_button(
+            label="📥 下载隔离记录 (CSV)",
+            data=quarantine_records.to_csv(index=False).encode('utf-8-sig'),
+            file_name=f"quarantined_fixtures_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+
 # ==================== 标签页2：集合编辑 ====================
 with tab2:
     st.header("编辑集合")
@@ -566,6 +594,7 @@ st.sidebar.info("""
 - **集合编辑**：创建、编辑集合（关键词和描述）
 - **模板库**：使用预定义模板快速创建集合
 - **导入/导出**：备份和恢复配置
+- **隔离记录**：查看因过长而没有解析的成交
 
 **使用流程：**
 1. 在**集合列表**中查看现有集合
@@ -1,10 +1,18 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
-import os
+import fixture_db
+
+# 页面用到的列（筛选器、统计和默认显示列），查询时只取回这些列
+PERIOD_PAGE_COLUMNS = [
+    'shipName', 'dwt', 'VESSEL TYPE', 'deliveryPort',
+    'loadArea', 'redel', 'hire', 'charterer',
+    'comment', 'buildYear', 'freeText', 'voyageType', 'tripDescriptionPeriodInfo',
+    'hire_usd_day', 'ballast_bonus_usd', 'hire_tiered', 'laycan_start', 'laycan_end',
+    'period_min_days', 'period_max_days'
+]
 
 st.set_page_config(layout="wide", page_title="PERIOD Historical Data")
 st.title('⏳ PERIOD Historical Data')
@@ -14,145 +22,88 @@ st.markdown("""
 """)
 
 # ==================== Australia港口识别函数 ====================
+AUSTRALIAN_KEYWORDS = [
+    # 国家/地区名称
+    'AUSTRALIA', 'AUS', 
+    'WESTERN AUSTRALIA', 'WA',
+    'QUEENSLAND', 'QLD',
+    'NEW SOUTH WALES', 'NSW',
+    'VICTORIA', 'VIC',
+    'SOUTH AUSTRALIA', 'SA',
+    'TASMANIA', 'TAS',
+    'NORTHERN TERRITORY', 'NT',
+    
+    # 主要城市港口
+    'SYDNEY', 'MELBOURNE', 'BRISBANE', 'PERTH',
+    'ADELAIDE', 'DARWIN', 'HOBART', 
+    
+    # 重要港口城市
+    'NEWCASTLE', 'FREMANTLE', 'GEELONG', 'PORT KEMBLA',
+    'TOWNSVILLE', 'CAIRNS', 'GLADSTONE', 'MACKAY', 
+    'BUNBURY', 'ESPERANCE', 'ALBANY', 'PORT LINCOLN',
+    
+    # 矿石/煤炭港口
+    'PORT HEDLAND', 'DAMPIER', 'HAY POINT', 'ABBOT POINT',
+    'PORT WALCOTT', 'CAPE LAMBERT', 'PORT ALMA',
+    'PORT BOTANY', 'PORT OF BRISBANE', 'PORT OF MELBOURNE',
+    'PORT OF ADELAIDE', 'PORT OF FREMANTLE',
+    
+    # 其他常见港口
+    'WEIPA', 'GOVE', 'KARRATHA', 'GERALDTON',
+    'BROOME', 'PORTLAND', 'BURNIE', 'DEVONPORT',
+    'PORT PIRIE', 'WHYALLA', 'PORT GILES'
+]
+
+# Australia筛选检查的列
+AUSTRALIA_FIELDS = ['deliveryPort', 'loadArea', 'redel']
+
 def is_australian_port(port_name):
     """检查港口是否为Australia相关港口"""
     if pd.isna(port_name):
         return False
     
-    australian_keywords = [
-        # 国家/地区名称
-        'AUSTRALIA', 'AUS', 
-        'WESTERN AUSTRALIA', 'WA',
-        'QUEENSLAND', 'QLD',
-        'NEW SOUTH WALES', 'NSW',
-        'VICTORIA', 'VIC',
-        'SOUTH AUSTRALIA', 'SA',
-        'TASMANIA', 'TAS',
-        'NORTHERN TERRITORY', 'NT',
-        
-        # 主要城市港口
-        'SYDNEY', 'MELBOURNE', 'BRISBANE', 'PERTH',
-        'ADELAIDE', 'DARWIN', 'HOBART', 
-        
-        # 重要港口城市
-        'NEWCASTLE', 'FREMANTLE', 'GEELONG', 'PORT KEMBLA',
-        'TOWNSVILLE', 'CAIRNS', 'GLADSTONE', 'MACKAY', 
-        'BUNBURY', 'ESPERANCE', 'ALBANY', 'PORT LINCOLN',
-        
-        # 矿石/煤炭港口
-        'PORT HEDLAND', 'DAMPIER', 'HAY POINT', 'ABBOT POINT',
-        'PORT WALCOTT', 'CAPE LAMBERT', 'PORT ALMA',
-        'PORT BOTANY', 'PORT OF BRISBANE', 'PORT OF MELBOURNE',
-        'PORT OF ADELAIDE', 'PORT OF FREMANTLE',
-        
-        # 其他常见港口
-        'WEIPA', 'GOVE', 'KARRATHA', 'GERALDTON',
-        'BROOME', 'PORTLAND', 'BURNIE', 'DEVONPORT',
-        'PORT PIRIE', 'WHYALLA', 'PORT GILES'
-    ]
-    
     port_str = str(port_name).upper()
     
-    for keyword in australian_keywords:
+    for keyword in AUSTRALIAN_KEYWORDS:
         if keyword in port_str:
             return True
     
     return False
 
-def contains_australian_info(row):
-    """检查一行数据是否包含Australia相关信息"""
-    fields_to_check = ['deliveryPort', 'loadArea', 'redel']
-    for field in fields_to_check:
-        if field in row and is_australian_port(row[field]):
-            return True
-    return False
-
-# ==================== 数据加载 ====================
-@st.cache_data(ttl=300)  # 缓存5分钟
-def load_period_data_from_session():
-    """从session_state加载PERIOD数据"""
-    if 'period_spot' not in st.session_state:
-        return None
-    
-    data = st.session_state['period_spot']
-    
-    if data is None:
-        return None
-    
-    # 确保数据是DataFrame并且有正确的列
-    if isinstance(data, pd.DataFrame) and not data.empty:
-        # 确保数据按日期倒序排列（最新在前）
-        data = data.sort_index(ascending=False)
-        
-        # 确保有VESSEL TYPE列
-        if 'VESSEL TYPE' not in data.columns:
-            # 如果数据中没有VESSEL TYPE列，我们可以尝试添加
-            from datetime import date
-            import re
-            
-            def add_vessel_type_simple(df):
-                if df is None or df.empty:
-                    return df
-                
-                df = df.copy()
-                
-                if 'dwt' not in df.columns:
-                    df['VESSEL TYPE'] = None
-                    return df
-                
-                def parse_dwt(x):
-                    if pd.isna(x):
-                        return None
-                    try:
-                        x_str = str(x).replace(',', '').strip()
-                        match = re.search(r'(\d+)', x_str)
-                        if match:
-                            return int(match.group(1))
-                        return None
-                    except:
-                        return None
-                
-                df['dwt_numeric'] = df['dwt'].apply(parse_dwt)
-                
-                def determine_vessel_type(dwt_val):
-                    if pd.isna(dwt_val):
-                        return None
-                    
-                    try:
-                        dwt_num = float(dwt_val)
-                        if dwt_num > 100000:
-                            return 'CAPE/VLOC'
-                        elif dwt_num > 80000 and dwt_num < 100000:
-                            return 'KMX'
-                        elif dwt_num >= 65000 and dwt_num <= 80000:
-                            return 'PMX'
-                        elif dwt_num < 65000:
-                            return 'SMX/UMX/HANDY'
-                        else:
-                            return None
-                    except:
-                        return None
-                
-                df['VESSEL TYPE'] = df['dwt_numeric'].apply(determine_vessel_type)
-                
-                if 'dwt_numeric' in df.columns:
-                    df = df.drop(columns=['dwt_numeric'])
-                
-                return df
-            
-            data = add_vessel_type_simple(data)
-        
-        return data
-    
-    return None
-
 # ==================== 页面主逻辑 ====================
 st.sidebar.title("📅 时间范围筛选")
 
-# 尝试从session_state加载数据
-period_data = load_period_data_from_session()
+# ==================== 时间范围选择 ====================
+time_period = st.sidebar.selectbox(
+    "选择时间范围",
+    ["最近7天", "最近14天", "最近20天", "最近1个月", "最近2个月", "最近3个月", "最近6个月", "全部数据"],
+    index=2  # 默认选择最近20天
+)
 
-if period_data is None or period_data.empty:
+# 计算开始日期（全部数据不限开始日期）
+end_date = pd.to_datetime('today')
+if time_period == "最近7天":
+    start_date = end_date - timedelta(days=7)
+elif time_period == "最近14天":
+    start_date = end_date - timedelta(days=14)
+elif time_period == "最近20天":
+    start_date = end_date - timedelta(days=20)
+elif time_period == "最近1个月":
+    start_date = end_date - timedelta(days=30)
+elif time_period == "最近2个月":
+    start_date = end_date - timedelta(days=60)
+elif time_period == "最近3个月":
+    start_date = end_date - timedelta(days=90)
+elif time_period == "最近6个月":
+    start_date = end_date - timedelta(days=180)
+else:  # 全部数据
+    start_date = None
+
+# 把分区存储中新增或修改过的月份同步进查询库，再取数据概览
+fixture_db.refresh('period')
+earliest_date, latest_date, total_records = fixture_db.summary('period')
+
+if not total_records:
     st.error("⚠️ PERIOD数据未加载")
     st.markdown("""
     **请先返回数据处理页面加载数据：**
@@ -161,164 +112,95 @@ if period_data is None or period_data.empty:
     3. 等待数据加载完成
     4. 返回此页面查看历史数据
     """)
-    
-    # 尝试从文件直接加载作为备用
-    try:
-        if os.path.exists('periodcharter.csv'):
-            period_data = pd.read_csv('periodcharter.csv', parse_dates=['date'])
-            period_data.set_index('date', inplace=True)
-            period_data = period_data.sort_index(ascending=False)
-            st.session_state['period_spot'] = period_data
-            st.success(f"✅ 已从文件加载 {len(period_data)} 条历史记录")
-            # 重新加载数据
-            period_data = load_period_data_from_session()
-        else:
-            st.warning("未找到历史数据文件，请先运行数据处理页面")
-            st.stop()
-    except Exception as e:
-        st.error(f"加载数据时出错: {e}")
-        st.stop()
+    st.stop()
 
 # 显示数据基本信息
-if period_data is not None and not period_data.empty:
-    latest_date = period_data.index.max()
-    earliest_date = period_data.index.min()
-    total_records = len(period_data)
-
+if total_records:
     st.sidebar.info(f"""
     **数据概览:**
     - 最早日期: {earliest_date.strftime('%Y-%m-%d')}
     - 最新日期: {latest_date.strftime('%Y-%m-%d')}
     - 总记录数: {total_records:,}
-    - 数据来源: session_state
+    - 数据来源: 本地查询库 {fixture_db.DB_FILE}
     """)
 
-    # ==================== 时间范围选择 ====================
-    time_period = st.sidebar.selectbox(
-        "选择时间范围",
-        ["最近7天", "最近14天", "最近20天", "最近1个月", "最近2个月", "最近3个月", "最近6个月", "全部数据"],
-        index=2  # 默认选择最近20天
-    )
-
-    # 计算开始日期
-    end_date = pd.to_datetime('today')
-    if time_period == "最近7天":
-        start_date = end_date - timedelta(days=7)
-    elif time_period == "最近14天":
-        start_date = end_date - timedelta(days=14)
-    elif time_period == "最近20天":
-        start_date = end_date - timedelta(days=20)
-    elif time_period == "最近1个月":
-        start_date = end_date - timedelta(days=30)
-    elif time_period == "最近2个月":
-        start_date = end_date - timedelta(days=60)
-    elif time_period == "最近3个月":
-        start_date = end_date - timedelta(days=90)
-    elif time_period == "最近6个月":
-        start_date = end_date - timedelta(days=180)
-    else:  # 全部数据
+    if start_date is None:
         start_date = earliest_date
 
-    # 筛选时间范围内的数据
-    time_filtered_data = period_data[(period_data.index >= start_date) & (period_data.index <= end_date)].copy()
-
-    st.sidebar.success(f"**{time_period}** 内共有 **{len(time_filtered_data)}** 条记录")
+    period_records = fixture_db.count('period', start_date, end_date)
+    st.sidebar.success(f"**{time_period}** 内共有 **{period_records}** 条记录")
 
     # ==================== 数据筛选器 ====================
+    # 侧边栏的选择都记进 filters / keyword_filter，最后合成一条参数化查询，由数据库索引完成筛选
     st.sidebar.markdown("---")
     st.sidebar.title("🔍 数据筛选")
 
+    filters = {}  # {列名: 选中的值}
+
     # Australia筛选
     show_australia_only = st.sidebar.checkbox("🇦🇺 仅显示Australia相关港口", value=False)
+    keyword_filter = (AUSTRALIA_FIELDS, AUSTRALIAN_KEYWORDS) if show_australia_only else None
 
     if show_australia_only:
-        australia_mask = time_filtered_data.apply(contains_australian_info, axis=1)
-        time_filtered_data = time_filtered_data[australia_mask]
-        st.sidebar.info(f"Australia相关记录: {len(time_filtered_data)} 条")
+        australia_records = fixture_db.count('period', start_date, end_date, keyword_filter=keyword_filter)
+        st.sidebar.info(f"Australia相关记录: {australia_records} 条")
 
     # 其他筛选器
     st.sidebar.markdown("### 港口筛选")
 
-    if not time_filtered_data.empty:
+    if period_records:
         # deliveryPort 筛选
-        if 'deliveryPort' in time_filtered_data.columns:
-            all_delivery_ports = sorted(time_filtered_data['deliveryPort'].dropna().unique().tolist())
-            if all_delivery_ports:
-                selected_delivery = st.sidebar.multiselect(
-                    "Delivery Port",
-                    options=all_delivery_ports,
-                    default=all_delivery_ports[:5] if len(all_delivery_ports) > 5 else all_delivery_ports
-                )
-                
-                if selected_delivery:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['deliveryPort'].isin(selected_delivery) | 
-                        time_filtered_data['deliveryPort'].isna()
-                    ]
-        
+        all_delivery_ports = fixture_db.distinct_values('period', 'deliveryPort', start_date, end_date, filters, keyword_filter)
+        if all_delivery_ports:
+            selected_delivery = st.sidebar.multiselect(
+                "Delivery Port",
+                options=all_delivery_ports,
+                default=all_delivery_ports[:5] if len(all_delivery_ports) > 5 else all_delivery_ports
+            )
+            filters['deliveryPort'] = selected_delivery
+
         # loadArea 筛选
-        if 'loadArea' in time_filtered_data.columns:
-            all_load_areas = sorted(time_filtered_data['loadArea'].dropna().unique().tolist())
-            if all_load_areas:
-                selected_load_areas = st.sidebar.multiselect(
-                    "Load Area",
-                    options=all_load_areas,
-                    default=all_load_areas[:5] if len(all_load_areas) > 5 else all_load_areas
-                )
-                
-                if selected_load_areas:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['loadArea'].isin(selected_load_areas) | 
-                        time_filtered_data['loadArea'].isna()
-                    ]
-        
+        all_load_areas = fixture_db.distinct_values('period', 'loadArea', start_date, end_date, filters, keyword_filter)
+        if all_load_areas:
+            selected_load_areas = st.sidebar.multiselect(
+                "Load Area",
+                options=all_load_areas,
+                default=all_load_areas[:5] if len(all_load_areas) > 5 else all_load_areas
+            )
+            filters['loadArea'] = selected_load_areas
+
         # redel 筛选
-        if 'redel' in time_filtered_data.columns:
-            all_redel = sorted(time_filtered_data['redel'].dropna().unique().tolist())
-            if all_redel:
-                selected_redel = st.sidebar.multiselect(
-                    "Redelivery Port",
-                    options=all_redel,
-                    default=all_redel[:5] if len(all_redel) > 5 else all_redel
-                )
-                
-                if selected_redel:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['redel'].isin(selected_redel) | 
-                        time_filtered_data['redel'].isna()
-                    ]
-        
+        all_redel = fixture_db.distinct_values('period', 'redel', start_date, end_date, filters, keyword_filter)
+        if all_redel:
+            selected_redel = st.sidebar.multiselect(
+                "Redelivery Port",
+                options=all_redel,
+                default=all_redel[:5] if len(all_redel) > 5 else all_redel
+            )
+            filters['redel'] = selected_redel
+
         # VESSEL TYPE 筛选
-        if 'VESSEL TYPE' in time_filtered_data.columns:
-            all_vessel_types = sorted(time_filtered_data['VESSEL TYPE'].dropna().unique().tolist())
-            if all_vessel_types:
-                selected_vessel_types = st.sidebar.multiselect(
-                    "Vessel Type",
-                    options=all_vessel_types,
-                    default=all_vessel_types
-                )
-                
-                if selected_vessel_types:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['VESSEL TYPE'].isin(selected_vessel_types) | 
-                        time_filtered_data['VESSEL TYPE'].isna()
-                    ]
-        
+        all_vessel_types = fixture_db.distinct_values('period', 'VESSEL TYPE', start_date, end_date, filters, keyword_filter)
+        if all_vessel_types:
+            selected_vessel_types = st.sidebar.multiselect(
+                "Vessel Type",
+                options=all_vessel_types,
+                default=all_vessel_types
+            )
+            filters['VESSEL TYPE'] = selected_vessel_types
+
         # charterer 筛选
-        if 'charterer' in time_filtered_data.columns:
-            all_charterers = sorted(time_filtered_data['charterer'].dropna().unique().tolist())
-            if all_charterers:
-                selected_charterers = st.sidebar.multiselect(
-                    "Charterer",
-                    options=all_charterers,
-                    default=all_charterers[:5] if len(all_charterers) > 5 else all_charterers
-                )
-                
-                if selected_charterers:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['charterer'].isin(selected_charterers) | 
-                        time_filtered_data['charterer'].isna()
-                    ]
+        all_charterers = fixture_db.distinct_values('period', 'charterer', start_date, end_date, filters, keyword_filter)
+        if all_charterers:
+            selected_charterers = st.sidebar.multiselect(
+                "Charterer",
+                options=all_charterers,
+                default=all_charterers[:5] if len(all_charterers) > 5 else all_charterers
+            )
+            filters['charterer'] = selected_charterers
+
+    # 按所有筛选条件查询，只取回命中的行和页面用到的列
+    time_filtered_data = fixture_db.query('period', start_date, end_date, filters, keyword_filter, columns=PERIOD_PAGE_COLUMNS)
 
     # ==================== 主显示区域 ====================
     # 显示统计信息
@@ -405,6 +287,32 @@ if period_data is not None and not period_data.empty:
                         )
                         st.plotly_chart(fig2, use_container_width=True)
 
+        # 租金统计：hire 在入库时已拆成数值列（hire_usd_day 等），这里直接做数值聚合
+        if 'hire_usd_day' in time_filtered_data.columns and time_filtered_data['hire_usd_day'].notna().any():
+            st.subheader("💰 租金统计")
+            hire_rates = time_filtered_data['hire_usd_day'].dropna()
+            ballast_bonus = time_filtered_data['ballast_bonus_usd'].dropna()
+
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("平均日租金", f"${hire_rates.mean():,.0f}", help=f"{len(hire_rates)} 条有日租金")
+            with col2:
+                st.metric("日租金中位数", f"${hire_rates.median():,.0f}")
+            with col3:
+                st.metric("25% - 75% 分位", f"${hire_rates.quantile(0.25):,.0f} - ${hire_rates.quantile(0.75):,.0f}")
+            with col4:
+                st.metric("平均空放奖励", f"${ballast_bonus.mean():,.0f}" if len(ballast_bonus) else "-",
+                          help=f"{len(ballast_bonus)} 条含空放奖励")
+
+            # 按船型统计日租金
+            if 'VESSEL TYPE' in time_filtered_data.columns:
+                hire_by_type = (time_filtered_data.groupby('VESSEL TYPE')['hire_usd_day']
+                                .describe(percentiles=[0.25, 0.5, 0.75])
+                                .rename(columns={'count': '记录数', 'mean': '平均', 'std': '标准差', 'min': '最低',
+                                                 '25%': '25%分位', '50%': '中位数', '75%': '75%分位', 'max': '最高'})
+                                .round(0))
+                st.dataframe(hire_by_type, use_container_width=True)
+
         # 热门港口分析
         st.subheader("🌍 热门港口")
         
@@ -445,11 +353,7 @@ if period_data is not None and not period_data.empty:
         available_columns = time_filtered_data.columns.tolist()
         
         # PERIOD推荐显示的列
-        period_columns = [
-            'shipName', 'dwt', 'VESSEL TYPE', 'deliveryPort', 
-            'loadArea', 'redel', 'hire', 'charterer', 
-            'comment', 'buildYear', 'freeText', 'voyageType', 'tripDescriptionPeriodInfo'
-        ]
+        period_columns = PERIOD_PAGE_COLUMNS
         
         # 确保推荐的列都存在
         default_columns = [col for col in period_columns if col in available_columns]
@@ -549,8 +453,8 @@ if period_data is not None and not period_data.empty:
     ### 📊 使用说明
 
     **数据来源：**
-    - 所有数据来自 `st.session_state['period_spot']`
-    - 该数据在 **数据处理页面** 更新时自动加载
+    - 所有数据来自本地查询库 `fixtures.sqlite`，由分区存储 `fixture_store/` 同步而来
+    - 该数据在 **数据处理页面** 更新后，本页面打开时自动同步
     - 数据按日期倒序排列，最新记录显示在最前面
 
     **筛选功能：**
@@ -563,7 +467,7 @@ if period_data is not None and not period_data.empty:
 
     **数据更新：**
     - 返回 **数据处理页面** 点击 **Update Data** 按钮
-    - 系统会自动获取最新数据并追加到历史文件中
+    - 系统会自动获取最新数据并写入分区存储，本页面打开时自动同步进查询库
     - 建议每周更新一次以保持数据最新
 
     **注意事项：**
@@ -1,22 +1,24 @@
 """
 新.FIXTURE_PAGE.TC_PAGE 的 Docstring
-1. 在FISTURE_PROCESS中的load_tc_data() 函数已经将历史数据从 timecharter.csv 加载并与新数据合并了
-那么
-tc_spot=load_tc_data(days_back)
-if 'tc_spot' not in st.session_state:
-    st.session_state['tc_spot']=tc_spot
-返回的 tc_spot 包含了所有历史数据
-然后这个 tc_spot 被存储在 st.session_state['tc_spot'] 中
-tc_spot中已经包含了tccharter.csv中的所有数据以及dasback（默认为更新两天，点update时会向前拉取15天）的最新数据整合的数据（即全部数据）
-2. 在页面中，使用tc_spot = st.session_state['tc_spot']就是加载了session中的数据到tc_spot，就可以直接使用了
+1. 主页面（FIXTURE_PROCESS）打开时已经把历史数据和高水位之后缺失的工作日同步进分区存储和 fixture_db 索引
+   （点 Update Data 时会向前重抓最近几天）
+2. 页面按筛选条件直接查询 fixture_db，只取需要的行；会话里只保存筛选条件，不保存数据本身
+   需要全量数据时用 fixture_datasets.dataset('tc')，取到的是进程内共享数据的浅拷贝
 """
 import streamlit as st
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
-import os
+import fixture_db
+
+# 页面用到的列（筛选器、统计和默认显示列），查询时只取回这些列
+TC_PAGE_COLUMNS = [
+    'shipName', 'dwt', 'VESSEL TYPE', 'deliveryPort',
+    'loadArea', 'via', 'redel', 'hire', 'charterer',
+    'comment', 'buildYear', 'freeText',
+    'hire_usd_day', 'ballast_bonus_usd', 'hire_tiered', 'laycan_start', 'laycan_end'
+]
 
 st.set_page_config(layout="wide", page_title="TC Historical Data")
 st.title('⏳ TIMECHARTER Historical Data')
@@ -26,147 +28,88 @@ st.markdown("""
 """)
 
 # ==================== Australia港口识别函数 ====================
+AUSTRALIAN_KEYWORDS = [
+    # 国家/地区名称
+    'AUSTRALIA', 'AUS', 
+    'WESTERN AUSTRALIA', 'WA',
+    'QUEENSLAND', 'QLD',
+    'NEW SOUTH WALES', 'NSW',
+    'VICTORIA', 'VIC',
+    'SOUTH AUSTRALIA', 'SA',
+    'TASMANIA', 'TAS',
+    'NORTHERN TERRITORY', 'NT',
+    
+    # 主要城市港口
+    'SYDNEY', 'MELBOURNE', 'BRISBANE', 'PERTH',
+    'ADELAIDE', 'DARWIN', 'HOBART', 
+    
+    # 重要港口城市
+    'NEWCASTLE', 'FREMANTLE', 'GEELONG', 'PORT KEMBLA',
+    'TOWNSVILLE', 'CAIRNS', 'GLADSTONE', 'MACKAY', 
+    'BUNBURY', 'ESPERANCE', 'ALBANY', 'PORT LINCOLN',
+    
+    # 矿石/煤炭港口
+    'PORT HEDLAND', 'DAMPIER', 'HAY POINT', 'ABBOT POINT',
+    'PORT WALCOTT', 'CAPE LAMBERT', 'PORT ALMA',
+    'PORT BOTANY', 'PORT OF BRISBANE', 'PORT OF MELBOURNE',
+    'PORT OF ADELAIDE', 'PORT OF FREMANTLE',
+    
+    # 其他常见港口
+    'WEIPA', 'GOVE', 'KARRATHA', 'GERALDTON',
+    'BROOME', 'PORTLAND', 'BURNIE', 'DEVONPORT',
+    'PORT PIRIE', 'WHYALLA', 'PORT GILES'
+]
+
+# Australia筛选检查的列
+AUSTRALIA_FIELDS = ['deliveryPort', 'loadArea', 'via', 'redel']
+
 def is_australian_port(port_name):
     """检查港口是否为Australia相关港口"""
     if pd.isna(port_name):
         return False
     
-    australian_keywords = [
-        # 国家/地区名称
-        'AUSTRALIA', 'AUS', 
-        'WESTERN AUSTRALIA', 'WA',
-        'QUEENSLAND', 'QLD',
-        'NEW SOUTH WALES', 'NSW',
-        'VICTORIA', 'VIC',
-        'SOUTH AUSTRALIA', 'SA',
-        'TASMANIA', 'TAS',
-        'NORTHERN TERRITORY', 'NT',
-        
-        # 主要城市港口
-        'SYDNEY', 'MELBOURNE', 'BRISBANE', 'PERTH',
-        'ADELAIDE', 'DARWIN', 'HOBART', 
-        
-        # 重要港口城市
-        'NEWCASTLE', 'FREMANTLE', 'GEELONG', 'PORT KEMBLA',
-        'TOWNSVILLE', 'CAIRNS', 'GLADSTONE', 'MACKAY', 
-        'BUNBURY', 'ESPERANCE', 'ALBANY', 'PORT LINCOLN',
-        
-        # 矿石/煤炭港口
-        'PORT HEDLAND', 'DAMPIER', 'HAY POINT', 'ABBOT POINT',
-        'PORT WALCOTT', 'CAPE LAMBERT', 'PORT ALMA',
-        'PORT BOTANY', 'PORT OF BRISBANE', 'PORT OF MELBOURNE',
-        'PORT OF ADELAIDE', 'PORT OF FREMANTLE',
-        
-        # 其他常见港口
-        'WEIPA', 'GOVE', 'KARRATHA', 'GERALDTON',
-        'BROOME', 'PORTLAND', 'BURNIE', 'DEVONPORT',
-        'PORT PIRIE', 'WHYALLA', 'PORT GILES'
-    ]
-    
     port_str = str(port_name).upper()
     
-    for keyword in australian_keywords:
+    for keyword in AUSTRALIAN_KEYWORDS:
         if keyword in port_str:
             return True
     
     return False
 
-def contains_australian_info(row):
-    """检查一行数据是否包含Australia相关信息"""
-    fields_to_check = ['deliveryPort', 'loadArea', 'via', 'redel']
-    for field in fields_to_check:
-        if field in row and is_australian_port(row[field]):
-            return True
-    return False
-
-# ==================== 数据加载 ====================
-@st.cache_data(ttl=300)  # 缓存5分钟
-def load_tc_data_from_session():
-    """从session_state加载TC数据"""
-    if 'tc_spot' not in st.session_state:
-        return None
-    
-    data = st.session_state['tc_spot']
-    
-    if data is None:
-        return None
-    
-    # 确保数据是DataFrame并且有正确的列
-    if isinstance(data, pd.DataFrame) and not data.empty:
-        # 确保数据按日期倒序排列（最新在前）
-        data = data.sort_index(ascending=False)
-        
-        # 确保有VESSEL TYPE列
-        if 'VESSEL TYPE' not in data.columns:
-            # 如果数据中没有VESSEL TYPE列，我们可以尝试添加
-            from datetime import date
-            import re
-            
-            # 这里需要从你的数据处理页面导入add_vessel_type函数
-            # 但由于是单独页面，我们在这里定义一个简化版本
-            def add_vessel_type_simple(df):
-                if df is None or df.empty:
-                    return df
-                
-                df = df.copy()
-                
-                if 'dwt' not in df.columns:
-                    df['VESSEL TYPE'] = None
-                    return df
-                
-                def parse_dwt(x):
-                    if pd.isna(x):
-                        return None
-                    try:
-                        x_str = str(x).replace(',', '').strip()
-                        match = re.search(r'(\d+)', x_str)
-                        if match:
-                            return int(match.group(1))
-                        return None
-                    except:
-                        return None
-                
-                df['dwt_numeric'] = df['dwt'].apply(parse_dwt)
-                
-                def determine_vessel_type(dwt_val):
-                    if pd.isna(dwt_val):
-                        return None
-                    
-                    try:
-                        dwt_num = float(dwt_val)
-                        if dwt_num > 100000:
-                            return 'CAPE/VLOC'
-                        elif dwt_num > 80000 and dwt_num < 100000:
-                            return 'KMX'
-                        elif dwt_num >= 65000 and dwt_num <= 80000:
-                            return 'PMX'
-                        elif dwt_num < 65000:
-                            return 'SMX/UMX/HANDY'
-                        else:
-                            return None
-                    except:
-                        return None
-                
-                df['VESSEL TYPE'] = df['dwt_numeric'].apply(determine_vessel_type)
-                
-                if 'dwt_numeric' in df.columns:
-                    df = df.drop(columns=['dwt_numeric'])
-                
-                return df
-            
-            data = add_vessel_type_simple(data)
-        
-        return data
-    
-    return None
-
 # ==================== 页面主逻辑 ====================
 st.sidebar.title("📅 时间范围筛选")
 
-# 尝试从session_state加载数据
-tc_data = load_tc_data_from_session()
+# ==================== 时间范围选择 ====================
+time_period = st.sidebar.selectbox(
+    "选择时间范围",
+    ["最近7天", "最近14天", "最近20天", "最近1个月", "最近2个月", "最近3个月", "最近6个月", "全部数据"],
+    index=2  # 默认选择最近20天
+)
+
+# 计算开始日期（全部数据不限开始日期）
+end_date = pd.to_datetime('today')
+if time_period == "最近7天":
+    start_date = end_date - timedelta(days=7)
+elif time_period == "最近14天":
+    start_date = end_date - timedelta(days=14)
+elif time_period == "最近20天":
+    start_date = end_date - timedelta(days=20)
+elif time_period == "最近1个月":
+    start_date = end_date - timedelta(days=30)
+elif time_period == "最近2个月":
+    start_date = end_date - timedelta(days=60)
+elif time_period == "最近3个月":
+    start_date = end_date - timedelta(days=90)
+elif time_period == "最近6个月":
+    start_date = end_date - timedelta(days=180)
+else:  # 全部数据
+    start_date = None
 
-if tc_data is None or tc_data.empty:
+# 把分区存储中新增或修改过的月份同步进查询库，再取数据概览
+fixture_db.refresh('tc')
+earliest_date, latest_date, total_records = fixture_db.summary('tc')
+
+if not total_records:
     st.error("⚠️ TC数据未加载")
     st.markdown("""
     **请先返回数据处理页面加载数据：**
@@ -175,180 +118,119 @@ if tc_data is None or tc_data.empty:
     3. 等待数据加载完成
     4. 返回此页面查看历史数据
     """)
-    
-    # 尝试从文件直接加载作为备用
-    try:
-        if os.path.exists('timecharter.csv'):
-            tc_data = pd.read_csv('timecharter.csv', parse_dates=['date'])
-            tc_data.set_index('date', inplace=True)
-            tc_data = tc_data.sort_index(ascending=False)
-            st.session_state['tc_spot'] = tc_data
-            st.success(f"✅ 已从文件加载 {len(tc_data)} 条历史记录")
-            # 重新加载数据
-            tc_data = load_tc_data_from_session()
-        else:
-            st.warning("未找到历史数据文件，请先运行数据处理页面")
-            st.stop()
-    except Exception as e:
-        st.error(f"加载数据时出错: {e}")
-        st.stop()
+    st.stop()
 
 # 显示数据基本信息
-if tc_data is not None and not tc_data.empty:
-    latest_date = tc_data.index.max()
-    earliest_date = tc_data.index.min()
-    total_records = len(tc_data)
-
+if total_records:
     st.sidebar.info(f"""
     **数据概览:**
     - 最早日期: {earliest_date.strftime('%Y-%m-%d')}
     - 最新日期: {latest_date.strftime('%Y-%m-%d')}
     - 总记录数: {total_records:,}
-    - 数据来源: session_state
+    - 数据来源: 本地查询库 {fixture_db.DB_FILE}
     """)
 
-    # ==================== 时间范围选择 ====================
-    time_period = st.sidebar.selectbox(
-        "选择时间范围",
-        ["最近7天", "最近14天", "最近20天", "最近1个月", "最近2个月", "最近3个月", "最近6个月", "全部数据"],
-        index=2  # 默认选择最近20天
-    )
-
-    # 计算开始日期
-    end_date = pd.to_datetime('today')
-    if time_period == "最近7天":
-        start_date = end_date - timedelta(days=7)
-    elif time_period == "最近14天":
-        start_date = end_date - timedelta(days=14)
-    elif time_period == "最近20天":
-        start_date = end_date - timedelta(days=20)
-    elif time_period == "最近1个月":
-        start_date = end_date - timedelta(days=30)
-    elif time_period == "最近2个月":
-        start_date = end_date - timedelta(days=60)
-    elif time_period == "最近3个月":
-        start_date = end_date - timedelta(days=90)
-    elif time_period == "最近6个月":
-        start_date = end_date - timedelta(days=180)
-    else:  # 全部数据
+    if start_date is None:
         start_date = earliest_date
 
-    # 筛选时间范围内的数据
-    time_filtered_data = tc_data[(tc_data.index >= start_date) & (tc_data.index <= end_date)].copy()
-
-    st.sidebar.success(f"**{time_period}** 内共有 **{len(time_filtered_data)}** 条记录")
+    period_records = fixture_db.count('tc', start_date, end_date)
+    st.sidebar.success(f"**{time_period}** 内共有 **{period_records}** 条记录")
 
     # ==================== 数据筛选器 ====================
+    # 侧边栏的选择都记进 filters / keyword_filter，最后合成一条参数化查询，由数据库索引完成筛选
     st.sidebar.markdown("---")
     st.sidebar.title("🔍 数据筛选")
 
+    filters = {}  # {列名: 选中的值}
+    ranges = {}  # {数值或日期列名: (下限, 上限)}
+
     # Australia筛选
     show_australia_only = st.sidebar.checkbox("🇦🇺 仅显示Australia相关港口", value=False)
+    keyword_filter = (AUSTRALIA_FIELDS, AUSTRALIAN_KEYWORDS) if show_australia_only else None
 
     if show_australia_only:
-        australia_mask = time_filtered_data.apply(contains_australian_info, axis=1)
-        time_filtered_data = time_filtered_data[australia_mask]
-        st.sidebar.info(f"Australia相关记录: {len(time_filtered_data)} 条")
+        australia_records = fixture_db.count('tc', start_date, end_date, keyword_filter=keyword_filter)
+        st.sidebar.info(f"Australia相关记录: {australia_records} 条")
 
     # 其他筛选器
     st.sidebar.markdown("### 港口筛选")
 
-    if not time_filtered_data.empty:
+    if period_records:
         # deliveryPort 筛选
-        if 'deliveryPort' in time_filtered_data.columns:
-            all_delivery_ports = sorted(time_filtered_data['deliveryPort'].dropna().unique().tolist())
-            if all_delivery_ports:
-                selected_delivery = st.sidebar.multiselect(
-                    "Delivery Port",
-                    options=all_delivery_ports,
-                    default=all_delivery_ports[:5] if len(all_delivery_ports) > 5 else all_delivery_ports
-                )
-                
-                if selected_delivery:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['deliveryPort'].isin(selected_delivery) | 
-                        time_filtered_data['deliveryPort'].isna()
-                    ]
-        
+        all_delivery_ports = fixture_db.distinct_values('tc', 'deliveryPort', start_date, end_date, filters, keyword_filter)
+        if all_delivery_ports:
+            selected_delivery = st.sidebar.multiselect(
+                "Delivery Port",
+                options=all_delivery_ports,
+                default=all_delivery_ports[:5] if len(all_delivery_ports) > 5 else all_delivery_ports
+            )
+            filters['deliveryPort'] = selected_delivery
+
         # loadArea 筛选
-        if 'loadArea' in time_filtered_data.columns:
-            all_load_areas = sorted(time_filtered_data['loadArea'].dropna().unique().tolist())
-            if all_load_areas:
-                selected_load_areas = st.sidebar.multiselect(
-                    "Load Area",
-                    options=all_load_areas,
-                    default=all_load_areas[:5] if len(all_load_areas) > 5 else all_load_areas
-                )
-                
-                if selected_load_areas:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['loadArea'].isin(selected_load_areas) | 
-                        time_filtered_data['loadArea'].isna()
-                    ]
-        
+        all_load_areas = fixture_db.distinct_values('tc', 'loadArea', start_date, end_date, filters, keyword_filter)
+        if all_load_areas:
+            selected_load_areas = st.sidebar.multiselect(
+                "Load Area",
+                options=all_load_areas,
+                default=all_load_areas[:5] if len(all_load_areas) > 5 else all_load_areas
+            )
+            filters['loadArea'] = selected_load_areas
+
         # via 筛选
-        if 'via' in time_filtered_data.columns:
-            all_via = sorted(time_filtered_data['via'].dropna().unique().tolist())
-            if all_via:
-                selected_via = st.sidebar.multiselect(
-                    "Via Port",
-                    options=all_via,
-                    default=all_via[:5] if len(all_via) > 5 else all_via
-                )
-                
-                if selected_via:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['via'].isin(selected_via) | 
-                        time_filtered_data['via'].isna()
-                    ]
-        
+        all_via = fixture_db.distinct_values('tc', 'via', start_date, end_date, filters, keyword_filter)
+        if all_via:
+            selected_via = st.sidebar.multiselect(
+                "Via Port",
+                options=all_via,
+                default=all_via[:5] if len(all_via) > 5 else all_via
+            )
+            filters['via'] = selected_via
+
         # redel 筛选
-        if 'redel' in time_filtered_data.columns:
-            all_redel = sorted(time_filtered_data['redel'].dropna().unique().tolist())
-            if all_redel:
-                selected_redel = st.sidebar.multiselect(
-                    "Redelivery Port",
-                    options=all_redel,
-                    default=all_redel[:5] if len(all_redel) > 5 else all_redel
-                )
-                
-                if selected_redel:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['redel'].isin(selected_redel) | 
-                        time_filtered_data['redel'].isna()
-                    ]
-        
+        all_redel = fixture_db.distinct_values('tc', 'redel', start_date, end_date, filters, keyword_filter)
+        if all_redel:
+            selected_redel = st.sidebar.multiselect(
+                "Redelivery Port",
+                options=all_redel,
+                default=all_redel[:5] if len(all_redel) > 5 else all_redel
+            )
+            filters['redel'] = selected_redel
+
         # VESSEL TYPE 筛选
-        if 'VESSEL TYPE' in time_filtered_data.columns:
-            all_vessel_types = sorted(time_filtered_data['VESSEL TYPE'].dropna().unique().tolist())
-            if all_vessel_types:
-                selected_vessel_types = st.sidebar.multiselect(
-                    "Vessel Type",
-                    options=all_vessel_types,
-                    default=all_vessel_types
-                )
-                
-                if selected_vessel_types:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['VESSEL TYPE'].isin(selected_vessel_types) | 
-                        time_filtered_data['VESSEL TYPE'].isna()
-                    ]
-        
+        all_vessel_types = fixture_db.distinct_values('tc', 'VESSEL TYPE', start_date, end_date, filters, keyword_filter)
+        if all_vessel_types:
+            selected_vessel_types = st.sidebar.multiselect(
+                "Vessel Type",
+                options=all_vessel_types,
+                default=all_vessel_types
+            )
+            filters['VESSEL TYPE'] = selected_vessel_types
+
         # charterer 筛选
-        if 'charterer' in time_filtered_data.columns:
-            all_charterers = sorted(time_filtered_data['charterer'].dropna().unique().tolist())
-            if all_charterers:
-                selected_charterers = st.sidebar.multiselect(
-                    "Charterer",
-                    options=all_charterers,
-                    default=all_charterers[:5] if len(all_charterers) > 5 else all_charterers
-                )
-                
-                if selected_charterers:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['charterer'].isin(selected_charterers) | 
-                        time_filtered_data['charterer'].isna()
-                    ]
+        all_charterers = fixture_db.distinct_values('tc', 'charterer', start_date, end_date, filters, keyword_filter)
+        if all_charterers:
+            selected_charterers = st.sidebar.multiselect(
+                "Charterer",
+                options=all_charterers,
+                default=all_charterers[:5] if len(all_charterers) > 5 else all_charterers
+            )
+            filters['charterer'] = selected_charterers
+
+    # 受载期筛选：laycan_start 在入库时已解析成日期并建了索引，例如查"未来 14 天内开始受载"的成交
+    show_laycan_window = st.sidebar.checkbox("📅 按受载期筛选", value=False)
+    if show_laycan_window:
+        today = pd.Timestamp('today').normalize()
+        laycan_window = st.sidebar.date_input(
+            "Laycan 开始日期",
+            value=(today, today + timedelta(days=14)),
+            help="受载期开始日期落在所选范围内的成交（prompt 按成交日期计，无法识别受载期的记录不显示）"
+        )
+        if len(laycan_window) == 2:
+            ranges['laycan_start'] = laycan_window
+
+    # 按所有筛选条件查询，只取回命中的行和页面用到的列
+    time_filtered_data = fixture_db.query('tc', start_date, end_date, filters, keyword_filter,
+                                          columns=TC_PAGE_COLUMNS, ranges=ranges)
 
     # ==================== 主显示区域 ====================
     # 显示统计信息
@@ -435,6 +317,32 @@ if tc_data is not None and not tc_data.empty:
                         )
                         st.plotly_chart(fig2, use_container_width=True)
 
+        # 租金统计：hire 在入库时已拆成数值列（hire_usd_day 等），这里直接做数值聚合
+        if 'hire_usd_day' in time_filtered_data.columns and time_filtered_data['hire_usd_day'].notna().any():
+            st.subheader("💰 租金统计")
+            hire_rates = time_filtered_data['hire_usd_day'].dropna()
+            ballast_bonus = time_filtered_data['ballast_bonus_usd'].dropna()
+
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("平均日租金", f"${hire_rates.mean():,.0f}", help=f"{len(hire_rates)} 条有日租金")
+            with col2:
+                st.metric("日租金中位数", f"${hire_rates.median():,.0f}")
+            with col3:
+                st.metric("25% - 75% 分位", f"${hire_rates.quantile(0.25):,.0f} - ${hire_rates.quantile(0.75):,.0f}")
+            with col4:
+                st.metric("平均空放奖励", f"${ballast_bonus.mean():,.0f}" if len(ballast_bonus) else "-",
+                          help=f"{len(ballast_bonus)} 条含空放奖励")
+
+            # 按船型统计日租金
+            if 'VESSEL TYPE' in time_filtered_data.columns:
+                hire_by_type = (time_filtered_data.groupby('VESSEL TYPE')['hire_usd_day']
+                                .describe(percentiles=[0.25, 0.5, 0.75])
+                                .rename(columns={'count': '记录数', 'mean': '平均', 'std': '标准差', 'min': '最低',
+                                                 '25%': '25%分位', '50%': '中位数', '75%': '75%分位', 'max': '最高'})
+                                .round(0))
+                st.dataframe(hire_by_type, use_container_width=True)
+
         # 热门港口分析
         st.subheader("🌍 热门港口")
         
@@ -475,11 +383,7 @@ if tc_data is not None and not tc_data.empty:
         available_columns = time_filtered_data.columns.tolist()
         
         # TC推荐显示的列
-        tc_columns = [
-            'shipName', 'dwt', 'VESSEL TYPE', 'deliveryPort', 
-            'loadArea', 'via', 'redel', 'hire', 'charterer', 
-            'comment', 'buildYear', 'freeText'
-        ]
+        tc_columns = TC_PAGE_COLUMNS
         
         # 确保推荐的列都存在
         default_columns = [col for col in tc_columns if col in available_columns]
@@ -579,8 +483,8 @@ if tc_data is not None and not tc_data.empty:
     ### 📊 使用说明
 
     **数据来源：**
-    - 所有数据来自 `st.session_state['tc_spot']`
-    - 该数据在 **数据处理页面** 更新时自动加载
+    - 所有数据来自本地查询库 `fixtures.sqlite`，由分区存储 `fixture_store/` 同步而来
+    - 该数据在 **数据处理页面** 更新后，本页面打开时自动同步
     - 数据按日期倒序排列，最新记录显示在最前面
 
     **筛选功能：**
@@ -593,7 +497,7 @@ if tc_data is not None and not tc_data.empty:
 
     **数据更新：**
     - 返回 **数据处理页面** 点击 **Update Data** 按钮
-    - 系统会自动获取最新数据并追加到历史文件中
+    - 系统会自动获取最新数据并写入分区存储，本页面打开时自动同步进查询库
     - 建议每周更新一次以保持数据最新
 
     **注意事项：**
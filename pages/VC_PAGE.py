@@ -1,10 +1,18 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
-import os
+import fixture_db
+
+# 页面用到的列（筛选器、统计和默认显示列），查询时只取回这些列
+VC_PAGE_COLUMNS = [
+    'shipName', 'cargoSize', 'dwt', 'VESSEL TYPE',
+    'loadPort', 'loadArea', 'dischargePort', 'freight',
+    'charterer', 'comment', 'buildYear', 'freeText',
+    'freight_usd_t', 'terms', 'load_rate_t_day', 'load_terms', 'discharge_rate_t_day', 'discharge_terms',
+    'laycan_start', 'laycan_end', 'cargo_qty_t', 'cargo_tolerance_pct'
+]
 
 st.set_page_config(layout="wide", page_title="VOYAGE Historical Data")
 st.title('🚢 VOYAGE Historical Data')
@@ -14,160 +22,64 @@ st.markdown("""
 """)
 
 # ==================== Australia港口识别函数 ====================
+AUSTRALIAN_KEYWORDS = [
+    # 国家/地区名称
+    'AUSTRALIA', 'AUS', 
+    'WESTERN AUSTRALIA', 'WA',
+    'QUEENSLAND', 'QLD',
+    'NEW SOUTH WALES', 'NSW',
+    'VICTORIA', 'VIC',
+    'SOUTH AUSTRALIA', 'SA',
+    'TASMANIA', 'TAS',
+    'NORTHERN TERRITORY', 'NT',
+    
+    # 主要城市港口
+    'SYDNEY', 'MELBOURNE', 'BRISBANE', 'PERTH',
+    'ADELAIDE', 'DARWIN', 'HOBART', 
+    
+    # 重要港口城市
+    'NEWCASTLE', 'FREMANTLE', 'GEELONG', 'PORT KEMBLA',
+    'TOWNSVILLE', 'CAIRNS', 'GLADSTONE', 'MACKAY', 
+    'BUNBURY', 'ESPERANCE', 'ALBANY', 'PORT LINCOLN',
+    
+    # 矿石/煤炭港口
+    'PORT HEDLAND', 'DAMPIER', 'HAY POINT', 'ABBOT POINT',
+    'PORT WALCOTT', 'CAPE LAMBERT', 'PORT ALMA',
+    'PORT BOTANY', 'PORT OF BRISBANE', 'PORT OF MELBOURNE',
+    'PORT OF ADELAIDE', 'PORT OF FREMANTLE',
+    
+    # 其他常见港口
+    'WEIPA', 'GOVE', 'KARRATHA', 'GERALDTON',
+    'BROOME', 'PORTLAND', 'BURNIE', 'DEVONPORT',
+    'PORT PIRIE', 'WHYALLA', 'PORT GILES'
+]
+
+# Australia筛选检查的列
+AUSTRALIA_FIELDS = ['loadArea', 'loadPort', 'dischargePort']
+
 def is_australian_port(port_name):
     """检查港口是否为Australia相关港口"""
     if pd.isna(port_name):
         return False
     
-    australian_keywords = [
-        # 国家/地区名称
-        'AUSTRALIA', 'AUS', 
-        'WESTERN AUSTRALIA', 'WA',
-        'QUEENSLAND', 'QLD',
-        'NEW SOUTH WALES', 'NSW',
-        'VICTORIA', 'VIC',
-        'SOUTH AUSTRALIA', 'SA',
-        'TASMANIA', 'TAS',
-        'NORTHERN TERRITORY', 'NT',
-        
-        # 主要城市港口
-        'SYDNEY', 'MELBOURNE', 'BRISBANE', 'PERTH',
-        'ADELAIDE', 'DARWIN', 'HOBART', 
-        
-        # 重要港口城市
-        'NEWCASTLE', 'FREMANTLE', 'GEELONG', 'PORT KEMBLA',
-        'TOWNSVILLE', 'CAIRNS', 'GLADSTONE', 'MACKAY', 
-        'BUNBURY', 'ESPERANCE', 'ALBANY', 'PORT LINCOLN',
-        
-        # 矿石/煤炭港口
-        'PORT HEDLAND', 'DAMPIER', 'HAY POINT', 'ABBOT POINT',
-        'PORT WALCOTT', 'CAPE LAMBERT', 'PORT ALMA',
-        'PORT BOTANY', 'PORT OF BRISBANE', 'PORT OF MELBOURNE',
-        'PORT OF ADELAIDE', 'PORT OF FREMANTLE',
-        
-        # 其他常见港口
-        'WEIPA', 'GOVE', 'KARRATHA', 'GERALDTON',
-        'BROOME', 'PORTLAND', 'BURNIE', 'DEVONPORT',
-        'PORT PIRIE', 'WHYALLA', 'PORT GILES'
-    ]
-    
     port_str = str(port_name).upper()
     
-    for keyword in australian_keywords:
+    for keyword in AUSTRALIAN_KEYWORDS:
         if keyword in port_str:
             return True
     
     return False
 
-def contains_australian_info(row):
-    """检查一行数据是否包含Australia相关信息"""
-    # VC类型检查loadArea, loadPort, dischargePort
-    fields_to_check = ['loadArea', 'loadPort', 'dischargePort']
-    for field in fields_to_check:
-        if field in row and is_australian_port(row[field]):
-            return True
-    return False
-
 # ==================== 数据加载函数 ====================
-@st.cache_data(ttl=300)  # 缓存5分钟
-def load_vc_data_from_session(vc_type):
-    """从session_state加载指定类型的VC数据"""
-    # 根据VC类型确定session_state中的键名
-    session_keys = {
-        'VOYAGE GRAIN': 'vcgr_spot',
-        'VOYAGE COAL': 'vcco_spot',
-        'VOYAGE MISC': 'vcmi_spot',
-        'VOYAGE ORE': 'vcor_spot'
-    }
-    
-    if vc_type not in session_keys:
-        return None
-    
-    session_key = session_keys[vc_type]
-    
-    if session_key not in st.session_state:
-        return None
-    
-    data = st.session_state[session_key]
-    
-    if data is None:
-        return None
-    
-    # 确保数据是DataFrame并且有正确的列
-    if isinstance(data, pd.DataFrame) and not data.empty:
-        # 确保数据按日期倒序排列（最新在前）
-        data = data.sort_index(ascending=False)
-        
-        # 确保有VESSEL TYPE列
-        if 'VESSEL TYPE' not in data.columns:
-            # 如果数据中没有VESSEL TYPE列，我们可以尝试添加
-            import re
-            
-            def add_vessel_type_simple(df):
-                if df is None or df.empty:
-                    return df
-                
-                df = df.copy()
-                
-                if 'dwt' not in df.columns:
-                    df['VESSEL TYPE'] = None
-                    return df
-                
-                def parse_dwt(x):
-                    if pd.isna(x):
-                        return None
-                    try:
-                        x_str = str(x).replace(',', '').strip()
-                        match = re.search(r'(\d+)', x_str)
-                        if match:
-                            return int(match.group(1))
-                        return None
-                    except:
-                        return None
-                
-                df['dwt_numeric'] = df['dwt'].apply(parse_dwt)
-                
-                def determine_vessel_type(dwt_val):
-                    if pd.isna(dwt_val):
-                        return None
-                    
-                    try:
-                        dwt_num = float(dwt_val)
-                        if dwt_num > 100000:
-                            return 'CAPE/VLOC'
-                        elif dwt_num > 80000 and dwt_num < 100000:
-                            return 'KMX'
-                        elif dwt_num >= 65000 and dwt_num <= 80000:
-                            return 'PMX'
-                        elif dwt_num < 65000:
-                            return 'SMX/UMX/HANDY'
-                        else:
-                            return None
-                    except:
-                        return None
-                
-                df['VESSEL TYPE'] = df['dwt_numeric'].apply(determine_vessel_type)
-                
-                if 'dwt_numeric' in df.columns:
-                    df = df.drop(columns=['dwt_numeric'])
-                
-                return df
-            
-            data = add_vessel_type_simple(data)
-        
-        return data
-    
-    return None
-
-def get_vc_file_path(vc_type):
-    """根据VC类型获取文件路径"""
-    file_map = {
-        'VOYAGE GRAIN': 'vcgrain.csv',
-        'VOYAGE COAL': 'vccoal.csv',
-        'VOYAGE MISC': 'vcmisc.csv',
-        'VOYAGE ORE': 'vcore.csv'
+def get_vc_feed_key(vc_type):
+    """根据VC类型获取分区存储中的feed名"""
+    feed_map = {
+        'VOYAGE GRAIN': 'vcgr',
+        'VOYAGE COAL': 'vcco',
+        'VOYAGE MISC': 'vcmi',
+        'VOYAGE ORE': 'vcor'
     }
-    return file_map.get(vc_type)
+    return feed_map.get(vc_type)
 
 # ==================== 页面主逻辑 ====================
 st.sidebar.title("📊 数据配置")
@@ -183,171 +95,159 @@ vc_type = st.sidebar.selectbox(
 st.sidebar.markdown("---")
 st.sidebar.title("📅 时间范围筛选")
 
-# 尝试从session_state加载数据
-vc_data = load_vc_data_from_session(vc_type)
+# ==================== 时间范围选择 ====================
+time_period = st.sidebar.selectbox(
+    "选择时间范围",
+    ["最近7天", "最近14天", "最近20天", "最近1个月", "最近2个月", "最近3个月", "最近6个月", "全部数据"],
+    index=2  # 默认选择最近20天
+)
 
-# 如果session_state中没有数据，尝试从文件加载
-if vc_data is None or vc_data.empty:
-    file_path = get_vc_file_path(vc_type)
-    
-    if file_path and os.path.exists(file_path):
-        try:
-            vc_data = pd.read_csv(file_path, parse_dates=['date'])
-            vc_data.set_index('date', inplace=True)
-            vc_data = vc_data.sort_index(ascending=False)
-            
-            # 更新session_state
-            session_keys = {
-                'VOYAGE GRAIN': 'vcgr_spot',
-                'VOYAGE COAL': 'vcco_spot',
-                'VOYAGE MISC': 'vcmi_spot',
-                'VOYAGE ORE': 'vcor_spot'
-            }
-            st.session_state[session_keys[vc_type]] = vc_data
-            
-            st.sidebar.success(f"✅ 已从文件加载 {len(vc_data)} 条{vc_type}记录")
-        except Exception as e:
-            st.error(f"从文件加载数据时出错: {e}")
-            st.stop()
-    else:
-        st.error(f"⚠️ {vc_type}数据未加载且未找到数据文件")
-        st.markdown(f"""
-        **请先返回数据处理页面加载数据：**
-        1. 前往 **数据处理页面**
-        2. 点击 **Update Data** 按钮
-        3. 等待数据加载完成
-        4. 返回此页面查看历史数据
-        """)
-        st.stop()
+# 计算开始日期（全部数据不限开始日期）
+end_date = pd.to_datetime('today')
+if time_period == "最近7天":
+    start_date = end_date - timedelta(days=7)
+elif time_period == "最近14天":
+    start_date = end_date - timedelta(days=14)
+elif time_period == "最近20天":
+    start_date = end_date - timedelta(days=20)
+elif time_period == "最近1个月":
+    start_date = end_date - timedelta(days=30)
+elif time_period == "最近2个月":
+    start_date = end_date - timedelta(days=60)
+elif time_period == "最近3个月":
+    start_date = end_date - timedelta(days=90)
+elif time_period == "最近6个月":
+    start_date = end_date - timedelta(days=180)
+else:  # 全部数据
+    start_date = None
+
+# 把分区存储中新增或修改过的月份同步进查询库，再取数据概览
+feed_key = get_vc_feed_key(vc_type)
+fixture_db.refresh(feed_key)
+earliest_date, latest_date, total_records = fixture_db.summary(feed_key)
+
+if not total_records:
+    st.error(f"⚠️ {vc_type}数据未加载且未找到数据文件")
+    st.markdown(f"""
+    **请先返回数据处理页面加载数据：**
+    1. 前往 **数据处理页面**
+    2. 点击 **Update Data** 按钮
+    3. 等待数据加载完成
+    4. 返回此页面查看历史数据
+    """)
+    st.stop()
 
 # 显示数据基本信息
-if vc_data is not None and not vc_data.empty:
-    latest_date = vc_data.index.max()
-    earliest_date = vc_data.index.min()
-    total_records = len(vc_data)
-
+if total_records:
     st.sidebar.info(f"""
     **数据概览:**
     - 类型: {vc_type}
     - 最早日期: {earliest_date.strftime('%Y-%m-%d')}
     - 最新日期: {latest_date.strftime('%Y-%m-%d')}
     - 总记录数: {total_records:,}
+    - 数据来源: 本地查询库 {fixture_db.DB_FILE}
     """)
 
-    # ==================== 时间范围选择 ====================
-    time_period = st.sidebar.selectbox(
-        "选择时间范围",
-        ["最近7天", "最近14天", "最近20天", "最近1个月", "最近2个月", "最近3个月", "最近6个月", "全部数据"],
-        index=2  # 默认选择最近20天
-    )
-
-    # 计算开始日期
-    end_date = pd.to_datetime('today')
-    if time_period == "最近7天":
-        start_date = end_date - timedelta(days=7)
-    elif time_period == "最近14天":
-        start_date = end_date - timedelta(days=14)
-    elif time_period == "最近20天":
-        start_date = end_date - timedelta(days=20)
-    elif time_period == "最近1个月":
-        start_date = end_date - timedelta(days=30)
-    elif time_period == "最近2个月":
-        start_date = end_date - timedelta(days=60)
-    elif time_period == "最近3个月":
-        start_date = end_date - timedelta(days=90)
-    elif time_period == "最近6个月":
-        start_date = end_date - timedelta(days=180)
-    else:  # 全部数据
+    if start_date is None:
         start_date = earliest_date
 
-    # 筛选时间范围内的数据
-    time_filtered_data = vc_data[(vc_data.index >= start_date) & (vc_data.index <= end_date)].copy()
-
-    st.sidebar.success(f"**{time_period}** 内共有 **{len(time_filtered_data)}** 条记录")
+    period_records = fixture_db.count(feed_key, start_date, end_date)
+    st.sidebar.success(f"**{time_period}** 内共有 **{period_records}** 条记录")
 
     # ==================== 数据筛选器 ====================
+    # 侧边栏的选择都记进 filters / keyword_filter，最后合成一条参数化查询，由数据库索引完成筛选
     st.sidebar.markdown("---")
     st.sidebar.title("🔍 数据筛选")
 
+    filters = {}  # {列名: 选中的值}
+    ranges = {}  # {数值或日期列名: (下限, 上限)}
+
     # Australia筛选
     show_australia_only = st.sidebar.checkbox("🇦🇺 仅显示Australia相关港口", value=False)
+    keyword_filter = (AUSTRALIA_FIELDS, AUSTRALIAN_KEYWORDS) if show_australia_only else None
 
     if show_australia_only:
-        australia_mask = time_filtered_data.apply(contains_australian_info, axis=1)
-        time_filtered_data = time_filtered_data[australia_mask]
-        st.sidebar.info(f"Australia相关记录: {len(time_filtered_data)} 条")
+        australia_records = fixture_db.count(feed_key, start_date, end_date, keyword_filter=keyword_filter)
+        st.sidebar.info(f"Australia相关记录: {australia_records} 条")
 
     # VC筛选器（只保留指定的4个字段）
     st.sidebar.markdown("### VC筛选选项")
 
-    if not time_filtered_data.empty:
+    if period_records:
         # loadPort 筛选
-        if 'loadPort' in time_filtered_data.columns:
-            all_load_ports = sorted(time_filtered_data['loadPort'].dropna().unique().tolist())
-            if all_load_ports:
-                selected_load_ports = st.sidebar.multiselect(
-                    "Load Port",
-                    options=all_load_ports,
-                    default=all_load_ports[:5] if len(all_load_ports) > 5 else all_load_ports,
-                    help="选择要显示的装载港口"
-                )
-                
-                if selected_load_ports:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['loadPort'].isin(selected_load_ports) | 
-                        time_filtered_data['loadPort'].isna()
-                    ]
-        
+        all_load_ports = fixture_db.distinct_values(feed_key, 'loadPort', start_date, end_date, filters, keyword_filter)
+        if all_load_ports:
+            selected_load_ports = st.sidebar.multiselect(
+                "Load Port",
+                options=all_load_ports,
+                default=all_load_ports[:5] if len(all_load_ports) > 5 else all_load_ports,
+                help="选择要显示的装载港口"
+            )
+            filters['loadPort'] = selected_load_ports
+
         # loadArea 筛选
-        if 'loadArea' in time_filtered_data.columns:
-            all_load_areas = sorted(time_filtered_data['loadArea'].dropna().unique().tolist())
-            if all_load_areas:
-                selected_load_areas = st.sidebar.multiselect(
-                    "Load Area",
-                    options=all_load_areas,
-                    default=all_load_areas[:5] if len(all_load_areas) > 5 else all_load_areas,
-                    help="选择要显示的装载区域"
-                )
-                
-                if selected_load_areas:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['loadArea'].isin(selected_load_areas) | 
-                        time_filtered_data['loadArea'].isna()
-                    ]
-        
+        all_load_areas = fixture_db.distinct_values(feed_key, 'loadArea', start_date, end_date, filters, keyword_filter)
+        if all_load_areas:
+            selected_load_areas = st.sidebar.multiselect(
+                "Load Area",
+                options=all_load_areas,
+                default=all_load_areas[:5] if len(all_load_areas) > 5 else all_load_areas,
+                help="选择要显示的装载区域"
+            )
+            filters['loadArea'] = selected_load_areas
+
         # dischargePort 筛选
-        if 'dischargePort' in time_filtered_data.columns:
-            all_discharge_ports = sorted(time_filtered_data['dischargePort'].dropna().unique().tolist())
-            if all_discharge_ports:
-                selected_discharge_ports = st.sidebar.multiselect(
-                    "Discharge Port",
-                    options=all_discharge_ports,
-                    default=all_discharge_ports[:5] if len(all_discharge_ports) > 5 else all_discharge_ports,
-                    help="选择要显示的卸货港口"
-                )
-                
-                if selected_discharge_ports:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['dischargePort'].isin(selected_discharge_ports) | 
-                        time_filtered_data['dischargePort'].isna()
-                    ]
-        
+        all_discharge_ports = fixture_db.distinct_values(feed_key, 'dischargePort', start_date, end_date, filters, keyword_filter)
+        if all_discharge_ports:
+            selected_discharge_ports = st.sidebar.multiselect(
+                "Discharge Port",
+                options=all_discharge_ports,
+                default=all_discharge_ports[:5] if len(all_discharge_ports) > 5 else all_discharge_ports,
+                help="选择要显示的卸货港口"
+            )
+            filters['dischargePort'] = selected_discharge_ports
+
         # VESSEL TYPE 筛选
-        if 'VESSEL TYPE' in time_filtered_data.columns:
-            all_vessel_types = sorted(time_filtered_data['VESSEL TYPE'].dropna().unique().tolist())
-            if all_vessel_types:
-                selected_vessel_types = st.sidebar.multiselect(
-                    "Vessel Type",
-                    options=all_vessel_types,
-                    default=all_vessel_types,
-                    help="选择要显示的船舶类型"
-                )
-                
-                if selected_vessel_types:
-                    time_filtered_data = time_filtered_data[
-                        time_filtered_data['VESSEL TYPE'].isin(selected_vessel_types) | 
-                        time_filtered_data['VESSEL TYPE'].isna()
-                    ]
+        all_vessel_types = fixture_db.distinct_values(feed_key, 'VESSEL TYPE', start_date, end_date, filters, keyword_filter)
+        if all_vessel_types:
+            selected_vessel_types = st.sidebar.multiselect(
+                "Vessel Type",
+                options=all_vessel_types,
+                default=all_vessel_types,
+                help="选择要显示的船舶类型"
+            )
+            filters['VESSEL TYPE'] = selected_vessel_types
+
+        # 运费范围筛选：freight_usd_t 在入库时已拆成数值列，由数据库按数值区间筛选
+        freight_range = fixture_db.value_range(feed_key, 'freight_usd_t', start_date, end_date)
+        if freight_range and freight_range[0] < freight_range[1]:
+            full_range = (float(freight_range[0]), float(freight_range[1]))
+            selected_freight = st.sidebar.slider(
+                "Freight ($/t)",
+                min_value=full_range[0],
+                max_value=full_range[1],
+                value=full_range,
+                step=0.05,
+                help="收窄范围后，没有解析出运费的记录不再显示"
+            )
+            if selected_freight != full_range:
+                ranges['freight_usd_t'] = selected_freight
+
+    # 受载期筛选：laycan_start 在入库时已解析成日期并建了索引，例如查"未来 14 天内开始受载"的成交
+    show_laycan_window = st.sidebar.checkbox("📅 按受载期筛选", value=False)
+    if show_laycan_window:
+        today = pd.Timestamp('today').normalize()
+        laycan_window = st.sidebar.date_input(
+            "Laycan 开始日期",
+            value=(today, today + timedelta(days=14)),
+            help="受载期开始日期落在所选范围内的成交（prompt 按成交日期计，无法识别受载期的记录不显示）"
+        )
+        if len(laycan_window) == 2:
+            ranges['laycan_start'] = laycan_window
+
+    # 按所有筛选条件查询，只取回命中的行和页面用到的列
+    time_filtered_data = fixture_db.query(feed_key, start_date, end_date, filters, keyword_filter,
+                                          columns=VC_PAGE_COLUMNS, ranges=ranges)
 
     # ==================== 主显示区域 ====================
     # 页面标题显示当前选择的VC类型
@@ -437,6 +337,34 @@ if vc_data is not None and not vc_data.empty:
                         )
                         st.plotly_chart(fig2, use_container_width=True)
 
+        # 运费走势：freight_usd_t 为数值列，直接做数值统计和作图
+        if 'freight_usd_t' in time_filtered_data.columns and time_filtered_data['freight_usd_t'].notna().any():
+            st.subheader("💵 运费走势")
+            freight_data = time_filtered_data.dropna(subset=['freight_usd_t'])
+            freight = freight_data['freight_usd_t']
+
+            col1, col2 = st.columns([3, 1])
+
+            with col1:
+                fig_freight = px.scatter(
+                    freight_data.reset_index(),
+                    x='date',
+                    y='freight_usd_t',
+                    color='VESSEL TYPE' if 'VESSEL TYPE' in freight_data.columns else None,
+                    hover_data=[c for c in ['shipName', 'loadPort', 'dischargePort', 'terms'] if c in freight_data.columns],
+                    labels={'date': '日期', 'freight_usd_t': '运费 ($/t)'},
+                    height=300,
+                    template='plotly_white'
+                )
+                st.plotly_chart(fig_freight, use_container_width=True)
+
+            with col2:
+                st.markdown("#### 运费统计 ($/t)")
+                st.write(f"**平均:** {freight.mean():.2f}")
+                st.write(f"**中位数:** {freight.median():.2f}")
+                st.write(f"**25% - 75% 分位:** {freight.quantile(0.25):.2f} - {freight.quantile(0.75):.2f}")
+                st.write(f"**最低 / 最高:** {freight.min():.2f} / {freight.max():.2f}")
+
         # 热门港口分析（基于loadPort和dischargePort）
         st.subheader("🌍 热门港口分析")
         
@@ -477,11 +405,7 @@ if vc_data is not None and not vc_data.empty:
         available_columns = time_filtered_data.columns.tolist()
         
         # VC推荐显示的列（包含常用列，用户可以选择其他列）
-        vc_columns = [
-            'shipName', 'cargoSize', 'dwt', 'VESSEL TYPE', 
-            'loadPort', 'loadArea', 'dischargePort', 'freight', 
-            'charterer', 'comment', 'buildYear', 'freeText'
-        ]
+        vc_columns = VC_PAGE_COLUMNS
         
         # 确保推荐的列都存在
         default_columns = [col for col in vc_columns if col in available_columns]
@@ -581,8 +505,8 @@ if vc_data is not None and not vc_data.empty:
     ### 📊 使用说明
 
     **数据来源：**
-    - 所有数据来自 `st.session_state` 对应的VC类型键
-    - 该数据在 **数据处理页面** 更新时自动加载
+    - 所有数据来自本地查询库 `fixtures.sqlite`，由分区存储 `fixture_store/` 同步而来
+    - 该数据在 **数据处理页面** 更新后，本页面打开时自动同步
     - 数据按日期倒序排列，最新记录显示在最前面
 
     **VC类型说明：**
@@ -602,7 +526,7 @@ if vc_data is not None and not vc_data.empty:
 
     **数据更新：**
     - 返回 **数据处理页面** 点击 **Update Data** 按钮
-    - 系统会自动获取最新数据并追加到历史文件中
+    - 系统会自动获取最新数据并写入分区存储，本页面打开时自动同步进查询库
     - 建议每周更新一次以保持数据最新
 
     **注意事项：**